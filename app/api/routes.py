@@ -10,6 +10,12 @@ Pensa nas rotas como "portas" de um prédio:
 - Porta 2 (POST /predict): Laboratório, recebe sintomas e retorna diagnóstico
 - Porta 3 (GET /health): Recepção, mostra se tudo está funcionando
 - Porta 4 (GET /diseases): Biblioteca, lista todas as doenças
+- Portas 5 e 6 (GET /livez e /readyz): Sondas para o orquestrador
+- Porta 7 (GET /symptoms/suggest): Autocomplete dos sintomas
+- Porta 8 (POST /similar): Arquivo, mostra os casos do treino mais parecidos
+- Porta 9 (POST /explain): Segunda opinião, explica quais sintomas pesaram
+- Porta 10 (WebSocket /sessions): Consulta, diagnóstico a cada sintoma novo
+- Porta 11 (GET /admin/drift): Sala da diretoria, só com chave (ADMIN_API_KEY)
 
 Cada rota:
 1. Recebe uma requisição HTTP
@@ -18,19 +24,35 @@ Cada rota:
 4. Retorna a resposta formatada
 """
 
-from fastapi import APIRouter, HTTPException, status
-from typing import List
+from fastapi import APIRouter, HTTPException, Query, Request, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import JSONResponse
+from pydantic import ValidationError
+from typing import Dict, List, Optional
+import hmac
 import logging
+import time
 
 from app.models.schemas import (
     SymptomsRequest,
     DiagnosisResponse,
     HealthCheckResponse,
     AvailableDiseasesResponse,
+    SymptomSuggestionsResponse,
+    SimilarCasesRequest,
+    SimilarCasesResponse,
+    ExplainRequest,
+    ExplanationResponse,
+    SessionMessage,
     ErrorResponse
 )
-from app.services import ml_service, get_available_diseases
+from app.services.ml_service import ml_service
+from app.services.executor import inference_executor, explain_executor
+from app.services.admission import admission_controller, AdmissionRejected
+from app.services.readiness import readiness_monitor
+from app.services.sessions import SymptomSession, session_store
+from app.services.audit import audit_record, audit_sink
 from app.core.config import settings
+from app.api.static_responses import static_responses
 
 # Configurar logging
 logger = logging.getLogger(__name__)
@@ -45,13 +67,14 @@ router = APIRouter()
     summary="Bem-vindo à API",
     description="Endpoint raiz que retorna informações básicas da API"
 )
-async def root():
+async def root(request: Request):
     """
     ENDPOINT RAIZ - GET /
     
     EXPLICAÇÃO:
     Este é o endpoint mais simples. Apenas dá boas-vindas.
     Útil para testar se a API está no ar.
+    A resposta é pré-renderizada (veja static_responses.py).
     
     EXEMPLO DE USO:
     GET http://localhost:8000/
@@ -63,12 +86,7 @@ async def root():
         "docs": "/docs"
     }
     """
-    return {
-        "message": f"Bem-vindo ao {settings.APP_NAME}",
-        "version": settings.APP_VERSION,
-        "docs": "/docs",  # Link para documentação automática do FastAPI
-        "description": settings.APP_DESCRIPTION
-    }
+    return static_responses.respond("root", request)
 
 
 @router.get(
@@ -77,7 +95,7 @@ async def root():
     summary="Health Check",
     description="Verifica se a API e o modelo ML estão funcionando corretamente"
 )
-async def health_check():
+async def health_check(request: Request):
     """
     ENDPOINT HEALTH CHECK - GET /health
     
@@ -90,6 +108,9 @@ async def health_check():
     É como fazer um "check-up" da API.
     Muito usado por serviços de monitoramento.
     
+    Como load balancers chamam este endpoint o tempo todo, a resposta
+    é pré-renderizada quando o modelo carrega: não tocamos no modelo aqui.
+    
     EXEMPLO DE USO:
     GET http://localhost:8000/health
     
@@ -101,24 +122,58 @@ async def health_check():
         "model_loaded": true
     }
     """
-    try:
-        # Pegar informações do modelo
-        model_info = ml_service.get_model_info()
-        
-        return HealthCheckResponse(
-            status="healthy" if model_info["model_loaded"] else "unhealthy",
-            app_name=settings.APP_NAME,
-            version=settings.APP_VERSION,
-            model_loaded=model_info["model_loaded"]
-        )
-    except Exception as e:
-        logger.error(f"Health check falhou: {str(e)}")
-        return HealthCheckResponse(
-            status="unhealthy",
-            app_name=settings.APP_NAME,
-            version=settings.APP_VERSION,
-            model_loaded=False
-        )
+    return static_responses.respond("health", request)
+
+
+@router.get(
+    "/livez",
+    summary="Liveness Probe",
+    description="Responde 200 enquanto o processo estiver vivo"
+)
+async def liveness_probe(request: Request):
+    """
+    ENDPOINT LIVENESS - GET /livez
+    
+    EXPLICAÇÃO:
+    Só responde "estou vivo". Não olha modelo, fila nem nada:
+    se o processo consegue responder, está vivo.
+    Se falhar, o orquestrador reinicia o container.
+    
+    RETORNA:
+    {"status": "alive"}
+    """
+    return static_responses.respond("livez", request)
+
+
+@router.get(
+    "/readyz",
+    summary="Readiness Probe",
+    description="Responde 200 se o worker pode receber tráfego, 503 caso contrário"
+)
+async def readiness_probe():
+    """
+    ENDPOINT READINESS - GET /readyz
+    
+    EXPLICAÇÃO:
+    Diz se ESTE worker consegue atender bem agora. Considera:
+    - Warmup concluído
+    - Profundidade da fila do executor de inferência
+    - Idade e latência da última predição de teste (canary)
+    
+    Se alguma verificação falhar, retorna 503 e o load balancer
+    para de mandar tráfego para cá até ele se recuperar.
+    
+    RETORNA:
+    {
+        "ready": true,
+        "checks": {"warm": true, "queue_ok": true, "canary_fresh": true, "canary_fast": true},
+        "queue_depth": 0,
+        ...
+    }
+    """
+    readiness = readiness_monitor.status()
+    status_code = status.HTTP_200_OK if readiness["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE
+    return JSONResponse(status_code=status_code, content=readiness)
 
 
 @router.get(
@@ -127,13 +182,14 @@ async def health_check():
     summary="Listar Doenças",
     description="Retorna lista de todas as doenças que o modelo pode diagnosticar"
 )
-async def list_diseases():
+async def list_diseases(request: Request):
     """
     ENDPOINT LISTAR DOENÇAS - GET /diseases
     
     EXPLICAÇÃO:
     Retorna todas as doenças que nosso modelo conhece/pode diagnosticar.
     Útil para o frontend mostrar ao usuário quais doenças são suportadas.
+    A lista é pré-renderizada (com ETag) na inicialização.
     
     EXEMPLO DE USO:
     GET http://localhost:8000/diseases
@@ -149,19 +205,41 @@ async def list_diseases():
         ]
     }
     """
-    try:
-        diseases = get_available_diseases()
-        
-        return AvailableDiseasesResponse(
-            total_diseases=len(diseases),
-            diseases=diseases
-        )
-    except Exception as e:
-        logger.error(f"Erro ao listar doenças: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Erro ao buscar lista de doenças"
-        )
+    return static_responses.respond("diseases", request)
+
+
+@router.get(
+    "/symptoms/suggest",
+    response_model=SymptomSuggestionsResponse,
+    summary="Autocomplete de Sintomas",
+    description="Sugere palavras e expressões de sintomas conhecidas pelo modelo"
+)
+async def suggest_symptoms(
+    q: str = Query(..., min_length=1, max_length=100, description="Começo do sintoma digitado"),
+    limit: int = Query(10, ge=1, le=settings.SUGGESTIONS_MAX_LIMIT),
+):
+    """
+    ENDPOINT AUTOCOMPLETE - GET /symptoms/suggest?q=
+    
+    EXPLICAÇÃO:
+    Chamado a cada tecla enquanto o paciente digita. Devolve as
+    palavras/expressões que o modelo conhece e que começam com `q`,
+    das mais para as menos frequentes no treino. Acentos e maiúsculas
+    são ignorados ("cansa" → "cansaço").
+    
+    A busca roda direto no event loop: é uma busca binária num array
+    em memória (microssegundos), sem passar pelo executor do modelo.
+    
+    EXEMPLO DE USO:
+    GET http://localhost:8000/api/v1/symptoms/suggest?q=dor%20na&limit=5
+    
+    RETORNA:
+    {
+        "query": "dor na",
+        "suggestions": [{"text": "dor nas juntas", "frequency": 9}, ...]
+    }
+    """
+    return {"query": q, "suggestions": ml_service.suggest(q, limit)}
 
 
 @router.post(
@@ -187,13 +265,21 @@ async def list_diseases():
             "description": "Sintomas inválidos",
             "model": ErrorResponse
         },
+        429: {
+            "description": "Limite de requisições simultâneas da classe de prioridade atingido",
+            "model": ErrorResponse
+        },
+        503: {
+            "description": "Servidor sobrecarregado (espera estimada acima do SLO)",
+            "model": ErrorResponse
+        },
         500: {
             "description": "Erro interno no servidor",
             "model": ErrorResponse
         }
     }
 )
-async def predict_diagnosis(request: SymptomsRequest):
+async def predict_diagnosis(request: SymptomsRequest, http_request: Request):
     """
     ENDPOINT PRINCIPAL - POST /predict
     
@@ -209,6 +295,17 @@ async def predict_diagnosis(request: SymptomsRequest):
     5. FastAPI formata resposta usando DiagnosisResponse
     6. Retorna JSON pro frontend
     
+    AUDITORIA:
+    Cada predição vira um registro de auditoria (texto, sintomas
+    normalizados, diagnóstico, probabilidades, versão do modelo e
+    latência), gravado em lotes por uma thread de fundo (audit.py).
+    
+    CONTROLE DE ADMISSÃO:
+    Antes de entrar na fila do modelo, a requisição passa pelo
+    admission_controller. Se o worker estiver sobrecarregado, ela é
+    recusada na hora com 429/503 e o header Retry-After.
+    A classe de prioridade vem do header X-Priority-Class.
+    
     VALIDAÇÕES AUTOMÁTICAS:
     - Sintomas não podem estar vazios
     - Mínimo 3 caracteres
@@ -229,11 +326,35 @@ async def predict_diagnosis(request: SymptomsRequest):
         "recommendations": "Este é um diagnóstico automático..."
     }
     """
+    # PASSO 0: Controle de admissão (antes de gastar qualquer CPU)
+    priority_class = None
+    if settings.ADMISSION_ENABLED:
+        try:
+            priority_class = admission_controller.admit(
+                http_request.headers.get(settings.ADMISSION_PRIORITY_HEADER)
+            )
+        except AdmissionRejected as e:
+            logger.warning(f"Requisição recusada ({e.status_code}): {e.reason}")
+            raise HTTPException(
+                status_code=e.status_code,
+                detail=e.reason,
+                headers={"Retry-After": str(e.retry_after)}
+            )
+    
     try:
         logger.info(f"Nova requisição de diagnóstico: {request.symptoms}")
         
         # PASSO 1: Chamar o serviço ML para fazer a predição
-        prediction_result = ml_service.predict(request.symptoms)
+        # A predição roda no pool de inferência para não travar o event loop
+        start = time.perf_counter()
+        prediction_result = await inference_executor.run(ml_service.predict, request.symptoms)
+        latency_ms = (time.perf_counter() - start) * 1000
+        
+        # Registro de auditoria: só entra no buffer, a gravação é em segundo plano
+        if settings.AUDIT_ENABLED:
+            await audit_sink.record(audit_record(
+                request.symptoms, prediction_result, ml_service.model_version, latency_ms
+            ))
         
         # PASSO 2: Adicionar recomendações padrão
         recommendations = (
@@ -265,6 +386,357 @@ async def predict_diagnosis(request: SymptomsRequest):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Erro ao processar diagnóstico. Tente novamente."
         )
+    
+    finally:
+        if priority_class is not None:
+            admission_controller.release(priority_class)
+
+
+@router.post(
+    "/similar",
+    response_model=SimilarCasesResponse,
+    summary="Casos Parecidos",
+    description="Retorna os exemplos do treino mais parecidos com os sintomas",
+    responses={
+        503: {
+            "description": "Índice de casos não gerado",
+            "model": ErrorResponse
+        }
+    }
+)
+async def similar_cases(request: SimilarCasesRequest):
+    """
+    ENDPOINT CASOS PARECIDOS - POST /similar
+    
+    EXPLICAÇÃO:
+    Vetoriza os sintomas com o mesmo TF-IDF do modelo e devolve os
+    `top_k` casos do treino com maior similaridade de cosseno, cada um
+    com a sua doença. Ajuda o médico a entender o diagnóstico.
+    
+    A busca usa um índice invertido (só os casos que têm alguma palavra
+    da consulta são somados) e roda no pool de inferência, para não
+    travar o event loop quando o índice é grande.
+    
+    EXEMPLO DE USO:
+    POST http://localhost:8000/api/v1/similar
+    Body: {"symptoms": "febre alta, dor no corpo", "top_k": 3}
+    
+    RETORNA:
+    {
+        "symptoms_received": ["febre", "alta", "dor", "no", "corpo"],
+        "cases": [
+            {"symptoms": "febre alta dor no corpo ...", "diagnosis": "Dengue", "similarity": 0.81},
+            ...
+        ]
+    }
+    """
+    try:
+        result = await inference_executor.run(
+            ml_service.find_similar, request.symptoms, request.top_k
+        )
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+    
+    return SimilarCasesResponse(
+        symptoms_received=result["symptoms_processed"],
+        cases=result["cases"],
+    )
+
+
+@router.post(
+    "/explain",
+    response_model=ExplanationResponse,
+    summary="Explicar Diagnóstico",
+    description="Retorna o diagnóstico e quanto cada palavra dos sintomas pesou nele",
+    responses={
+        503: {
+            "description": "Servidor ocupado com diagnósticos ou fila de explicações cheia",
+            "model": ErrorResponse
+        },
+        500: {
+            "description": "Erro interno no servidor",
+            "model": ErrorResponse
+        }
+    }
+)
+async def explain_diagnosis(request: ExplainRequest):
+    """
+    ENDPOINT EXPLICAÇÃO - POST /explain
+    
+    EXPLICAÇÃO:
+    Mesmo diagnóstico do /predict, mais a contribuição de cada palavra
+    para ele (pred_contribs do XGBoost): positiva = puxou para essa
+    doença, negativa = puxou contra.
+    
+    PRIORIDADE:
+    Uma explicação custa algumas vezes uma predição, e quem espera um
+    diagnóstico não pode esperar por explicações. Por isso:
+    - roda no explain_executor (pool próprio, pequeno, com nice maior);
+    - é recusada na hora (503 + Retry-After) se há predições esperando
+      thread ou se a fila de explicações está cheia;
+    - o resultado fica num cache LRU (chave = vetor TF-IDF dos sintomas).
+    
+    EXEMPLO DE USO:
+    POST http://localhost:8000/api/v1/explain
+    Body: {"symptoms": "febre alta, dor no corpo", "top_k": 3}
+    
+    RETORNA:
+    {
+        "diagnosis": "Febre Maculosa",
+        "confidence": 88.47,
+        "symptoms_received": ["febre", "alta", "dor", "no", "corpo"],
+        "base_value": -0.1548,
+        "contributions": [{"token": "febre", "contribution": 2.1272}, ...]
+    }
+    """
+    # PASSO 0: Não competir com o /predict
+    if (inference_executor.queue_depth > settings.EXPLAIN_MAX_PREDICT_QUEUE
+            or explain_executor.in_flight >= settings.EXPLAIN_MAX_IN_FLIGHT):
+        explain_executor.record_rejection()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Servidor ocupado. Tente a explicação novamente em instantes.",
+            headers={"Retry-After": "1"}
+        )
+    
+    try:
+        # PASSO 1: Calcular (ou buscar no cache) no pool de explicações
+        result = await explain_executor.run(ml_service.explain, request.symptoms, request.top_k)
+    except Exception as e:
+        logger.error(f"Erro ao explicar diagnóstico: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro ao explicar diagnóstico. Tente novamente."
+        )
+    
+    return ExplanationResponse(
+        diagnosis=result["diagnosis"],
+        confidence=result["confidence"],
+        symptoms_received=result["symptoms_processed"],
+        base_value=result["base_value"],
+        contributions=result["contributions"],
+    )
+
+
+def _score_session(session: SymptomSession) -> Dict:
+    """
+    Diagnóstico atual da sessão (roda no pool de inferência).
+    
+    Returns:
+        Mensagem "diagnosis" para o cliente (diagnosis None se a sessão
+        ainda não tem sintomas)
+    """
+    message = {
+        "type": "diagnosis",
+        "symptoms": session.symptoms,
+        "diagnosis": None,
+        "confidence": None,
+        "top_predictions": [],
+    }
+    if session.entries:
+        result = ml_service.predict_counts(
+            session.counts, " ".join(session.symptoms), top_n=settings.SESSION_TOP_N
+        )
+        message["diagnosis"] = result["diagnosis"]
+        message["confidence"] = result["confidence"]
+        message["top_predictions"] = result["all_probabilities"]
+    return message
+
+
+def _update_session(session: SymptomSession, message: SessionMessage) -> Dict:
+    """
+    Aplica a mudança pedida pelo cliente e recalcula o diagnóstico.
+    
+    EXPLICAÇÃO:
+    Roda no pool de inferência. Só a conexão dona da sessão chama esta
+    função, e uma mensagem por vez, então a sessão não precisa de lock.
+    
+    Raises:
+        ValueError: Mensagem inválida para o estado da sessão (ex: remover
+            um sintoma que não foi adicionado); a sessão não muda
+    """
+    if message.action == "reset":
+        session.reset()
+    else:
+        if not message.symptoms or not message.symptoms.strip():
+            raise ValueError(f"'symptoms' é obrigatório em '{message.action}'")
+        symptoms_cleaned, tokens = ml_service.analyze(message.symptoms)
+        if message.action == "add":
+            session.add(symptoms_cleaned, tokens)
+        else:
+            session.remove(symptoms_cleaned)
+    return _score_session(session)
+
+
+@router.websocket("/sessions")
+async def symptom_session(websocket: WebSocket, session_id: Optional[str] = None):
+    """
+    SESSÃO DE SINTOMAS - WebSocket /sessions
+    
+    EXPLICAÇÃO:
+    Para o frontend em formato de chat: o cliente manda um sintoma por
+    vez e recebe o diagnóstico atualizado depois de cada mudança, sem
+    reenviar o texto inteiro. O servidor guarda a contagem das palavras
+    da sessão e monta o vetor TF-IDF direto dela (veja sessions.py).
+    
+    PROTOCOLO (mensagens JSON):
+    Servidor, ao conectar: {"type": "session", "session_id": "...", "symptoms": [...]}
+    Cliente:  {"action": "add", "symptoms": "febre alta"}
+              {"action": "remove", "symptoms": "febre alta"}
+              {"action": "reset"}
+    Servidor: {"type": "diagnosis", "symptoms": [...], "diagnosis": "...",
+               "confidence": 88.5, "top_predictions": [...]}
+              {"type": "error", "detail": "..."}  (a sessão não muda)
+    
+    Para retomar uma sessão depois de cair a conexão:
+    ws://localhost:8000/api/v1/sessions?session_id=<session_id>
+    
+    Cada atualização é uma predição: passa pelo controle de admissão
+    como o /predict (recusada → erro com status e retry_after).
+    """
+    await websocket.accept()
+    try:
+        session = session_store.open(session_id)
+    except ValueError as e:
+        await websocket.send_json({"type": "error", "detail": str(e)})
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    
+    requested_class = websocket.headers.get(settings.ADMISSION_PRIORITY_HEADER)
+    try:
+        await websocket.send_json({
+            "type": "session",
+            "session_id": session.session_id,
+            "symptoms": session.symptoms,
+        })
+        if session.entries:
+            await websocket.send_json(await inference_executor.run(_score_session, session))
+        
+        while True:
+            text = await websocket.receive_text()
+            
+            # A sessão pode ter sido descartada (ociosa ou store cheio)
+            if session_store.get(session.session_id) is not session:
+                await websocket.send_json({"type": "error", "detail": "Sessão expirada. Abra uma nova."})
+                await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+                return
+            
+            try:
+                message = SessionMessage.model_validate_json(text)
+            except ValidationError as e:
+                await websocket.send_json({"type": "error", "detail": e.errors(include_url=False)[0]["msg"]})
+                continue
+            
+            # Controle de admissão (mesmo do /predict)
+            priority_class = None
+            if settings.ADMISSION_ENABLED:
+                try:
+                    priority_class = admission_controller.admit(requested_class)
+                except AdmissionRejected as e:
+                    await websocket.send_json({
+                        "type": "error",
+                        "status": e.status_code,
+                        "detail": e.reason,
+                        "retry_after": e.retry_after,
+                    })
+                    continue
+            
+            try:
+                update = await inference_executor.run(_update_session, session, message)
+            except ValueError as e:
+                update = {"type": "error", "detail": str(e)}
+            except Exception as e:
+                logger.error(f"Erro ao atualizar sessão: {str(e)}")
+                update = {"type": "error", "detail": "Erro ao processar diagnóstico. Tente novamente."}
+            finally:
+                if priority_class is not None:
+                    admission_controller.release(priority_class)
+            
+            await websocket.send_json(update)
+    
+    except WebSocketDisconnect:
+        pass
+    finally:
+        session.connected = False
+
+
+@router.get(
+    "/metrics",
+    summary="Métricas de Execução",
+    description="Retorna contadores de execução do serviço (fila, admissão, deduplicação)"
+)
+async def get_metrics():
+    """
+    ENDPOINT MÉTRICAS - GET /metrics
+    
+    EXPLICAÇÃO:
+    Números que mudam a cada requisição, úteis para monitoramento:
+    - executor: fila e tempo médio de inferência
+    - explain_executor: fila e recusas do pool de explicações
+    - sessions: sessões WebSocket guardadas e descartadas
+    - audit: registros de auditoria aceitos, descartados e gravados
+    - admission: requisições aceitas/recusadas por classe
+    - singleflight: predições feitas vs. economizadas por deduplicação
+    
+    EXEMPLO DE USO:
+    GET http://localhost:8000/metrics
+    """
+    return {
+        "executor": inference_executor.stats(),
+        "explain_executor": explain_executor.stats(),
+        "sessions": session_store.stats(),
+        "audit": audit_sink.stats() if settings.AUDIT_ENABLED else None,
+        "admission": admission_controller.stats(),
+        **ml_service.get_metrics(),
+    }
+
+
+def _require_admin(request: Request):
+    """
+    Confere a chave de administração (header settings.ADMIN_API_KEY_HEADER).
+    
+    Raises:
+        HTTPException: 404 se ADMIN_API_KEY não está configurada,
+            401 se a chave enviada não confere
+    """
+    if not settings.ADMIN_API_KEY:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    
+    # compare_digest: o tempo da comparação não revela quantos caracteres acertaram
+    sent = request.headers.get(settings.ADMIN_API_KEY_HEADER, "")
+    if not hmac.compare_digest(sent.encode("utf-8"), settings.ADMIN_API_KEY.encode("utf-8")):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Chave de administração inválida")
+
+
+@router.get(
+    "/admin/drift",
+    summary="Monitor de Drift",
+    description="Palavras desconhecidas, diagnósticos e confiança na janela recente (requer chave de administração)",
+    responses={
+        401: {"description": "Chave de administração inválida", "model": ErrorResponse},
+        404: {"description": "Administração desligada ou monitor de drift desligado", "model": ErrorResponse},
+    }
+)
+async def drift_report(request: Request, top_n: int = Query(20, ge=1, le=100)):
+    """
+    ENDPOINT DRIFT - GET /admin/drift
+    
+    EXPLICAÇÃO:
+    Mostra se o texto de produção está se afastando do vocabulário do
+    treino: taxa de palavras desconhecidas (OOV), as desconhecidas mais
+    frequentes, quantas vezes cada doença foi diagnosticada e a
+    distribuição da confiança, na janela DRIFT_WINDOW_SECONDS.
+    
+    Protegido por chave porque lista palavras digitadas pelos pacientes.
+    
+    EXEMPLO DE USO:
+    GET http://localhost:8000/api/v1/admin/drift?top_n=10
+    Header: X-Admin-Key: <ADMIN_API_KEY>
+    """
+    _require_admin(request)
+    if ml_service.drift_monitor is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Monitor de drift desligado (DRIFT_ENABLED)")
+    return ml_service.drift_monitor.report(top_n)
 
 
 @router.get(
@@ -272,7 +744,7 @@ async def predict_diagnosis(request: SymptomsRequest):
     summary="Informações do Modelo",
     description="Retorna informações detalhadas sobre o modelo ML carregado"
 )
-async def get_model_info():
+async def get_model_info(request: Request):
     """
     ENDPOINT INFO DO MODELO - GET /model-info
     
@@ -283,6 +755,7 @@ async def get_model_info():
     - Quais componentes estão ativos?
     
     Útil para debug e monitoramento.
+    Pré-renderizado na inicialização.
     
     EXEMPLO DE USO:
     GET http://localhost:8000/model-info
@@ -296,12 +769,4 @@ async def get_model_info():
         "available_diseases": [...]
     }
     """
-    try:
-        model_info = ml_service.get_model_info()
-        return model_info
-    except Exception as e:
-        logger.error(f"Erro ao buscar informações do modelo: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Erro ao buscar informações do modelo"
-        )
\ No newline at end of file
+    return static_responses.respond("model_info", request)
@@ -0,0 +1,158 @@
+"""
+Respostas estáticas pré-renderizadas
+
+EXPLICAÇÃO:
+Alguns endpoints (GET /, /health, /livez, /diseases, /model-info) sempre retornam
+o mesmo conteúdo enquanto o modelo não muda. Recalcular esses dados a cada
+requisição é desperdício, principalmente no /health, que os load balancers
+chamam várias vezes por segundo.
+
+Por isso renderizamos esses JSONs UMA VEZ, na inicialização, já convertidos
+em bytes e com um ETag forte calculado a partir do conteúdo. As rotas só
+devolvem os bytes prontos. O modelo não é trocado com o processo rodando:
+artefatos novos entram com o restart dos workers, que renderizam de novo.
+
+ETag e 304:
+O cliente pode mandar o header If-None-Match com o ETag que já conhece.
+Se o conteúdo não mudou, respondemos 304 (Not Modified) sem corpo.
+"""
+
+import hashlib
+import json
+import logging
+from typing import Dict, Tuple
+
+from fastapi import Request, Response
+
+from app.core.config import settings
+from app.models.schemas import HealthCheckResponse, AvailableDiseasesResponse
+from app.services.ml_service import ml_service
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Verifica se o header If-None-Match contém o ETag atual.
+
+    EXPLICAÇÃO:
+    O header pode ter vários ETags separados por vírgula, ou "*".
+    Para If-None-Match a comparação é "fraca": ignoramos o prefixo W/.
+
+    Args:
+        if_none_match: Valor bruto do header
+        etag: ETag atual (com aspas)
+
+    Returns:
+        True se o cliente já tem a versão atual
+    """
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+class StaticResponseCache:
+    """
+    Guarda os corpos JSON já codificados e seus ETags.
+
+    EXPLICAÇÃO:
+    Cada entrada é um par (bytes do corpo, ETag).
+    O render() monta um dicionário novo e troca a referência de uma vez,
+    então uma requisição nunca vê um corpo de uma versão com o ETag de outra.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[bytes, str]] = {}
+        self.render()
+
+    def _build_payloads(self) -> Dict[str, Dict]:
+        """
+        Monta os dicionários de cada resposta estática.
+
+        Returns:
+            Dicionário nome → payload
+        """
+        try:
+            model_info = ml_service.get_model_info()
+            model_loaded = model_info["model_loaded"]
+        except Exception as e:
+            logger.error(f"Erro ao buscar informações do modelo: {str(e)}")
+            model_info = {"model_loaded": False}
+            model_loaded = False
+
+        diseases = ml_service.get_available_diseases()
+
+        return {
+            "root": {
+                "message": f"Bem-vindo ao {settings.APP_NAME}",
+                "version": settings.APP_VERSION,
+                "docs": "/docs",  # Link para documentação automática do FastAPI
+                "description": settings.APP_DESCRIPTION
+            },
+            "health": HealthCheckResponse(
+                status="healthy" if model_loaded else "unhealthy",
+                app_name=settings.APP_NAME,
+                version=settings.APP_VERSION,
+                model_loaded=model_loaded
+            ).model_dump(),
+            "livez": {"status": "alive"},
+            "diseases": AvailableDiseasesResponse(
+                total_diseases=len(diseases),
+                diseases=diseases
+            ).model_dump(),
+            "model_info": model_info,
+        }
+
+    def render(self):
+        """
+        (Re)renderiza todas as respostas estáticas.
+
+        EXPLICAÇÃO:
+        Usa o mesmo formato de JSON do FastAPI (UTF-8, sem espaços)
+        e calcula o ETag como hash SHA-256 do corpo.
+        """
+        entries = {}
+        for name, payload in self._build_payloads().items():
+            body = json.dumps(
+                payload,
+                ensure_ascii=False,
+                allow_nan=False,
+                separators=(",", ":")
+            ).encode("utf-8")
+            etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+            entries[name] = (body, etag)
+
+        self._entries = entries
+        logger.info(f"✓ Respostas estáticas renderizadas: {sorted(entries)}")
+
+    def respond(self, name: str, request: Request) -> Response:
+        """
+        Devolve a resposta pré-renderizada (ou 304 se o cliente já a tem).
+
+        Args:
+            name: Nome da resposta ("root", "health", "livez", "diseases", "model_info")
+            request: Requisição atual (para ler If-None-Match)
+
+        Returns:
+            Response com os bytes prontos
+        """
+        body, etag = self._entries[name]
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+
+        return Response(content=body, media_type="application/json", headers=headers)
+
+
+# INSTÂNCIA GLOBAL
+# Renderizada uma vez quando a API é importada (inicialização do servidor)
+static_responses = StaticResponseCache()
@@ -2,7 +2,7 @@
 Configurações centralizadas do HealthIA Backend
 """
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List
 import os
 
 
@@ -27,13 +27,245 @@ class Settings(BaseSettings):
     MODEL_FILE: str = "modelo_HealthIA.json"
     VECTORIZER_FILE: str = "vetorizador_HealthIA.pkl"
     ENCODER_FILE: str = "encoder_HealthIA.pkl"
+    ONNX_FILE: str = "modelo_HealthIA.onnx"  # Gerado por: python -m app.tools.export_onnx
+    
+    # Integridade dos artefatos: sha256 de cada arquivo de MODEL_PATH conferido
+    # na carga contra o manifesto (gerado por: python -m app.tools.build_manifest).
+    # Formas derivadas (ex: árvores em binário) ficam em ARTIFACT_CACHE_PATH,
+    # num diretório com o hash do original. Veja app/services/artifacts.py
+    ARTIFACT_MANIFEST_FILE: str = "manifest_HealthIA.json"
+    # Artefatos gerados em cada máquina e fora do git (ONNX, linear, compacto):
+    # entradas num manifesto separado, também fora do git
+    ARTIFACT_LOCAL_MANIFEST_FILE: str = "manifest_HealthIA.local.json"
+    ARTIFACT_REQUIRE_MANIFEST: bool = False  # True = sem manifesto (ou arquivo fora dele) não carrega
+    ARTIFACT_CACHE_PATH: str = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "cache", "artifacts")  # Vazio = sem cache de derivados
+    
+    # Dataset de treino (JSON Lines compactado com gzip, lido em streaming).
+    # Só o treino e as ferramentas offline leem este arquivo; a API não.
+    DATA_PATH: str = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data")
+    DATASET_FILE: str = "dataset_HealthIA.jsonl.gz"
+    
+    # "xgboost" (scikit-learn + XGBoost nativo) ou "onnx" (onnxruntime)
+    INFERENCE_BACKEND: str = "xgboost"
+    
+    # Normalização dos sintomas: palavras fora do vocabulário são trocadas
+    # pela palavra conhecida mais próxima (acentos e erros de digitação)
+    NORMALIZER_ENABLED: bool = True
+    NORMALIZER_MAX_EDIT_DISTANCE: int = 2
+    
+    # Autocomplete (GET /symptoms/suggest). Gerado por:
+    # python -m app.tools.build_suggestions (sem ele, só palavras do vocabulário)
+    SUGGESTIONS_FILE: str = "sugestoes_HealthIA.json"
+    SUGGESTIONS_MAX_LIMIT: int = 20
+    
+    # Casos parecidos (POST /similar). Gerado por:
+    # python -m app.tools.build_similar_index
+    SIMILAR_CASES_FILE: str = "casos_HealthIA.npz"
+    SIMILAR_CASES_MAX_K: int = 20
+    
+    # Explicações (POST /explain): contribuição de cada palavra (pred_contribs
+    # do XGBoost), várias vezes mais cara que uma predição. Roda num pool
+    # próprio, pequeno e com prioridade de CPU menor, para não atrasar o /predict
+    EXPLAIN_THREADS: int = 1
+    EXPLAIN_NICENESS: int = 10  # Aumento do nice das threads do pool
+    EXPLAIN_MAX_IN_FLIGHT: int = 8  # Explicações na fila + rodando (excedeu → 503)
+    EXPLAIN_MAX_PREDICT_QUEUE: int = 0  # Predições esperando thread (excedeu → 503)
+    EXPLAIN_CACHE_SIZE: int = 10000  # Explicações guardadas (LRU)
+    EXPLAIN_MAX_TOKENS: int = 20
+    
+    # Sessões WebSocket (/sessions): diagnóstico atualizado a cada sintoma
+    SESSION_MAX_SESSIONS: int = 1000  # Sessões guardadas por worker
+    SESSION_IDLE_SECONDS: float = 900.0  # Sem atividade por mais que isso → descartada
+    SESSION_MAX_SYMPTOMS: int = 50  # Sintomas por sessão
+    SESSION_TOP_N: int = 3  # Doenças mais prováveis enviadas a cada atualização
+    
+    # Auditoria: cada predição do /predict é gravada (em lotes, por uma
+    # thread de fundo) num SQLite append-only. Veja app/services/audit.py
+    AUDIT_ENABLED: bool = True
+    AUDIT_PATH: str = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "audit", "audit_HealthIA.db")
+    AUDIT_BUFFER_SIZE: int = 10000  # Registros esperando gravação
+    AUDIT_BATCH_SIZE: int = 500  # Registros por transação
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 1.0  # Grava o que houver pelo menos a cada intervalo
+    AUDIT_BACKPRESSURE: str = "drop"  # Buffer cheio: "drop" (descarta) ou "block" (requisição espera)
+    AUDIT_BLOCK_TIMEOUT_SECONDS: float = 1.0  # Espera máxima no modo "block"
+    
+    # Monitor de drift: palavras fora do vocabulário, diagnósticos e confiança
+    # numa janela deslizante de DRIFT_BUCKETS fatias (GET /admin/drift)
+    DRIFT_ENABLED: bool = True
+    DRIFT_WINDOW_SECONDS: float = 3600.0
+    DRIFT_BUCKETS: int = 12
+    DRIFT_SKETCH_DEPTH: int = 4  # Linhas do count-min sketch
+    DRIFT_SKETCH_WIDTH: int = 1024  # Contadores por linha
+    DRIFT_TOP_K: int = 32  # Palavras desconhecidas candidatas por fatia
+    
+    # Cache persistente de predições: LRU em memória + SQLite em disco,
+    # chaveado pelo hash dos artefatos do modelo. Sobrevive a restarts
+    # (veja app/services/prediction_cache.py)
+    PREDICTION_CACHE_ENABLED: bool = False
+    PREDICTION_CACHE_PATH: str = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "cache", "predictions_HealthIA.db")
+    PREDICTION_CACHE_MEMORY_ENTRIES: int = 10000  # Entradas na LRU de cada worker
+    PREDICTION_CACHE_MAX_MB: float = 256.0  # Limite do arquivo (passou → saem as mais antigas)
+    PREDICTION_CACHE_PRELOAD: int = 10000  # Entradas recentes carregadas na LRU no startup
+    
+    # Aquecimento no startup (só com PREDICTION_CACHE_ENABLED): antes de ficar
+    # pronto, cada worker calcula em lote as frases do corpus (gerado por:
+    # python -m app.tools.build_warmup) e as entradas mais frequentes do
+    # tráfego recente (lidas da auditoria). Veja app/services/warmup.py
+    WARMUP_ENABLED: bool = True
+    WARMUP_FILE: str = "aquecimento_HealthIA.json"
+    WARMUP_TRAFFIC_TOP_K: int = 1000  # Entradas mais frequentes do tráfego recente
+    WARMUP_TRAFFIC_WINDOW_SECONDS: float = 86400.0  # "Recente" = últimas 24 h da auditoria
+    WARMUP_BATCH_SIZE: int = 256  # Frases por chamada ao modelo
+    WARMUP_MAX_SECONDS: float = 60.0  # Passou disso, o worker fica pronto com o que já aqueceu
+    
+    # Endpoints de administração (/admin/...): exigem esta chave no header
+    # ADMIN_API_KEY_HEADER. Vazio = endpoints desligados (404)
+    ADMIN_API_KEY: str = ""
+    ADMIN_API_KEY_HEADER: str = "X-Admin-Key"
+    
+    # Cascata: modelo linear rápido na frente do modelo completo
+    # (gerado por: python -m app.tools.distill_linear)
+    CASCADE_ENABLED: bool = False
+    LINEAR_FILE: str = "linear_HealthIA.npz"
+    # Concordância com o XGBoost usada para calibrar a margem do linear
+    CASCADE_TARGET_AGREEMENT: float = 0.99
+    # Fração das respostas rápidas conferidas também no modelo completo
+    CASCADE_SHADOW_RATE: float = 0.05
+    
+    # Concordância mínima (no dataset) que um modelo comprimido por
+    # app.tools.compress_model precisa ter com o original: mesmo diagnóstico
+    # (top-1) e mesmas 3 doenças mais prováveis (top-3)
+    COMPRESSION_MIN_AGREEMENT: float = 0.99
+    COMPRESSION_MIN_TOP3_AGREEMENT: float = 0.95
+    
+    # CPU Budget Settings
+    # EXPLICAÇÃO:
+    # Cada worker tem um pool de INFERENCE_THREADS threads e cada predição
+    # do XGBoost pode usar BOOSTER_THREADS threads (OpenMP). Sem controle,
+    # o total (workers × threads × threads do booster) passa muito do número
+    # de núcleos e as threads ficam disputando CPU (latência alta).
+    # Com 0, o valor é calculado por cpu_plan() a partir dos núcleos disponíveis.
+    CPU_CORES: int = 0  # 0 = detectar (afinidade + limite do cgroup)
+    INFERENCE_THREADS: int = 0  # Threads do executor de inferência por worker
+    BOOSTER_THREADS: int = 0  # Threads OpenMP do XGBoost por predição
+    
+    # Readiness Settings (/readyz)
+    READINESS_MAX_QUEUE_DEPTH: int = 32  # Predições esperando thread livre
+    CANARY_INTERVAL_SECONDS: float = 10.0  # Intervalo da predição de teste
+    CANARY_MAX_AGE_SECONDS: float = 30.0  # Idade máxima do último teste bem-sucedido
+    CANARY_MAX_LATENCY_MS: float = 500.0  # Latência máxima aceitável do teste
+    CANARY_SYMPTOMS: str = "febre alta dor no corpo cansaço extremo"
+    
+    # Admission Control Settings (/predict)
+    # EXPLICAÇÃO:
+    # Cada requisição pode informar uma classe de prioridade no header
+    # ADMISSION_PRIORITY_HEADER (ex: "interactive" para a UI dos médicos,
+    # "bulk" para jobs em lote). Cada classe tem:
+    # - um limite de requisições simultâneas (excedeu → 429)
+    # - um SLO de espera na fila (espera estimada maior → 503)
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_PRIORITY_HEADER: str = "X-Priority-Class"
+    ADMISSION_DEFAULT_CLASS: str = "interactive"
+    ADMISSION_CLASS_MAX_IN_FLIGHT: Dict[str, int] = {
+        "interactive": 64,
+        "bulk": 8,
+    }
+    ADMISSION_CLASS_QUEUE_SLO_MS: Dict[str, float] = {
+        "interactive": 2000.0,
+        "bulk": 500.0,  # Bulk é descartado antes, preservando a UI
+    }
+    
+    # Rate Limiting Settings (por cliente)
+    # EXPLICAÇÃO:
+    # Cada cliente (API key, Origin ou IP) tem um "balde" de RATE_LIMIT_BURST
+    # fichas que recebe RATE_LIMIT_RATE fichas por segundo. Só valem as chaves
+    # de RATE_LIMIT_API_KEYS; as origens de ALLOWED_ORIGINS têm um balde por IP
+    # e as outras requisições são contadas só pelo IP.
+    # RATE_LIMIT_OVERRIDES permite limites próprios por cliente, ex:
+    # {"origin:https://healthia.vercel.app": [20.0, 50.0]}  → [rate, burst]
+    # (uma origem com override passa a ter UM balde, dividido por todos os IPs)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_RATE: float = 5.0  # Fichas por segundo
+    RATE_LIMIT_BURST: float = 20.0  # Tamanho máximo da rajada
+    RATE_LIMIT_OVERRIDES: Dict[str, List[float]] = {}
+    RATE_LIMIT_PATHS: List[str] = ["/api/v1/predict", "/api/v1/explain", "/api/v1/sessions"]
+    RATE_LIMIT_API_KEY_HEADER: str = "X-API-Key"
+    RATE_LIMIT_API_KEYS: List[str] = []  # Chaves aceitas para identificar o cliente
+    RATE_LIMIT_BACKEND: str = "memory"  # "memory" (por worker) ou "shared" (entre workers)
+    RATE_LIMIT_MAX_CLIENTS: int = 10000  # Backend "memory"
+    RATE_LIMIT_SHARED_NAME: str = "healthia_rate_limit"  # Backend "shared"
+    RATE_LIMIT_SHARED_SLOTS: int = 65536  # Backend "shared"
     
     # Server Settings
     HOST: str = "0.0.0.0"
     PORT: int = 8000
+    WEB_WORKERS: int = 1  # Processos do launcher pre-fork (python -m app.launcher)
     
     class Config:
         case_sensitive = True
+    
+    def cpu_plan(self) -> Dict[str, int]:
+        """
+        Divide os núcleos disponíveis entre workers, threads e booster.
+        
+        EXPLICAÇÃO:
+        1. Núcleos por worker = núcleos / WEB_WORKERS
+        2. Threads do executor = núcleos por worker (uma predição por núcleo)
+        3. Threads do booster = núcleos por worker / threads do executor
+           (normalmente 1: predição de UMA linha não ganha com paralelismo
+           interno, e assim cada núcleo roda exatamente uma predição)
+        
+        Valores definidos explicitamente (diferentes de 0) são respeitados.
+        
+        Returns:
+            Dict com cores, web_workers, inference_threads, booster_threads
+            e oversubscription (threads totais / núcleos; ideal ≤ 1)
+        """
+        cores = self.CPU_CORES or _available_cores()
+        web_workers = max(1, self.WEB_WORKERS)
+        cores_per_worker = max(1, cores // web_workers)
+        
+        inference_threads = self.INFERENCE_THREADS or cores_per_worker
+        booster_threads = self.BOOSTER_THREADS or max(1, cores_per_worker // inference_threads)
+        
+        return {
+            "cores": cores,
+            "web_workers": web_workers,
+            "inference_threads": inference_threads,
+            "booster_threads": booster_threads,
+            "oversubscription": round(
+                web_workers * inference_threads * booster_threads / cores, 2
+            ),
+        }
+
+
+def _available_cores() -> int:
+    """
+    Conta os núcleos que este processo pode realmente usar.
+    
+    EXPLICAÇÃO:
+    os.cpu_count() conta os núcleos da MÁQUINA. Em containers o processo
+    costuma estar limitado por afinidade de CPU ou por cota do cgroup
+    (ex: "cpus: 2" no Docker/Kubernetes), então consideramos os dois.
+    
+    Returns:
+        Número de núcleos (no mínimo 1)
+    """
+    try:
+        cores = len(os.sched_getaffinity(0))
+    except AttributeError:  # Windows/macOS
+        cores = os.cpu_count() or 1
+    
+    # Cota do cgroup v2: "<quota> <período>" ou "max <período>"
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cores = min(cores, max(1, int(quota) // int(period)))
+    except (OSError, ValueError):
+        pass
+    
+    return max(1, cores)
 
 
 settings = Settings()
\ No newline at end of file
@@ -0,0 +1,41 @@
+"""
+Header X-Model-Hash - Qual modelo respondeu cada requisição
+
+EXPLICAÇÃO:
+Toda resposta HTTP leva o hash dos artefatos carregados (o mesmo do
+/model-info, veja MLModelService._compute_model_hash). Assim um cliente
+(ou um log de proxy) sabe exatamente qual modelo gerou cada diagnóstico,
+mesmo durante um deploy com workers de versões diferentes.
+"""
+
+from typing import Callable
+
+
+class ModelHashMiddleware:
+    """
+    Middleware ASGI "puro" que acrescenta o header X-Model-Hash.
+
+    EXPLICAÇÃO:
+    Como o RateLimitMiddleware, escrito direto sobre ASGI (sem
+    BaseHTTPMiddleware): só intercepta a mensagem "http.response.start".
+    O hash é lido a cada resposta (ml_service.model_hash).
+    """
+
+    def __init__(self, app, get_hash: Callable[[], str], header: str = "X-Model-Hash"):
+        self.app = app
+        self.get_hash = get_hash
+        self.header = header.lower().encode("latin-1")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_hash(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((self.header, self.get_hash().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_hash)
@@ -0,0 +1,387 @@
+"""
+Rate limiting por cliente - Token buckets em memória
+
+EXPLICAÇÃO:
+A API é usada por vários frontends parceiros. Um cliente com defeito
+(ou mal-intencionado) mandando requisições sem parar poderia ocupar
+todo o modelo e deixar os outros sem resposta.
+
+TOKEN BUCKET ("balde de fichas"):
+- Cada cliente tem um balde com até BURST fichas.
+- O balde recebe RATE fichas por segundo (até encher).
+- Cada requisição gasta 1 ficha. Sem ficha → 429 Too Many Requests.
+
+Assim o cliente pode fazer rajadas curtas (até BURST), mas no longo
+prazo fica limitado a RATE requisições por segundo.
+
+QUEM É O CLIENTE?
+1. Header X-API-Key, se a chave está em RATE_LIMIT_API_KEYS (ou tem um
+   limite próprio em RATE_LIMIT_OVERRIDES)
+2. Header Origin com limite próprio em RATE_LIMIT_OVERRIDES
+   ("origin:https://..."): um balde para a origem inteira
+3. Header Origin em ALLOWED_ORIGINS (o frontend parceiro): um balde por
+   IP DENTRO da origem ("origin:<origin>|ip:<endereço>")
+4. IP de origem da conexão
+
+Chaves e origens desconhecidas são ignoradas (vale o IP): se qualquer
+valor virasse um cliente, bastaria mandar uma chave aleatória a cada
+requisição para ganhar um balde cheio novo e escapar do limite.
+
+Uma origem SEM limite próprio não vira um balde único: todos os
+usuários do frontend de produção dividiriam RATE fichas por segundo, e
+qualquer cliente fora do navegador poderia mandar o mesmo Origin para
+esgotar o balde de todos.
+
+WEBSOCKET (/sessions): cada mensagem do cliente é uma predição, então
+cada uma gasta uma ficha do mesmo balde do /predict. A conexão também
+gasta uma: sem ficha, o handshake é recusado. Uma mensagem sem ficha não
+chega à rota; o cliente recebe {"type": "error", "status": 429, ...} e a
+sessão continua.
+
+BACKENDS:
+- "memory": dicionário local do worker. Não precisa de lock porque só o
+  event loop (uma única thread) mexe nele, e take() não tem nenhum await.
+- "shared": tabela em memória compartilhada (multiprocessing.shared_memory),
+  vista por todos os workers da máquina. O limite passa a valer para o
+  conjunto de workers e não para cada um.
+"""
+
+import json
+import math
+import os
+import time
+import zlib
+from collections import OrderedDict
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+
+
+class InMemoryTokenBuckets:
+    """
+    Token buckets guardados num dicionário do próprio processo.
+
+    EXPLICAÇÃO:
+    Cada balde é uma lista [fichas, último_refill]. Não há lock:
+    todas as chamadas vêm do event loop, uma de cada vez.
+
+    Os baldes ficam em ordem de uso (o mais recente no fim). Com a tabela
+    cheia, sai só o cliente parado há mais tempo: uma enxurrada de
+    clientes novos nunca zera os baldes dos clientes ativos.
+    """
+
+    def __init__(self, max_clients: int):
+        self.max_clients = max_clients
+        self._buckets: "OrderedDict[str, List[float]]" = OrderedDict()
+
+    def take(self, key: str, rate: float, burst: float) -> float:
+        """
+        Tenta gastar uma ficha do balde do cliente.
+
+        Args:
+            key: Identificador do cliente
+            rate: Fichas por segundo
+            burst: Capacidade do balde
+
+        Returns:
+            0.0 se a requisição pode passar, ou quantos segundos faltam
+            para o cliente ter uma ficha disponível
+        """
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            while len(self._buckets) >= self.max_clients:
+                self._buckets.popitem(last=False)
+            bucket = [burst, now]
+            self._buckets[key] = bucket
+        else:
+            self._buckets.move_to_end(key)
+
+        tokens = min(burst, bucket[0] + (now - bucket[1]) * rate)
+        bucket[1] = now
+
+        if tokens >= 1.0:
+            bucket[0] = tokens - 1.0
+            return 0.0
+
+        bucket[0] = tokens
+        return (1.0 - tokens) / rate
+
+
+class SharedMemoryTokenBuckets:
+    """
+    Token buckets numa tabela em memória compartilhada entre workers.
+
+    EXPLICAÇÃO:
+    A tabela tem SLOTS linhas de [fichas, último_refill] (float64).
+    O cliente é mapeado para uma linha por um hash estável (crc32);
+    clientes que colidem dividem o mesmo balde, então use SLOTS bem
+    maior que o número de clientes.
+
+    Continua sem lock: duas requisições simultâneas em workers diferentes
+    podem, raramente, gastar a mesma ficha. Para rate limiting essa
+    imprecisão é aceitável e evita qualquer sincronização entre processos.
+
+    Um balde zerado (tabela recém-criada) tem último_refill = 0, então
+    no primeiro acesso ele é reabastecido até ficar cheio.
+
+    DONO DA TABELA:
+    Só o processo que criou a tabela a remove (unlink) no close(). Com o
+    launcher pre-fork, quem cria é o master (ao importar app.main); os
+    workers herdam este objeto pelo fork(), mas têm outro pid, então no
+    shutdown deles só desmapeiam a tabela. O master a remove depois que
+    todos os workers terminaram (veja app/launcher.py).
+    """
+
+    def __init__(self, name: str, slots: int):
+        self.slots = slots
+        size = slots * 2 * 8
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+            self._owner_pid: Optional[int] = os.getpid()
+        except FileExistsError:
+            self._shm = shared_memory.SharedMemory(name=name)
+            self._owner_pid = None
+            # Evitar que o resource_tracker apague a tabela quando ESTE
+            # processo terminar: ela pertence a quem a criou. O tracker
+            # registra o nome com a barra inicial do POSIX.
+            resource_tracker.unregister("/" + self._shm.name.lstrip("/"), "shared_memory")
+            if self._shm.size != size:
+                self._shm.close()
+                raise ValueError(
+                    f"Memória compartilhada '{name}' já existe com {self._shm.size} bytes "
+                    f"(esperado {size} para {slots} slots): sobra de outra execução ou "
+                    f"RATE_LIMIT_SHARED_SLOTS diferente. Remova /dev/shm/{name.lstrip('/')} "
+                    f"ou use outro RATE_LIMIT_SHARED_NAME"
+                )
+
+        self._table = np.ndarray((slots, 2), dtype=np.float64, buffer=self._shm.buf)
+
+    @property
+    def owner(self) -> bool:
+        """Se ESTE processo criou a tabela (e deve removê-la no close())."""
+        return self._owner_pid == os.getpid()
+
+    def take(self, key: str, rate: float, burst: float) -> float:
+        """Mesmo contrato de InMemoryTokenBuckets.take()."""
+        now = time.time()  # Relógio comum a todos os processos
+        row = self._table[zlib.crc32(key.encode("utf-8")) % self.slots]
+
+        tokens = min(burst, row[0] + (now - row[1]) * rate)
+        row[1] = now
+
+        if tokens >= 1.0:
+            row[0] = tokens - 1.0
+            return 0.0
+
+        row[0] = tokens
+        return (1.0 - tokens) / rate
+
+    def close(self):
+        """Desmapeia a tabela (e a remove, se este processo a criou)."""
+        if self._table is None:
+            return
+        self._table = None
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
+
+
+class RateLimiter:
+    """
+    Identifica o cliente e aplica o limite configurado para ele.
+    """
+
+    def __init__(
+        self,
+        buckets,
+        rate: float,
+        burst: float,
+        overrides: Dict[str, List[float]],
+        api_key_header: str,
+        api_keys: Iterable[str] = (),
+        origins: Iterable[str] = (),
+    ):
+        # Limites inválidos falham na criação, não no meio de uma requisição
+        # (rate 0 dividiria por zero ao calcular o Retry-After)
+        for client, limits in {"padrão": [rate, burst], **overrides}.items():
+            if len(limits) != 2 or limits[0] <= 0 or limits[1] < 1:
+                raise ValueError(
+                    f"Rate limit inválido para '{client}': {limits} "
+                    f"(use [rate, burst] com rate > 0 e burst >= 1)"
+                )
+        self.buckets = buckets
+        self.rate = rate
+        self.burst = burst
+        self.overrides = overrides
+        self._api_key_header = api_key_header.lower().encode("latin-1")
+        # Só chaves e origens conhecidas identificam o cliente (as com
+        # limite próprio em overrides também contam como conhecidas)
+        self.api_keys = frozenset(api_keys) | {
+            key[len("key:"):] for key in overrides if key.startswith("key:")
+        }
+        # Origens com balde próprio (override) e origens aceitas (balde por IP)
+        self.shared_origins = frozenset(
+            key[len("origin:"):] for key in overrides if key.startswith("origin:")
+        )
+        self.origins = frozenset(origins)
+
+    def client_key(self, scope: Dict) -> str:
+        """
+        Identifica o cliente a partir do scope ASGI (HTTP ou WebSocket).
+
+        Returns:
+            "key:<api key>" (chave conhecida), "origin:<origin>" (origem com
+            override), "origin:<origin>|ip:<endereço>" (origem aceita) ou
+            "ip:<endereço>"
+        """
+        origin = None
+        for name, value in scope["headers"]:
+            if name == self._api_key_header:
+                api_key = value.decode("latin-1")
+                if api_key in self.api_keys:
+                    return "key:" + api_key
+            elif name == b"origin":
+                origin = value.decode("latin-1")
+        if origin is not None and origin in self.shared_origins:
+            return "origin:" + origin
+
+        client = scope.get("client")
+        ip_key = "ip:" + (client[0] if client else "unknown")
+        if origin is not None and origin in self.origins:
+            return f"origin:{origin}|{ip_key}"
+        return ip_key
+
+    def check(self, key: str) -> float:
+        """
+        Gasta uma ficha do cliente.
+
+        Returns:
+            0.0 se pode passar, senão segundos até a próxima ficha
+        """
+        override = self.overrides.get(key)
+        if override is None:
+            return self.buckets.take(key, self.rate, self.burst)
+        return self.buckets.take(key, override[0], override[1])
+
+    def close(self):
+        """Libera o backend (a memória compartilhada, se usada)."""
+        if isinstance(self.buckets, SharedMemoryTokenBuckets):
+            self.buckets.close()
+
+
+class RateLimitMiddleware:
+    """
+    Middleware ASGI "puro" que aplica o RateLimiter.
+
+    EXPLICAÇÃO:
+    Escrito direto sobre ASGI (sem BaseHTTPMiddleware) para adicionar
+    o mínimo de custo por requisição: só as rotas em RATE_LIMIT_PATHS
+    passam pelo limite, e a resposta 429 é montada sem passar pelo FastAPI.
+    Conexões WebSocket nessas rotas são limitadas por mensagem
+    (veja _websocket).
+    """
+
+    MESSAGE = "Limite de requisições excedido. Tente novamente em instantes."
+
+    def __init__(self, app, limiter: RateLimiter, paths: List[str]):
+        self.app = app
+        self.limiter = limiter
+        self.paths = frozenset(paths)
+
+    async def _websocket(self, scope, receive, send):
+        """
+        Aplica o limite a uma conexão WebSocket.
+
+        EXPLICAÇÃO:
+        O handshake gasta uma ficha: sem ela, a conexão é recusada antes
+        do accept (websocket.close → HTTP 403). Depois, cada mensagem do
+        cliente gasta uma ficha; a que não tem ficha é respondida aqui
+        mesmo com um erro e a rota nem a recebe (ela continua esperando
+        a próxima).
+        """
+        key = self.limiter.client_key(scope)
+
+        if self.limiter.check(key) > 0.0:
+            await receive()  # "websocket.connect"
+            await send({"type": "websocket.close", "code": 1008})
+            return
+
+        async def limited_receive():
+            while True:
+                message = await receive()
+                if message["type"] != "websocket.receive":
+                    return message
+                wait = self.limiter.check(key)
+                if wait == 0.0:
+                    return message
+                await send({
+                    "type": "websocket.send",
+                    "text": json.dumps({
+                        "type": "error",
+                        "status": 429,
+                        "detail": self.MESSAGE,
+                        "retry_after": max(1, math.ceil(wait)),
+                    }, ensure_ascii=False),
+                })
+
+        await self.app(scope, limited_receive, send)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "websocket" and scope["path"] in self.paths:
+            await self._websocket(scope, receive, send)
+            return
+
+        if (
+            scope["type"] != "http"
+            or scope["path"] not in self.paths
+            or scope["method"] == "OPTIONS"  # Preflight de CORS não consome ficha
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        wait = self.limiter.check(self.limiter.client_key(scope))
+        if wait == 0.0:
+            await self.app(scope, receive, send)
+            return
+
+        body = json.dumps({"detail": self.MESSAGE}, ensure_ascii=False).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"retry-after", str(max(1, math.ceil(wait))).encode("latin-1")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def create_rate_limiter() -> RateLimiter:
+    """
+    Cria o RateLimiter a partir das configurações.
+
+    Returns:
+        RateLimiter com o backend escolhido em RATE_LIMIT_BACKEND
+    """
+    if settings.RATE_LIMIT_BACKEND == "shared":
+        buckets = SharedMemoryTokenBuckets(
+            settings.RATE_LIMIT_SHARED_NAME,
+            settings.RATE_LIMIT_SHARED_SLOTS
+        )
+    else:
+        buckets = InMemoryTokenBuckets(settings.RATE_LIMIT_MAX_CLIENTS)
+
+    return RateLimiter(
+        buckets=buckets,
+        rate=settings.RATE_LIMIT_RATE,
+        burst=settings.RATE_LIMIT_BURST,
+        overrides=settings.RATE_LIMIT_OVERRIDES,
+        api_key_header=settings.RATE_LIMIT_API_KEY_HEADER,
+        api_keys=settings.RATE_LIMIT_API_KEYS,
+        origins=settings.ALLOWED_ORIGINS,
+    )
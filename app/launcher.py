@@ -0,0 +1,316 @@
+"""
+LAUNCHER.PY - Servidor com vários workers e modelo carregado uma única vez
+
+EXPLICAÇÃO:
+Rodando `uvicorn --workers N`, cada worker é um processo NOVO que importa
+a aplicação do zero: cada um abre os .pkl, lê o JSON de 2 MB do XGBoost
+e monta o modelo na própria memória. N workers = N cópias do modelo
+e N vezes o tempo de boot.
+
+PRE-FORK (o que este launcher faz):
+1. O processo principal (master) carrega o modelo e faz uma predição
+   de aquecimento.
+2. gc.freeze() move todos os objetos já criados para uma geração
+   "permanente" que o coletor de lixo não visita mais.
+3. O master abre o socket e faz fork() dos workers.
+
+Depois do fork, as páginas de memória do master são COMPARTILHADAS com
+os workers (copy-on-write): só são copiadas se alguém escrever nelas.
+Sem o gc.freeze(), o coletor de lixo dos workers escreveria nos
+cabeçalhos dos objetos (contadores de referência/ponteiros do GC) e
+"sujaria" essas páginas, forçando cópias.
+
+COMO USAR:
+    python -m app.launcher --workers 4
+    python -m app.launcher --workers 4 --report-memory 10
+
+Só funciona em sistemas com fork() (Linux/macOS). No Windows o launcher
+cai para um único worker com uvicorn.run().
+"""
+
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import time
+from typing import Dict, List
+
+# Desligar o GC ANTES de importar a aplicação: assim os objetos do
+# modelo não são "mexidos" pelo coletor no master antes do freeze.
+gc.disable()
+
+import uvicorn  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+
+# Configurar logging
+logger = logging.getLogger("app.launcher")
+
+
+def read_memory_kb(pid: int) -> Dict[str, int]:
+    """
+    Lê o uso de memória de um processo em /proc/<pid>/smaps_rollup.
+
+    EXPLICAÇÃO:
+    - rss: memória residente total (conta páginas compartilhadas inteiras)
+    - pss: RSS com cada página compartilhada dividida entre quem a usa
+    - shared: páginas compartilhadas com outros processos (ex: o master)
+    - private: páginas só deste processo
+
+    Args:
+        pid: ID do processo
+
+    Returns:
+        Dict com os valores em kB (vazio se /proc não estiver disponível)
+    """
+    fields = {
+        "Rss": "rss",
+        "Pss": "pss",
+        "Shared_Clean": "shared",
+        "Shared_Dirty": "shared",
+        "Private_Clean": "private",
+        "Private_Dirty": "private",
+    }
+    memory = {"rss": 0, "pss": 0, "shared": 0, "private": 0}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                name, _, rest = line.partition(":")
+                if name in fields:
+                    memory[fields[name]] += int(rest.split()[0])
+    except OSError:
+        return {}
+    return memory
+
+
+def report_memory(master_pid: int, worker_pids: List[int], model_kb: int):
+    """
+    Loga o uso de memória por worker e a economia do pre-fork.
+
+    EXPLICAÇÃO:
+    model_kb é quanto a memória do master cresceu ao importar a aplicação
+    (bibliotecas + modelo) e aquecê-la: é o que cada worker teria que
+    alocar sozinho sem pre-fork.
+    A coluna "shared" mostra quanto de cada worker continua sendo
+    compartilhado com o master (ou seja, a economia real por worker).
+    """
+    logger.info("=" * 70)
+    logger.info(f"📊 Memória (kB). Aplicação + modelo carregados no master: {model_kb} kB")
+    master = read_memory_kb(master_pid)
+    if not master:
+        logger.info("/proc/<pid>/smaps_rollup indisponível; medição ignorada.")
+        return
+    logger.info(f"master {master_pid}: {master}")
+
+    total_shared = 0
+    for pid in worker_pids:
+        memory = read_memory_kb(pid)
+        if memory:
+            total_shared += memory["shared"]
+            logger.info(f"worker {pid}: {memory}")
+
+    if worker_pids:
+        logger.info(
+            f"Economia média por worker (páginas compartilhadas): "
+            f"{total_shared // len(worker_pids)} kB"
+        )
+    logger.info("=" * 70)
+
+
+class PreforkServer:
+    """
+    Master que carrega o app, faz fork dos workers e os supervisiona.
+
+    EXPLICAÇÃO:
+    Se um worker morrer inesperadamente, o master cria outro (também por
+    fork, então ele já nasce com o modelo carregado). SIGTERM/SIGINT no
+    master são repassados para os workers, que fazem shutdown gracioso.
+    """
+
+    def __init__(self, app, host: str, port: int, workers: int):
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.children: Dict[int, int] = {}  # pid → índice do worker
+        self.stopping = False
+        self.sock = None
+
+    def _bind(self) -> socket.socket:
+        """Abre o socket no master; os workers herdam o mesmo socket."""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(2048)
+        sock.set_inheritable(True)
+        return sock
+
+    def _spawn(self, index: int):
+        """Cria um worker por fork()."""
+        pid = os.fork()
+        if pid == 0:
+            # --- Processo filho (worker) ---
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            gc.enable()
+
+            # O pool de threads do onnxruntime não sobrevive ao fork():
+            # cada worker abre a própria sessão (o grafo é pequeno).
+            from app.services.ml_service import ml_service
+            if ml_service.backend.name == "onnx":
+                ml_service._load_backend()
+
+            config = uvicorn.Config(self.app, log_level="info")
+            server = uvicorn.Server(config)
+            try:
+                server.run(sockets=[self.sock])
+            finally:
+                os._exit(0)
+
+        self.children[pid] = index
+        logger.info(f"✓ Worker {index} iniciado (pid {pid})")
+
+    def _handle_stop(self, signum, frame):
+        """Repassa o sinal de parada para todos os workers."""
+        self.stopping = True
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def run(self, model_kb: int = 0, report_after: float = 0.0):
+        """
+        Faz fork dos workers e fica supervisionando até receber SIGTERM/SIGINT.
+
+        Args:
+            model_kb: Memória usada pelo modelo no master (para o relatório)
+            report_after: Se > 0, segundos até logar o relatório de memória
+        """
+        self.sock = self._bind()
+        logger.info(f"🏥 Escutando em http://{self.host}:{self.port} com {self.workers} workers")
+
+        # Congelar tudo o que existe agora: os workers herdam estes objetos
+        # e o GC deles não vai mais tocar nessas páginas.
+        gc.collect()
+        gc.freeze()
+        logger.info(f"gc.freeze(): {gc.get_freeze_count()} objetos congelados")
+
+        for index in range(self.workers):
+            self._spawn(index)
+
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+
+        report_at = time.monotonic() + report_after if report_after > 0 else None
+
+        while self.children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+
+            if pid == 0:
+                if report_at is not None and time.monotonic() >= report_at:
+                    report_memory(os.getpid(), list(self.children), model_kb)
+                    report_at = None
+                time.sleep(0.5)
+                continue
+
+            index = self.children.pop(pid)
+            if not self.stopping:
+                logger.warning(f"✗ Worker {index} (pid {pid}) terminou (status {status}); reiniciando...")
+                self._spawn(index)
+
+        self.sock.close()
+        logger.info("🛑 Todos os workers terminaram.")
+
+
+def serve(
+    app,
+    host: str = None,
+    port: int = None,
+    workers: int = None,
+    baseline_kb: int = None,
+    report_after: float = 0.0,
+):
+    """
+    Aquece o modelo no master e inicia os workers por fork.
+
+    Args:
+        app: Aplicação FastAPI (já importada, com o modelo carregado)
+        host: Endereço (padrão: settings.HOST)
+        port: Porta (padrão: settings.PORT)
+        workers: Quantidade de workers (padrão: settings.WEB_WORKERS)
+        baseline_kb: RSS do master antes de importar a aplicação, para
+            medir quanto o modelo ocupa (opcional)
+        report_after: Se > 0, loga o relatório de memória após esses segundos
+    """
+    from app.services.ml_service import ml_service
+
+    host = host or settings.HOST
+    port = port or settings.PORT
+    workers = workers or settings.WEB_WORKERS
+    if workers != settings.WEB_WORKERS:
+        logger.warning(
+            f"--workers={workers} difere de WEB_WORKERS={settings.WEB_WORKERS}: "
+            f"o plano de CPU foi calculado para {settings.WEB_WORKERS} workers. "
+            f"Prefira definir WEB_WORKERS."
+        )
+
+    if not hasattr(os, "fork"):
+        logger.info("fork() indisponível neste sistema; iniciando um único worker.")
+        uvicorn.run(app, host=host, port=port, log_level="info")
+        return
+
+    # Predição de aquecimento no master, com 1 thread no XGBoost: o runtime
+    # OpenMP não é seguro para fork() depois de criar seu pool de threads.
+    ml_service.model.set_params(n_jobs=1)
+    ml_service.self_test(settings.CANARY_SYMPTOMS)
+    ml_service.model.set_params(n_jobs=ml_service.cpu_plan["booster_threads"])
+
+    model_kb = 0
+    if baseline_kb is not None:
+        model_kb = read_memory_kb(os.getpid()).get("rss", 0) - baseline_kb
+    logger.info(f"✓ Aplicação e modelo carregados e aquecidos no master ({model_kb} kB)")
+
+    try:
+        PreforkServer(app, host, port, workers).run(model_kb=model_kb, report_after=report_after)
+    finally:
+        # A memória compartilhada do rate limit foi criada aqui no master
+        # (ao importar app.main): só ele a remove, depois dos workers
+        rate_limiter = getattr(app.state, "rate_limiter", None)
+        if rate_limiter is not None:
+            rate_limiter.close()
+
+
+def main():
+    """Ponto de entrada de linha de comando: python -m app.launcher"""
+    parser = argparse.ArgumentParser(description="Servidor HealthIA com pre-fork")
+    parser.add_argument("--host", default=settings.HOST)
+    parser.add_argument("--port", type=int, default=settings.PORT)
+    parser.add_argument("--workers", type=int, default=settings.WEB_WORKERS)
+    parser.add_argument(
+        "--report-memory",
+        type=float,
+        default=0.0,
+        metavar="SEGUNDOS",
+        help="Loga o uso de memória dos workers após SEGUNDOS"
+    )
+    args = parser.parse_args()
+
+    # O plano de CPU (settings.cpu_plan()) depende do número de workers,
+    # então ele precisa ser definido ANTES de importar a aplicação
+    settings.WEB_WORKERS = args.workers
+
+    # Importar a aplicação carrega o modelo (uma única vez, aqui no master)
+    baseline_kb = read_memory_kb(os.getpid()).get("rss", 0)
+    from app.main import app
+
+    serve(app, args.host, args.port, args.workers, baseline_kb, args.report_memory)
+
+
+if __name__ == "__main__":
+    main()
@@ -23,7 +23,14 @@ from fastapi.responses import JSONResponse
 import logging
 
 from app.core.config import settings
+from app.core.rate_limit import RateLimitMiddleware, create_rate_limiter
+from app.core.model_hash import ModelHashMiddleware
 from app.api import router
+from app.services.executor import inference_executor, explain_executor
+from app.services.readiness import readiness_monitor
+from app.services.audit import audit_sink
+from app.services.ml_service import ml_service
+from app.services.warmup import warm_up
 
 # Configurar logging
 logging.basicConfig(
@@ -58,7 +65,29 @@ def create_application() -> FastAPI:
         redoc_url="/redoc",  # ReDoc - documentação alternativa
     )
     
-    # PASSO 2: Configurar CORS
+    # PASSO 2: Rate limiting por cliente
+    # EXPLICAÇÃO:
+    # Limita quantas predições cada cliente (API key / Origin / IP) pode
+    # fazer por segundo, para um cliente não ocupar o modelo sozinho.
+    # É adicionado ANTES do CORS: o último middleware adicionado é o mais
+    # externo, então o CORS envolve o rate limit e as respostas 429 também
+    # recebem os headers de CORS (senão o navegador esconderia o erro).
+    # Detalhes em app/core/rate_limit.py
+    
+    app.state.rate_limiter = None
+    if settings.RATE_LIMIT_ENABLED:
+        app.state.rate_limiter = create_rate_limiter()
+        app.add_middleware(
+            RateLimitMiddleware,
+            limiter=app.state.rate_limiter,
+            paths=settings.RATE_LIMIT_PATHS,
+        )
+        logger.info(
+            f"Rate limit: {settings.RATE_LIMIT_RATE}/s (burst {settings.RATE_LIMIT_BURST}) "
+            f"em {settings.RATE_LIMIT_PATHS}, backend '{settings.RATE_LIMIT_BACKEND}'"
+        )
+    
+    # PASSO 3: Configurar CORS
     # EXPLICAÇÃO DETALHADA DE CORS:
     # CORS = Cross-Origin Resource Sharing
     # 
@@ -81,11 +110,16 @@ def create_application() -> FastAPI:
         allow_credentials=True,  # Permite enviar cookies
         allow_methods=["*"],  # Permite todos os métodos HTTP (GET, POST, etc)
         allow_headers=["*"],  # Permite todos os headers
+        expose_headers=["X-Model-Hash"],  # O frontend pode ler qual modelo respondeu
     )
     
     logger.info(f"CORS configurado para: {settings.ALLOWED_ORIGINS}")
     
-    # PASSO 3: Registrar rotas
+    # Header X-Model-Hash em todas as respostas (mais externo: inclusive
+    # nas respostas 429 do rate limit). Detalhes em app/core/model_hash.py
+    app.add_middleware(ModelHashMiddleware, get_hash=lambda: ml_service.model_hash)
+    
+    # PASSO 4: Registrar rotas
     # EXPLICAÇÃO:
     # Aqui "conectamos" todas as rotas que definimos em routes.py
     # O prefix="/api/v1" significa que todas as rotas começam com /api/v1
@@ -105,7 +139,7 @@ def create_application() -> FastAPI:
     
     logger.info("Rotas registradas com sucesso!")
     
-    # PASSO 4: Event handlers (opcional mas útil)
+    # PASSO 5: Event handlers (opcional mas útil)
     # EXPLICAÇÃO:
     # Executam código em momentos específicos:
     # - startup: quando o servidor inicia
@@ -123,14 +157,26 @@ def create_application() -> FastAPI:
         - Inicializar serviços externos
         - Etc.
         
-        No nosso caso, só logamos que iniciou.
         O modelo ML já foi carregado em ml_service (import automático).
+        Aqui iniciamos a gravação da auditoria, abrimos o cache persistente
+        de predições (já em cada worker) e o enchemos com o corpus e o
+        tráfego recente (app/services/warmup.py). Só então o canary do
+        /readyz aquece o modelo e marca o worker como pronto.
         """
         logger.info("=" * 70)
         logger.info(f"🚀 {settings.APP_NAME} v{settings.APP_VERSION} está iniciando...")
         logger.info(f"📚 Documentação disponível em: http://{settings.HOST}:{settings.PORT}/docs")
         logger.info(f"🏥 API disponível em: http://{settings.HOST}:{settings.PORT}/api/v1")
         logger.info("=" * 70)
+        
+        if settings.AUDIT_ENABLED:
+            audit_sink.start()
+        
+        if ml_service.prediction_cache is not None:
+            ml_service.prediction_cache.start(preload=settings.PREDICTION_CACHE_PRELOAD)
+            await warm_up()
+        
+        await readiness_monitor.start()
     
     @app.on_event("shutdown")
     async def shutdown_event():
@@ -145,8 +191,22 @@ def create_application() -> FastAPI:
         - Etc.
         """
         logger.info("🛑 Servidor sendo desligado...")
+        
+        await readiness_monitor.stop()
+        inference_executor.shutdown()
+        
+        # Grava os registros de auditoria que ainda estão no buffer
+        audit_sink.stop()
+        explain_executor.shutdown()
+        
+        # Grava as predições novas que ainda estão na fila do cache
+        if ml_service.prediction_cache is not None:
+            ml_service.prediction_cache.stop()
+        
+        if app.state.rate_limiter is not None:
+            app.state.rate_limiter.close()
     
-    # PASSO 5: Exception handlers (tratamento de erros global)
+    # PASSO 6: Exception handlers (tratamento de erros global)
     # EXPLICAÇÃO:
     # Se algum erro não tratado acontecer em QUALQUER rota,
     # este handler captura e retorna uma resposta JSON amigável
@@ -185,22 +245,18 @@ app = create_application()
 
 # PONTO DE ENTRADA (quando executa diretamente)
 # EXPLICAÇÃO:
-# Se você rodar: python app/main.py
-# Este bloco executa e inicia o servidor
+# Se você rodar: python -m app.main
+# Este bloco executa e inicia o servidor pelo launcher pre-fork
+# (app/launcher.py): o modelo já foi carregado neste processo e os
+# workers (settings.WEB_WORKERS) são criados por fork, compartilhando
+# a memória do modelo.
 # 
-# Mas o normal é usar: uvicorn app.main:app --reload
+# Para desenvolvimento com auto-reload use: uvicorn app.main:app --reload
 # Aí este bloco NÃO executa
 if __name__ == "__main__":
-    import uvicorn
-    
-    logger.info("Iniciando servidor via Python direto...")
-    logger.info("(Recomendado usar: uvicorn app.main:app --reload)")
-    
-    # Iniciar servidor Uvicorn
-    uvicorn.run(
-        "app.main:app",  # Caminho para a aplicação
-        host=settings.HOST,  # 0.0.0.0 = aceita conexões de qualquer IP
-        port=settings.PORT,  # 8000
-        reload=True,  # Auto-reload quando código mudar (desenvolvimento)
-        log_level="info"
-    )
\ No newline at end of file
+    from app.launcher import serve
+    
+    logger.info("Iniciando servidor via launcher pre-fork...")
+    logger.info("(Para desenvolvimento: uvicorn app.main:app --reload)")
+    
+    serve(app)
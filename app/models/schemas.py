@@ -2,7 +2,9 @@
 Pydantic schemas para validação de requests e responses
 """
 from pydantic import BaseModel, Field, field_validator
-from typing import List, Optional
+from typing import List, Literal, Optional
+
+from app.core.config import settings
 
 
 class SymptomsRequest(BaseModel):
@@ -60,6 +62,107 @@ class AvailableDiseasesResponse(BaseModel):
     diseases: List[str]
 
 
+class SymptomSuggestion(BaseModel):
+    """Uma sugestão do autocomplete"""
+    text: str = Field(..., description="Palavra ou expressão conhecida pelo modelo")
+    frequency: Optional[int] = Field(None, description="Em quantos exemplos do treino aparece")
+
+
+class SymptomSuggestionsResponse(BaseModel):
+    """Schema para resposta do autocomplete de sintomas"""
+    query: str
+    suggestions: List[SymptomSuggestion]
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "query": "dor na",
+                "suggestions": [
+                    {"text": "dor nas juntas", "frequency": 9},
+                    {"text": "dor nas costas", "frequency": 3}
+                ]
+            }
+        }
+
+
+class SimilarCasesRequest(BaseModel):
+    """Schema para requisição de casos parecidos"""
+    symptoms: str = Field(
+        ...,
+        min_length=3,
+        max_length=500,
+        description="Sintomas separados por vírgula ou espaços",
+        examples=["febre alta, dor no corpo, cansaço extremo"]
+    )
+    top_k: int = Field(5, ge=1, le=settings.SIMILAR_CASES_MAX_K, description="Quantos casos retornar")
+
+
+class SimilarCase(BaseModel):
+    """Um caso do treino parecido com os sintomas"""
+    symptoms: str
+    diagnosis: str
+    similarity: float = Field(..., description="Similaridade de cosseno (0 a 1)")
+
+
+class SimilarCasesResponse(BaseModel):
+    """Schema para resposta de casos parecidos"""
+    symptoms_received: List[str] = Field(..., description="Sintomas processados")
+    cases: List[SimilarCase]
+
+
+class ExplainRequest(BaseModel):
+    """Schema para requisição de explicação do diagnóstico"""
+    symptoms: str = Field(
+        ...,
+        min_length=3,
+        max_length=500,
+        description="Sintomas separados por vírgula ou espaços",
+        examples=["febre alta, dor no corpo, cansaço extremo"]
+    )
+    top_k: int = Field(5, ge=1, le=settings.EXPLAIN_MAX_TOKENS, description="Quantas palavras retornar")
+
+
+class TokenContribution(BaseModel):
+    """Peso de uma palavra no diagnóstico"""
+    token: str
+    contribution: float = Field(..., description="Contribuição para a margem da doença (positiva = a favor)")
+
+
+class ExplanationResponse(BaseModel):
+    """Schema para resposta de explicação do diagnóstico"""
+    diagnosis: str = Field(..., description="Doença diagnosticada")
+    confidence: float = Field(..., description="Confiança da predição (0-100%)")
+    symptoms_received: List[str] = Field(..., description="Sintomas processados")
+    base_value: float = Field(..., description="Margem da doença sem nenhuma palavra")
+    contributions: List[TokenContribution]
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "diagnosis": "Febre Maculosa",
+                "confidence": 88.47,
+                "symptoms_received": ["febre", "alta", "dor", "no", "corpo"],
+                "base_value": -0.1548,
+                "contributions": [
+                    {"token": "febre", "contribution": 2.1272},
+                    {"token": "alta", "contribution": 1.9064},
+                    {"token": "dor", "contribution": -0.0664}
+                ]
+            }
+        }
+
+
+class SessionMessage(BaseModel):
+    """Mensagem do cliente numa sessão WebSocket (/sessions)"""
+    action: Literal["add", "remove", "reset"]
+    symptoms: Optional[str] = Field(
+        None,
+        max_length=500,
+        description="Sintoma a adicionar ou remover (não usado em reset)",
+        examples=["febre alta"]
+    )
+
+
 class ErrorResponse(BaseModel):
     """Schema para respostas de erro"""
     error: str
@@ -0,0 +1,163 @@
+"""
+Controle de admissão - Recusa cedo quando o worker está sobrecarregado
+
+EXPLICAÇÃO:
+Sem controle de admissão, num pico de tráfego TODA requisição é aceita
+e vai para a fila do executor de inferência. A fila cresce, a latência
+de todo mundo explode e, no fim, todas as requisições dão timeout juntas.
+
+É melhor recusar algumas requisições LOGO NA ENTRADA (rápido e barato)
+e atender bem as que foram aceitas. O cliente recebe o header
+Retry-After dizendo quando tentar de novo.
+
+COMO ESTIMAMOS A ESPERA:
+- O executor sabe quantas tarefas estão em andamento (fila + rodando)
+  e o tempo médio de execução de uma tarefa (service time).
+- Uma nova requisição espera, em média, as tarefas à frente dela
+  divididas pelo número de threads:
+
+      espera ≈ max(0, em_andamento - threads + 1) / threads × service_time
+
+CLASSES DE PRIORIDADE:
+Cada classe (ex: "interactive" e "bulk") tem seu próprio limite de
+requisições simultâneas e seu próprio SLO de espera. Com um SLO menor
+para "bulk", os jobs em lote são descartados antes, preservando a UI.
+"""
+
+import math
+from typing import Dict, Optional
+
+from app.core.config import settings
+from app.services.executor import InferenceExecutor, inference_executor
+
+
+class AdmissionRejected(Exception):
+    """
+    Requisição recusada pelo controle de admissão.
+
+    Attributes:
+        status_code: 429 (limite da classe) ou 503 (fila acima do SLO)
+        retry_after: Segundos sugeridos até a próxima tentativa
+        reason: Mensagem para o cliente
+    """
+
+    def __init__(self, status_code: int, retry_after: int, reason: str):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+class AdmissionController:
+    """
+    Decide se uma requisição entra ou não, por classe de prioridade.
+
+    EXPLICAÇÃO:
+    admit() e release() são chamados só pelo event loop (nunca de threads),
+    então os contadores não precisam de lock.
+    """
+
+    def __init__(
+        self,
+        executor: InferenceExecutor,
+        class_max_in_flight: Dict[str, int],
+        class_queue_slo_ms: Dict[str, float],
+        default_class: str,
+    ):
+        self.executor = executor
+        self.class_max_in_flight = class_max_in_flight
+        self.class_queue_slo_ms = class_queue_slo_ms
+        self.default_class = default_class
+
+        self._in_flight: Dict[str, int] = {name: 0 for name in class_max_in_flight}
+        self._admitted: Dict[str, int] = {name: 0 for name in class_max_in_flight}
+        self._rejected: Dict[str, int] = {name: 0 for name in class_max_in_flight}
+
+    def resolve_class(self, priority_class: Optional[str]) -> str:
+        """Classe pedida pelo cliente, ou a padrão se for desconhecida."""
+        if priority_class and priority_class in self.class_max_in_flight:
+            return priority_class
+        return self.default_class
+
+    def estimated_wait_ms(self) -> float:
+        """
+        Espera estimada na fila para uma nova requisição.
+
+        Returns:
+            Milissegundos (0 se ainda não há medição de service time)
+        """
+        service_time_ms = self.executor.service_time_ms
+        if service_time_ms is None:
+            return 0.0
+
+        workers = self.executor.max_workers
+        ahead = max(0, self.executor.in_flight - workers + 1)
+        return ahead / workers * service_time_ms
+
+    def _reject(self, priority_class: str, status_code: int, wait_ms: float, reason: str):
+        """Conta a rejeição e levanta AdmissionRejected."""
+        self._rejected[priority_class] += 1
+        retry_after = max(1, math.ceil(wait_ms / 1000))
+        raise AdmissionRejected(status_code, retry_after, reason)
+
+    def admit(self, priority_class: Optional[str] = None) -> str:
+        """
+        Tenta admitir uma requisição.
+
+        Args:
+            priority_class: Classe informada pelo cliente (pode ser None)
+
+        Returns:
+            A classe efetiva (passar para release() depois)
+
+        Raises:
+            AdmissionRejected: 429 se a classe atingiu seu limite de
+                requisições simultâneas, 503 se a espera estimada passa do SLO
+        """
+        priority_class = self.resolve_class(priority_class)
+        wait_ms = self.estimated_wait_ms()
+
+        if self._in_flight[priority_class] >= self.class_max_in_flight[priority_class]:
+            self._reject(
+                priority_class, 429, wait_ms,
+                f"Limite de requisições simultâneas da classe '{priority_class}' atingido"
+            )
+
+        if wait_ms > self.class_queue_slo_ms.get(priority_class, math.inf):
+            self._reject(
+                priority_class, 503, wait_ms,
+                "Servidor sobrecarregado. Tente novamente em instantes."
+            )
+
+        self._in_flight[priority_class] += 1
+        self._admitted[priority_class] += 1
+        return priority_class
+
+    def release(self, priority_class: str):
+        """Libera a vaga ocupada por uma requisição admitida."""
+        self._in_flight[priority_class] -= 1
+
+    def stats(self) -> Dict:
+        """Contadores por classe e a espera estimada atual."""
+        return {
+            "estimated_wait_ms": round(self.estimated_wait_ms(), 3),
+            "classes": {
+                name: {
+                    "in_flight": self._in_flight[name],
+                    "max_in_flight": self.class_max_in_flight[name],
+                    "queue_slo_ms": self.class_queue_slo_ms.get(name),
+                    "admitted": self._admitted[name],
+                    "rejected": self._rejected[name],
+                }
+                for name in self.class_max_in_flight
+            },
+        }
+
+
+# INSTÂNCIA GLOBAL
+admission_controller = AdmissionController(
+    executor=inference_executor,
+    class_max_in_flight=settings.ADMISSION_CLASS_MAX_IN_FLIGHT,
+    class_queue_slo_ms=settings.ADMISSION_CLASS_QUEUE_SLO_MS,
+    default_class=settings.ADMISSION_DEFAULT_CLASS,
+)
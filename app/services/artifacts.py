@@ -0,0 +1,217 @@
+"""
+Artefatos do modelo - Identificados pelo conteúdo (sha256) e conferidos na carga
+
+EXPLICAÇÃO:
+Os arquivos de model/ são carregados pelo NOME (settings.MODEL_FILE...),
+mas o nome não diz QUAL versão está ali. Aqui cada arquivo é identificado
+pelo sha256 do conteúdo:
+
+1. MANIFESTO (model/manifest_HealthIA.json): nome → sha256 e tamanho de
+   cada artefato. Gerado por `python -m app.tools.build_manifest`; as
+   ferramentas que gravam em model/ (build_suggestions, export_onnx...)
+   atualizam a própria entrada.
+   Artefatos gerados em cada máquina e fora do git (export_onnx,
+   distill_linear, compress_model) vão para o MANIFESTO LOCAL
+   (model/manifest_HealthIA.local.json, também fora do git): assim
+   gerá-los não deixa o manifesto versionado modificado. Na carga, os
+   dois são lidos; para um nome nos dois, vale o versionado.
+2. CONFERÊNCIA NA CARGA: antes de carregar um arquivo, calculamos o
+   sha256 e comparamos com o manifesto. Diferente = arquivo corrompido
+   ou trocado sem atualizar o manifesto: a carga falha
+   (ArtifactIntegrityError) em vez de servir um modelo desconhecido.
+   Sem manifesto, ou arquivo fora dele, só um aviso no log (a menos que
+   settings.ARTIFACT_REQUIRE_MANIFEST).
+3. CACHE DE DERIVADOS (settings.ARTIFACT_CACHE_PATH): formas já
+   processadas de um artefato (ex: as árvores do XGBoost em binário, que
+   carregam ~3x mais rápido que o JSON) ficam num diretório com o hash
+   do original no nome. Arquivo novo = hash novo = derivado novo; o
+   derivado antigo nunca é usado por engano.
+
+COMO USAR:
+    store = ArtifactStore(settings.MODEL_PATH)
+    path = store.verify(settings.MODEL_FILE)   # confere e guarda o hash
+    store.hashes[settings.MODEL_FILE]          # sha256 do arquivo
+    store.derived_path(settings.MODEL_FILE, ".ubj")
+"""
+
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, Iterable, Optional
+
+from app.core.config import settings
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Bytes lidos por vez ao calcular o hash (arquivos grandes não vão inteiros para a memória)
+CHUNK_SIZE = 1024 * 1024
+
+
+class ArtifactIntegrityError(ValueError):
+    """O sha256 de um artefato não bate com o manifesto."""
+
+
+def file_sha256(path: str) -> str:
+    """sha256 (hex) do conteúdo de um arquivo."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_manifest(path: str, artifacts: Dict[str, Dict]):
+    """Grava o manifesto (uma entrada por linha, em ordem de nome)."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"algorithm": "sha256", "artifacts": artifacts}, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp_path, path)
+
+
+def read_manifest(path: str) -> Optional[Dict[str, Dict]]:
+    """Entradas de um manifesto (ou None se o arquivo não existe)."""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["artifacts"]
+
+
+def update_manifest(artifact_path: str, local: bool = False) -> bool:
+    """
+    Atualiza a entrada de um artefato no manifesto do mesmo diretório.
+
+    EXPLICAÇÃO:
+    Chamado pelas ferramentas que geram artefatos, logo depois de gravar
+    o arquivo: sem isso, a próxima carga recusaria o arquivo novo. Se o
+    diretório não tem manifesto (ex: saída num diretório temporário),
+    nada é feito.
+
+    Args:
+        artifact_path: Arquivo recém-gravado
+        local: True para artefatos fora do git: a entrada vai para o
+            manifesto local (criado se preciso, se o diretório tem o
+            manifesto versionado)
+
+    Returns:
+        True se o manifesto foi atualizado
+    """
+    directory = os.path.dirname(os.path.abspath(artifact_path))
+    main_path = os.path.join(directory, settings.ARTIFACT_MANIFEST_FILE)
+    if not os.path.exists(main_path):
+        return False
+
+    manifest_path = (
+        os.path.join(directory, settings.ARTIFACT_LOCAL_MANIFEST_FILE) if local else main_path
+    )
+    artifacts = read_manifest(manifest_path) or {}
+    artifacts[os.path.basename(artifact_path)] = {
+        "sha256": file_sha256(artifact_path),
+        "bytes": os.path.getsize(artifact_path),
+    }
+    write_manifest(manifest_path, artifacts)
+    logger.info(f"✓ Manifesto atualizado: {manifest_path}")
+    return True
+
+
+class ArtifactStore:
+    """
+    Confere os artefatos de um diretório contra o manifesto e guarda os hashes.
+
+    EXPLICAÇÃO:
+    Criado a cada (re)carga do modelo: o manifesto é relido, e `hashes`
+    guarda o sha256 de cada arquivo carregado nesta carga.
+
+    Attributes:
+        hashes: Nome do arquivo → sha256 dos arquivos já conferidos
+    """
+
+    def __init__(
+        self,
+        model_dir: str,
+        manifest_file: Optional[str] = None,
+        cache_dir: Optional[str] = None,
+        require_manifest: Optional[bool] = None,
+    ):
+        self.model_dir = model_dir
+        self.manifest_path = os.path.join(model_dir, manifest_file or settings.ARTIFACT_MANIFEST_FILE)
+        self.cache_dir = settings.ARTIFACT_CACHE_PATH if cache_dir is None else cache_dir
+        self.require_manifest = (
+            settings.ARTIFACT_REQUIRE_MANIFEST if require_manifest is None else require_manifest
+        )
+        self.hashes: Dict[str, str] = {}
+
+        self.manifest = read_manifest(self.manifest_path)
+        if self.manifest is not None:
+            # Manifesto local: só acrescenta nomes (o versionado vale nos dois)
+            local = read_manifest(os.path.join(model_dir, settings.ARTIFACT_LOCAL_MANIFEST_FILE))
+            if local:
+                self.manifest = {**local, **self.manifest}
+        elif self.require_manifest:
+            raise ArtifactIntegrityError(f"Manifesto não encontrado: {self.manifest_path}")
+        else:
+            logger.warning(f"Manifesto não encontrado ({self.manifest_path}): artefatos carregados "
+                           f"sem conferência (python -m app.tools.build_manifest)")
+
+    def verify(self, name: str) -> str:
+        """
+        Calcula o sha256 de um artefato e confere com o manifesto.
+
+        Args:
+            name: Nome do arquivo em model_dir
+
+        Returns:
+            Caminho do arquivo (para carregar em seguida)
+
+        Raises:
+            ArtifactIntegrityError: Hash diferente do manifesto (ou arquivo
+            fora do manifesto com ARTIFACT_REQUIRE_MANIFEST)
+        """
+        path = os.path.join(self.model_dir, name)
+        sha256 = file_sha256(path)
+
+        if self.manifest is not None:
+            expected = self.manifest.get(name)
+            if expected is None:
+                if self.require_manifest:
+                    raise ArtifactIntegrityError(f"{name} não está no manifesto {self.manifest_path}")
+                logger.warning(f"{name} não está no manifesto: carregado sem conferência")
+            elif expected["sha256"] != sha256:
+                raise ArtifactIntegrityError(
+                    f"{name}: sha256 {sha256[:12]} diferente do manifesto ({expected['sha256'][:12]}). "
+                    f"Arquivo corrompido ou trocado; se a troca foi intencional, "
+                    f"rode python -m app.tools.build_manifest"
+                )
+
+        self.hashes[name] = sha256
+        return path
+
+    def digest(self, names: Iterable[str], extra: str = "") -> str:
+        """
+        Hash de um conjunto de artefatos já conferidos (+ um texto extra).
+
+        EXPLICAÇÃO:
+        Identifica a COMBINAÇÃO carregada (ex: modelo + vetorizador +
+        encoder + backend): muda se qualquer um dos arquivos mudar.
+
+        Returns:
+            Os primeiros 16 dígitos hex do sha256
+        """
+        digest = hashlib.sha256(extra.encode("utf-8"))
+        for name in sorted(names):
+            digest.update(f"\n{name}:{self.hashes[name]}".encode("utf-8"))
+        return digest.hexdigest()[:16]
+
+    def derived_path(self, name: str, suffix: str) -> Optional[str]:
+        """
+        Caminho da forma derivada de um artefato já conferido (ou None se o cache está desligado).
+
+        EXPLICAÇÃO:
+        <cache>/<sha256 do original>/<nome><sufixo>. O sufixo deve incluir
+        tudo que muda o formato do derivado (ex: a versão da biblioteca).
+        """
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, self.hashes[name][:16], name + suffix)
@@ -0,0 +1,387 @@
+"""
+Auditoria - Registro de todas as predições, gravado em segundo plano
+
+EXPLICAÇÃO:
+Para auditoria clínica, cada predição do /predict precisa ficar
+registrada: texto recebido, sintomas normalizados, diagnóstico,
+probabilidades, versão do modelo e latência.
+
+Gravar no disco DENTRO da requisição somaria a latência do disco (e do
+fsync) a cada diagnóstico. Em vez disso a rota só coloca o registro num
+BUFFER em memória (microssegundos), e uma thread de fundo grava os
+registros em LOTES:
+
+    /predict ──record──► [buffer limitado] ──lote──► SQLite (WAL)
+                                           (thread de fundo)
+
+- Um lote = uma transação: o custo do commit é dividido pelo lote todo.
+- O SQLite fica em modo WAL (as gravações só acrescentam no fim do
+  arquivo de log) e a tabela é append-only: triggers recusam UPDATE e
+  DELETE.
+
+BUFFER CHEIO (disco lento ou travado), settings.AUDIT_BACKPRESSURE:
+- "drop": o registro é descartado e contado em "dropped" (a latência do
+  /predict nunca depende do disco);
+- "block": a requisição espera vaga no buffer por até
+  AUDIT_BLOCK_TIMEOUT_SECONDS (a espera acontece numa thread, o event
+  loop continua livre); passando disso, o registro é descartado.
+
+BANCO INDISPONÍVEL (diretório sem permissão, disco cheio...): a thread
+não morre. Ela tenta reabrir o banco com espera crescente entre as
+tentativas (backoff), e o buffer segura os registros enquanto isso.
+"writer_alive" e "connected" em stats() mostram o estado da thread.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+from app.core.config import settings
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Maior espera entre tentativas de reabrir o banco (backoff exponencial)
+MAX_RETRY_SECONDS = 30.0
+
+# Colunas gravadas, na ordem do INSERT
+COLUMNS = (
+    "created_at",
+    "symptoms",
+    "symptoms_processed",
+    "diagnosis",
+    "confidence",
+    "probabilities",
+    "model_version",
+    "latency_ms",
+    "worker_pid",
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS predictions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at REAL NOT NULL,
+    symptoms TEXT NOT NULL,
+    symptoms_processed TEXT NOT NULL,
+    diagnosis TEXT NOT NULL,
+    confidence REAL,
+    probabilities TEXT NOT NULL,
+    model_version TEXT NOT NULL,
+    latency_ms REAL NOT NULL,
+    worker_pid INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS predictions_created_at ON predictions (created_at);
+CREATE TRIGGER IF NOT EXISTS predictions_no_update BEFORE UPDATE ON predictions
+BEGIN SELECT RAISE(ABORT, 'audit log is append-only'); END;
+CREATE TRIGGER IF NOT EXISTS predictions_no_delete BEFORE DELETE ON predictions
+BEGIN SELECT RAISE(ABORT, 'audit log is append-only'); END;
+"""
+
+
+def audit_record(symptoms: str, result: Dict, model_version: str, latency_ms: float) -> tuple:
+    """
+    Monta a linha de auditoria de uma predição.
+
+    Args:
+        symptoms: Texto recebido na requisição
+        result: Retorno de ml_service.predict()
+        model_version: Versão do modelo que respondeu
+        latency_ms: Tempo da requisição (fila + modelo)
+
+    Returns:
+        Tupla na ordem de COLUMNS
+    """
+    return (
+        time.time(),
+        symptoms,
+        " ".join(result["symptoms_processed"]),
+        result["diagnosis"],
+        result["confidence"],
+        json.dumps(result["all_probabilities"], ensure_ascii=False),
+        model_version,
+        round(latency_ms, 3),
+        os.getpid(),
+    )
+
+
+class AuditSink:
+    """
+    Buffer limitado + thread que grava os registros em lotes no SQLite.
+
+    EXPLICAÇÃO:
+    record() é chamado pelas rotas; a thread de fundo espera até ter
+    `batch_size` registros ou passar `flush_interval` segundos e grava
+    tudo numa transação. Se a gravação falhar, o lote volta para o começo
+    do buffer (até a capacidade; o excesso é descartado) e a conexão é
+    reaberta antes da próxima tentativa.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        capacity: int,
+        batch_size: int,
+        flush_interval: float,
+        backpressure: str = "drop",
+        block_timeout: float = 1.0,
+    ):
+        if backpressure not in ("drop", "block"):
+            raise ValueError(f"AUDIT_BACKPRESSURE inválido: {backpressure} (use 'drop' ou 'block')")
+        self.path = path
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.backpressure = backpressure
+        self.block_timeout = block_timeout
+
+        self._buffer: Deque[tuple] = deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._connected = False
+
+        self.accepted = 0
+        self.dropped = 0
+        self.written = 0
+        self.batches = 0
+        self.write_errors = 0
+        self.connect_errors = 0
+        self.flush_seconds = 0.0
+        self.last_flush_ms: Optional[float] = None
+
+    # ------------------------------------------------------------------
+    # Lado das requisições
+    # ------------------------------------------------------------------
+
+    def offer(self, record: tuple, timeout: Optional[float] = None) -> bool:
+        """
+        Coloca um registro no buffer.
+
+        Args:
+            record: Linha montada por audit_record()
+            timeout: None = não espera; senão, segundos esperando vaga
+
+        Returns:
+            True se o registro entrou; False se foi descartado
+        """
+        with self._lock:
+            if len(self._buffer) >= self.capacity and timeout:
+                self._not_full.wait_for(lambda: len(self._buffer) < self.capacity, timeout)
+            if len(self._buffer) >= self.capacity:
+                self.dropped += 1
+                return False
+            self._buffer.append(record)
+            self.accepted += 1
+            if len(self._buffer) >= self.batch_size:
+                self._not_empty.notify()
+            return True
+
+    async def record(self, record: tuple):
+        """
+        Registra uma predição conforme a política de backpressure.
+
+        EXPLICAÇÃO:
+        Com vaga no buffer (o caso normal) é só um append. Com o buffer
+        cheio e a política "block", a espera roda numa thread do pool
+        padrão do asyncio: a requisição aguarda, o event loop não.
+        """
+        if self.backpressure == "block" and len(self._buffer) >= self.capacity:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self.offer, record, self.block_timeout)
+        else:
+            self.offer(record)
+
+    # ------------------------------------------------------------------
+    # Thread de gravação
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        """Abre o banco em modo WAL e cria a tabela (se preciso)."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=30.0)
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            # Com WAL, NORMAL só faz fsync nos checkpoints: um lote já gravado
+            # sobrevive a um crash do processo (não a uma queda de energia)
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+        except sqlite3.Error:
+            connection.close()
+            raise
+        return connection
+
+    def _take_batch(self) -> List[tuple]:
+        """Espera por um lote (ou pelo intervalo) e o retira do buffer."""
+        with self._lock:
+            self._not_empty.wait_for(
+                lambda: self._stopping or len(self._buffer) >= self.batch_size,
+                self.flush_interval,
+            )
+            batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+            if batch:
+                self._not_full.notify_all()
+            return batch
+
+    def _write(self, connection: sqlite3.Connection, batch: List[tuple]) -> bool:
+        """
+        Grava um lote numa transação. Em caso de erro, devolve o lote ao buffer.
+
+        EXPLICAÇÃO:
+        Enquanto o lote estava sendo gravado, novos registros podem ter
+        ocupado o buffer. Só volta para o buffer o que cabe na capacidade
+        (os registros mais antigos do lote); o resto conta em "dropped".
+        """
+        start = time.perf_counter()
+        try:
+            with connection:
+                connection.executemany(
+                    f"INSERT INTO predictions ({', '.join(COLUMNS)}) "
+                    f"VALUES ({', '.join('?' * len(COLUMNS))})",
+                    batch,
+                )
+        except sqlite3.Error as e:
+            logger.error(f"✗ Erro ao gravar {len(batch)} registros de auditoria: {str(e)}")
+            with self._lock:
+                self.write_errors += 1
+                room = max(0, self.capacity - len(self._buffer))
+                self._buffer.extendleft(reversed(batch[:room]))
+                self.dropped += len(batch) - min(room, len(batch))
+            return False
+
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.written += len(batch)
+            self.batches += 1
+            self.flush_seconds += elapsed
+            self.last_flush_ms = elapsed * 1000
+        return True
+
+    def _wait(self, seconds: float):
+        """Espera `seconds` segundos (ou até o stop())."""
+        with self._lock:
+            self._not_empty.wait_for(lambda: self._stopping, seconds)
+
+    def _discard_buffer(self):
+        """Descarta o que sobrou no buffer (stop() com o banco indisponível)."""
+        with self._lock:
+            lost = len(self._buffer)
+            self._buffer.clear()
+            self.dropped += lost
+            self._not_full.notify_all()
+        if lost:
+            logger.error(f"✗ {lost} registros de auditoria descartados no shutdown: banco indisponível")
+
+    def _run(self):
+        """
+        Laço da thread: grava lotes até stop() e esvazia o buffer no fim.
+
+        EXPLICAÇÃO:
+        Nenhuma falha do SQLite encerra a thread: sem conexão, tentamos
+        abrir de novo esperando o dobro a cada falha (até MAX_RETRY_SECONDS);
+        um lote que falha devolve os registros ao buffer e força reabrir
+        a conexão. No stop(), se o banco continua indisponível, o buffer é
+        descartado em vez de travar o shutdown.
+        """
+        connection: Optional[sqlite3.Connection] = None
+        delay = self.flush_interval
+        try:
+            while True:
+                if connection is None:
+                    try:
+                        connection = self._connect()
+                        self._connected = True
+                    except (sqlite3.Error, OSError) as e:
+                        with self._lock:
+                            self.connect_errors += 1
+                        logger.error(f"✗ Não foi possível abrir a auditoria ({self.path}): {str(e)}; "
+                                     f"nova tentativa em {delay:.1f} s")
+                        if self._stopping:
+                            self._discard_buffer()
+                            break
+                        self._wait(delay)
+                        delay = min(delay * 2, MAX_RETRY_SECONDS)
+                        continue
+
+                batch = self._take_batch()
+                if batch:
+                    if self._write(connection, batch):
+                        delay = self.flush_interval
+                        continue
+                    # Disco com problema: reabrir a conexão, sem insistir em loop
+                    connection.close()
+                    connection = None
+                    self._connected = False
+                    if self._stopping:
+                        self._discard_buffer()
+                        break
+                    self._wait(delay)
+                    delay = min(delay * 2, MAX_RETRY_SECONDS)
+                elif self._stopping:
+                    break
+        finally:
+            self._connected = False
+            if connection is not None:
+                connection.close()
+
+    def start(self):
+        """Inicia a thread de gravação (no startup de cada worker)."""
+        if self._thread is not None:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+        logger.info(f"✓ Auditoria gravando em: {self.path} (backpressure '{self.backpressure}')")
+
+    def stop(self, timeout: float = 10.0):
+        """Grava o que está no buffer e encerra a thread (no shutdown)."""
+        if self._thread is None:
+            return
+        with self._lock:
+            self._stopping = True
+            self._not_empty.notify()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def stats(self) -> Dict:
+        """Contadores do buffer e vazão das gravações."""
+        with self._lock:
+            return {
+                "path": self.path,
+                "backpressure": self.backpressure,
+                "buffered": len(self._buffer),
+                "capacity": self.capacity,
+                "accepted": self.accepted,
+                "dropped": self.dropped,
+                "written": self.written,
+                "batches": self.batches,
+                "write_errors": self.write_errors,
+                "connect_errors": self.connect_errors,
+                "writer_alive": self._thread is not None and self._thread.is_alive(),
+                "connected": self._connected,
+                "avg_batch_size": round(self.written / self.batches, 1) if self.batches else None,
+                "last_flush_ms": None if self.last_flush_ms is None else round(self.last_flush_ms, 3),
+                "flush_records_per_second": (
+                    round(self.written / self.flush_seconds) if self.flush_seconds else None
+                ),
+            }
+
+
+# INSTÂNCIA GLOBAL
+audit_sink = AuditSink(
+    path=settings.AUDIT_PATH,
+    capacity=settings.AUDIT_BUFFER_SIZE,
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+    backpressure=settings.AUDIT_BACKPRESSURE,
+    block_timeout=settings.AUDIT_BLOCK_TIMEOUT_SECONDS,
+)
@@ -0,0 +1,102 @@
+"""
+Backends de inferência - Quem calcula as probabilidades
+
+EXPLICAÇÃO:
+O MLModelService sabe preparar os sintomas e formatar a resposta, mas
+quem de fato transforma texto em probabilidades é um "backend":
+
+- "xgboost" (padrão): vetorizador TF-IDF do scikit-learn + XGBoost nativo.
+- "onnx": o vetorizador e o XGBoost exportados juntos para UM grafo ONNX
+  (veja app/tools/export_onnx.py) e executados pelo onnxruntime.
+  É bem mais rápido para uma linha só e não chama o scikit-learn
+  nem o XGBoost durante a predição.
+
+Os dois backends têm a mesma interface: predict_proba(textos) → matriz
+(n_textos × n_classes) na mesma ordem de classes do encoder. Os textos
+devem chegar JÁ PRÉ-PROCESSADOS (MLModelService._preprocess_symptoms: em
+minúsculas, sem vírgulas, com as palavras corrigidas): o grafo ONNX não
+converte para minúsculas, então "Febre ALTA" só dá o mesmo resultado
+nos dois backends depois do pré-processamento. A paridade é conferida
+em test_backends.py.
+
+Escolha o backend em settings.INFERENCE_BACKEND.
+"""
+
+import logging
+from typing import List
+
+import numpy as np
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+
+class XGBoostBackend:
+    """
+    Backend nativo: TF-IDF do scikit-learn + XGBClassifier.
+    """
+
+    name = "xgboost"
+
+    def __init__(self, vectorizer, model):
+        self.vectorizer = vectorizer
+        self.model = model
+
+    def predict_proba(self, texts: List[str]) -> np.ndarray:
+        """
+        Calcula as probabilidades de cada classe.
+
+        Args:
+            texts: Sintomas já pré-processados
+
+        Returns:
+            Matriz (len(texts) × n_classes)
+        """
+        return self.model.predict_proba(self.vectorizer.transform(texts))
+
+
+class OnnxBackend:
+    """
+    Backend ONNX: grafo único (tokenização + TF-IDF + árvores) no onnxruntime.
+
+    EXPLICAÇÃO:
+    O grafo recebe um tensor de strings (n × 1) e devolve dois tensores:
+    "label" e "probabilities". Usamos só as probabilidades.
+
+    ATENÇÃO: o grafo NÃO converte o texto para minúsculas (o lowercase do
+    onnxruntime depende de locales do sistema, veja export_onnx.py).
+    Maiúsculas viram palavras desconhecidas; passe sempre o texto de
+    MLModelService._preprocess_symptoms.
+    """
+
+    name = "onnx"
+
+    def __init__(self, onnx_path: str, threads: int = 1):
+        # Import aqui dentro: o onnxruntime só é necessário se este backend for usado
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = threads
+        options.inter_op_num_threads = 1
+        self.session = ort.InferenceSession(
+            onnx_path,
+            options,
+            providers=["CPUExecutionProvider"]
+        )
+        self._input_name = self.session.get_inputs()[0].name
+        self._output_names = ["probabilities"]
+        logger.info(f"✓ Sessão ONNX carregada de: {onnx_path}")
+
+    def predict_proba(self, texts: List[str]) -> np.ndarray:
+        """
+        Calcula as probabilidades de cada classe.
+
+        Args:
+            texts: Sintomas já pré-processados (em minúsculas)
+
+        Returns:
+            Matriz (len(texts) × n_classes), igual à do XGBoostBackend
+            para o mesmo texto pré-processado
+        """
+        inputs = np.array(texts, dtype=object).reshape(-1, 1)
+        return self.session.run(self._output_names, {self._input_name: inputs})[0]
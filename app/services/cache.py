@@ -0,0 +1,80 @@
+"""
+Cache LRU em memória - Guarda resultados caros de calcular
+
+EXPLICAÇÃO:
+Alguns resultados custam bem mais que uma predição (ex: a explicação do
+/explain) e se repetem muito: os mesmos sintomas chegam de vários
+pacientes. Guardamos os últimos `max_entries` resultados num dicionário
+ordenado pelo uso: cada acesso move a chave para o fim, e quando o cache
+enche sai a chave do começo (a usada há mais tempo, "Least Recently Used").
+
+Diferente do single-flight (que só junta chamadas SIMULTÂNEAS), o cache
+vale também para chamadas que chegam depois.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class LRUCache:
+    """
+    Dicionário com limite de tamanho que descarta o item usado há mais tempo.
+
+    EXPLICAÇÃO:
+    Usado pelas threads do executor, por isso protegido por um lock
+    (segurado só para consultar/atualizar o dicionário).
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._items: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Valor guardado para a chave (ou None), marcando-a como usada agora.
+        """
+        with self._lock:
+            value = self._items.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        """Guarda o valor, descartando o item mais antigo se o cache estiver cheio."""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Esvazia o cache (ex: o modelo mudou)."""
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def stats(self) -> Dict:
+        """Tamanho, acertos, erros e descartes."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._items),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            }
@@ -0,0 +1,169 @@
+"""
+Cascata de modelos - Modelo linear rápido na frente do XGBoost
+
+EXPLICAÇÃO:
+A maioria dos sintomas recebidos é "fácil": uma doença se destaca
+claramente. Para esses casos um modelo LINEAR sobre as mesmas features
+TF-IDF (uma multiplicação de matriz esparsa) chega à mesma resposta
+que as 3000 árvores do XGBoost, em microssegundos.
+
+1. O modelo linear (treinado para imitar as probabilidades do XGBoost,
+   veja app/tools/distill_linear.py) calcula as probabilidades.
+2. Se a MARGEM (prob. da 1ª doença - prob. da 2ª) for maior que o
+   limiar calibrado, a resposta do linear é usada.
+3. Senão, a requisição "escala" para o modelo completo.
+
+O limiar é calibrado no treino para que, entre as respostas dadas pelo
+linear, a concordância com o XGBoost fique acima de
+CASCADE_TARGET_AGREEMENT. Em produção, uma amostra das respostas rápidas
+(CASCADE_SHADOW_RATE) também roda no XGBoost para medir essa concordância.
+"""
+
+import threading
+from typing import Dict, Optional
+
+import numpy as np
+
+
+class LinearFastPath:
+    """
+    Modelo linear carregado do .npz gerado por app.tools.distill_linear.
+
+    EXPLICAÇÃO:
+    Para um texto só, montar a matriz esparsa do scikit-learn custa
+    mais que o próprio modelo. predict_proba_text() faz o TF-IDF direto:
+    pega o peso IDF de cada palavra conhecida, normaliza e soma só as
+    linhas de coef dessas palavras.
+
+    Attributes:
+        coef: Pesos (n_features × n_classes)
+        intercept: Viés de cada classe
+        threshold: Margem mínima para responder sem escalar
+    """
+
+    def __init__(self, path: str, vectorizer):
+        data = np.load(path)
+        self.coef = np.ascontiguousarray(data["coef"].T)  # n_features × n_classes
+        self.intercept = data["intercept"]
+        self.threshold = float(data["threshold"])
+
+        n_features = len(vectorizer.vocabulary_)
+        if self.coef.shape[0] != n_features:
+            raise ValueError(
+                f"Modelo linear tem {self.coef.shape[0]} features, "
+                f"o vetorizador tem {n_features}: gere de novo com "
+                f"python -m app.tools.distill_linear"
+            )
+        if vectorizer.norm != "l2" or vectorizer.sublinear_tf or not vectorizer.use_idf:
+            raise ValueError("A cascata só reproduz TF-IDF com norm='l2' e idf sem sublinear_tf")
+
+        self._analyzer = vectorizer.build_analyzer()
+        self._vocabulary = vectorizer.vocabulary_
+        self._idf = vectorizer.idf_
+
+    def predict_proba(self, X) -> np.ndarray:
+        """
+        Probabilidades (softmax) para uma matriz TF-IDF esparsa.
+
+        Returns:
+            Matriz (n_linhas × n_classes)
+        """
+        logits = X @ self.coef + self.intercept
+        logits -= logits.max(axis=1, keepdims=True)
+        exp = np.exp(logits)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    def predict_proba_text(self, text: str) -> np.ndarray:
+        """
+        Probabilidades para UM texto, sem passar pelo vetorizador.
+
+        Returns:
+            Vetor (n_classes)
+        """
+        counts: Dict[int, int] = {}
+        for term in self._analyzer(text):
+            index = self._vocabulary.get(term)
+            if index is not None:
+                counts[index] = counts.get(index, 0) + 1
+
+        logits = self.intercept.astype(np.float64)
+        if counts:
+            indices = np.fromiter(counts.keys(), dtype=np.intp, count=len(counts))
+            weights = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+            weights *= self._idf[indices]
+            weights /= np.sqrt(weights @ weights)
+            logits = logits + weights @ self.coef[indices]
+
+        logits -= logits.max()
+        exp = np.exp(logits)
+        return exp / exp.sum()
+
+    def margin(self, probabilities: np.ndarray) -> float:
+        """Diferença entre a maior e a segunda maior probabilidade."""
+        second, first = np.partition(probabilities, -2)[-2:]
+        return float(first - second)
+
+    def is_confident(self, probabilities: np.ndarray) -> bool:
+        """True se a resposta do linear pode ser usada sem escalar."""
+        return self.margin(probabilities) >= self.threshold
+
+
+class CascadeStats:
+    """
+    Contadores da cascata (usados pelas threads do executor, por isso o lock).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.escalated = 0
+        self._latency_sum_ms = {"linear": 0.0, "full": 0.0}
+        self._latency_count = {"linear": 0, "full": 0}
+        self.shadow_checked = 0
+        self.shadow_agreed = 0
+
+    def record(self, linear_ms: float, full_ms: Optional[float]):
+        """
+        Registra uma predição.
+
+        Args:
+            linear_ms: Tempo do modelo linear (sempre roda)
+            full_ms: Tempo do modelo completo, ou None se não escalou
+        """
+        with self._lock:
+            self.requests += 1
+            self._latency_sum_ms["linear"] += linear_ms
+            self._latency_count["linear"] += 1
+            if full_ms is not None:
+                self.escalated += 1
+                self._latency_sum_ms["full"] += full_ms
+                self._latency_count["full"] += 1
+
+    def record_shadow(self, agreed: bool):
+        """Registra uma comparação linear x XGBoost numa resposta rápida."""
+        with self._lock:
+            self.shadow_checked += 1
+            self.shadow_agreed += int(agreed)
+
+    def stats(self) -> Dict:
+        """Taxa de escalação, latência média por camada e concordância amostrada."""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "escalated": self.escalated,
+                "escalation_rate": (
+                    round(self.escalated / self.requests, 4) if self.requests else None
+                ),
+                "mean_latency_ms": {
+                    tier: (
+                        round(self._latency_sum_ms[tier] / self._latency_count[tier], 4)
+                        if self._latency_count[tier] else None
+                    )
+                    for tier in ("linear", "full")
+                },
+                "shadow_checked": self.shadow_checked,
+                "shadow_agreement": (
+                    round(self.shadow_agreed / self.shadow_checked, 4)
+                    if self.shadow_checked else None
+                ),
+            }
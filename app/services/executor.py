@@ -0,0 +1,182 @@
+"""
+Executor de inferência - Roda o modelo fora do event loop
+
+EXPLICAÇÃO:
+O FastAPI é assíncrono: um único event loop atende todas as requisições.
+A predição do XGBoost é uma chamada BLOQUEANTE (usa CPU).
+Se rodássemos o modelo direto na rota, enquanto uma predição acontece
+NENHUMA outra requisição seria atendida (nem o /health!).
+
+Por isso mandamos as predições para um pool de threads dedicado.
+Este módulo também conta quantas tarefas estão na fila e mede o tempo
+médio de execução de cada uma. Essas informações são usadas pelo /readyz
+e pelo controle de admissão para saber se o worker está sobrecarregado.
+
+Há dois pools:
+- inference_executor: predições (/predict, /similar, canary).
+- explain_executor: explicações do /explain, que custam várias vezes uma
+  predição. Pool separado, pequeno e com prioridade de CPU menor (nice),
+  para que um pico de explicações nunca atrase as predições.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from app.core.config import settings
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+
+class InferenceExecutor:
+    """
+    Pool de threads para inferência com contadores de fila.
+
+    EXPLICAÇÃO:
+    - queue_depth: tarefas enviadas que ainda não começaram (esperando thread)
+    - active: tarefas rodando neste momento
+    - service_time_ms: média móvel exponencial (EWMA) do tempo de execução
+      de cada tarefa, sem contar o tempo de fila
+    - rejected: tarefas recusadas por quem usa o pool (ex: fila cheia)
+    """
+
+    # Peso da última medição na média móvel
+    EWMA_ALPHA = 0.2
+
+    def __init__(self, max_workers: int, name: str = "inference", niceness: int = 0):
+        """
+        Args:
+            max_workers: Threads do pool
+            name: Prefixo do nome das threads
+            niceness: Quanto aumentar o "nice" de cada thread (0 = igual ao
+                processo). Threads com nice maior recebem menos CPU quando
+                há disputa pelos núcleos.
+        """
+        self.max_workers = max_workers
+        self.niceness = niceness
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix=name,
+            initializer=self._lower_priority if niceness > 0 else None,
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._rejected = 0
+        self._service_time_ms: Optional[float] = None
+
+    def _lower_priority(self):
+        """
+        Aumenta o nice da thread atual (roda uma vez, quando a thread nasce).
+
+        EXPLICAÇÃO:
+        No Linux cada thread tem a sua prioridade: setpriority() com o id
+        da thread muda só ela, e não o processo inteiro.
+        """
+        try:
+            current = os.getpriority(os.PRIO_PROCESS, threading.get_native_id())
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), current + self.niceness)
+        except (AttributeError, OSError) as e:  # Windows/macOS ou sem permissão
+            logger.warning(f"Não foi possível reduzir a prioridade da thread: {e}")
+
+    def _dequeue(self, ticket: List[bool]):
+        """
+        Tira a tarefa da contagem da fila (só uma vez por tarefa).
+
+        EXPLICAÇÃO:
+        Quem chegar primeiro desconta: a thread, quando a tarefa começa, ou
+        run(), quando a tarefa nunca vai rodar (submit falhou depois do
+        shutdown, ou a tarefa foi cancelada ainda na fila).
+        """
+        with self._lock:
+            if ticket[0]:
+                ticket[0] = False
+                self._queued -= 1
+
+    def _wrap(self, ticket: List[bool], fn: Callable, *args) -> Any:
+        """Executa fn atualizando os contadores (roda dentro da thread)."""
+        self._dequeue(ticket)
+        with self._lock:
+            self._active += 1
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with self._lock:
+                self._active -= 1
+                if self._service_time_ms is None:
+                    self._service_time_ms = elapsed_ms
+                else:
+                    self._service_time_ms += self.EWMA_ALPHA * (elapsed_ms - self._service_time_ms)
+
+    async def run(self, fn: Callable, *args) -> Any:
+        """
+        Executa fn(*args) no pool e aguarda o resultado.
+
+        Args:
+            fn: Função bloqueante (ex: ml_service.predict)
+            *args: Argumentos da função
+
+        Returns:
+            O retorno de fn
+        """
+        ticket = [True]  # True enquanto a tarefa conta como "na fila"
+        with self._lock:
+            self._queued += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, self._wrap, ticket, fn, *args)
+        finally:
+            self._dequeue(ticket)
+
+    @property
+    def queue_depth(self) -> int:
+        """Quantas tarefas estão esperando uma thread livre."""
+        return self._queued
+
+    @property
+    def active(self) -> int:
+        """Quantas tarefas estão rodando agora."""
+        return self._active
+
+    @property
+    def in_flight(self) -> int:
+        """Tarefas na fila + tarefas rodando."""
+        return self._queued + self._active
+
+    def record_rejection(self):
+        """Conta uma tarefa recusada antes de entrar no pool."""
+        self._rejected += 1
+
+    @property
+    def service_time_ms(self) -> Optional[float]:
+        """Tempo médio (EWMA) de execução de uma tarefa, ou None se nada rodou ainda."""
+        return self._service_time_ms
+
+    def stats(self) -> Dict:
+        """Retorna os contadores atuais do pool."""
+        return {
+            "max_workers": self.max_workers,
+            "queue_depth": self._queued,
+            "active": self._active,
+            "rejected": self._rejected,
+            "service_time_ms": self._service_time_ms,
+        }
+
+    def shutdown(self):
+        """Encerra o pool (chamado no shutdown do servidor)."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# INSTÂNCIA GLOBAL
+# O tamanho do pool vem do plano de CPU (settings.cpu_plan())
+inference_executor = InferenceExecutor(settings.cpu_plan()["inference_threads"])
+explain_executor = InferenceExecutor(
+    settings.EXPLAIN_THREADS, name="explain", niceness=settings.EXPLAIN_NICENESS
+)
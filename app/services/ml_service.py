@@ -16,14 +16,26 @@ Imagine um médico experiente:
 """
 
 import os
+import random
+import time
 import joblib
 import xgboost as xgb
 import numpy as np
-from typing import Dict, List, Tuple
+import scipy.sparse as sp
+from typing import Dict, List, Optional, Tuple
 import logging
 
 from app.core.config import settings
-from app.services.dataset import get_available_diseases
+from app.services.singleflight import SingleFlight
+from app.services.artifacts import ArtifactStore
+from app.services.cache import LRUCache
+from app.services.drift import DriftMonitor
+from app.services.prediction_cache import PredictionCache
+from app.services.backends import XGBoostBackend, OnnxBackend
+from app.services.cascade import CascadeStats, LinearFastPath
+from app.services.normalizer import SymptomNormalizer
+from app.services.suggest import build_index
+from app.services.similar import SimilarCases
 
 # Configurar logging para debug
 logging.basicConfig(level=logging.INFO)
@@ -60,13 +72,43 @@ class MLModelService:
         self.vectorizer_path = os.path.join(settings.MODEL_PATH, settings.VECTORIZER_FILE)
         self.encoder_path = os.path.join(settings.MODEL_PATH, settings.ENCODER_FILE)
         
+        # Requisições idênticas simultâneas compartilham uma única predição
+        self._singleflight = SingleFlight()
+        
+        # Métricas da cascata linear → modelo completo
+        self.cascade_stats = CascadeStats()
+        
+        # Cache persistente de predições (criado em _load_prediction_cache)
+        self.prediction_cache = None
+        
         # Carregar componentes
+        self._load_manifest()
         self._load_model()
         self._load_vectorizer()
+        self._load_normalizer()
+        self._load_suggestions()
+        self._load_similar_cases()
         self._load_encoder()
+        self._load_backend()
+        self._load_fast_path()
+        self._compute_model_hash()
+        self._load_explainer()
+        self._load_drift_monitor()
+        self._load_prediction_cache()
         
         logger.info("✓ Serviço de ML inicializado com sucesso!")
     
+    def _load_manifest(self):
+        """
+        Lê o manifesto dos artefatos (sha256 de cada arquivo de model/).
+        
+        EXPLICAÇÃO:
+        Cada _load_* confere o seu arquivo com self.artifacts.verify()
+        antes de carregar: arquivo diferente do manifesto = a carga falha.
+        Veja app/services/artifacts.py.
+        """
+        self.artifacts = ArtifactStore(settings.MODEL_PATH)
+    
     def _load_model(self):
         """
         Carrega o modelo XGBoost treinado.
@@ -75,15 +117,62 @@ class MLModelService:
         XGBoost é o algoritmo de ML que usamos.
         Ele foi treinado com sintomas e aprendeu a reconhecer padrões.
         Aqui apenas carregamos o modelo já treinado (não treinamos de novo).
+        
+        Ler o JSON das árvores é a parte mais lenta da carga. Na primeira
+        vez o modelo é salvo também no formato binário do XGBoost (UBJSON)
+        no cache de derivados, com o hash do JSON no caminho; nos restarts
+        seguintes carregamos o binário (~3x mais rápido).
         """
         try:
-            self.model = xgb.XGBClassifier()
-            self.model.load_model(self.model_path)
+            self.artifacts.verify(settings.MODEL_FILE)
+            self.model = self._load_compiled_model()
+            
+            # Limitar as threads OpenMP de cada predição conforme o plano
+            # de CPU, para os workers não disputarem os mesmos núcleos
+            self.cpu_plan = settings.cpu_plan()
+            self.model.set_params(n_jobs=self.cpu_plan["booster_threads"])
+            
+            # Versão = começo do sha256 do arquivo do modelo (registrada na auditoria)
+            self.model_version = self.artifacts.hashes[settings.MODEL_FILE][:12]
+            
             logger.info(f"✓ Modelo carregado de: {self.model_path}")
+            logger.info(f"✓ Plano de CPU: {self.cpu_plan}")
         except Exception as e:
             logger.error(f"✗ Erro ao carregar modelo: {str(e)}")
             raise
     
+    def _load_compiled_model(self) -> xgb.XGBClassifier:
+        """
+        O modelo a partir do binário em cache; se não houver, do JSON (e grava o binário).
+        
+        EXPLICAÇÃO:
+        A versão do XGBoost vai no nome do binário: outra versão pode
+        gravar o formato de outro jeito. Falhar ao gravar o cache não
+        impede a carga (o modelo já foi lido do JSON).
+        """
+        model = xgb.XGBClassifier()
+        compiled_path = self.artifacts.derived_path(settings.MODEL_FILE, f".xgb-{xgb.__version__}.ubj")
+        if compiled_path is not None and os.path.exists(compiled_path):
+            try:
+                model.load_model(compiled_path)
+                logger.info(f"✓ Árvores carregadas do cache: {compiled_path}")
+                return model
+            except Exception as e:
+                logger.warning(f"Cache do modelo inválido ({compiled_path}), lendo o JSON: {str(e)}")
+                model = xgb.XGBClassifier()
+        
+        model.load_model(self.model_path)
+        if compiled_path is not None:
+            try:
+                os.makedirs(os.path.dirname(compiled_path), exist_ok=True)
+                # Termina em .ubj: o XGBoost escolhe o formato pela extensão
+                tmp_path = f"{compiled_path}.{os.getpid()}.tmp.ubj"
+                model.save_model(tmp_path)
+                os.replace(tmp_path, compiled_path)
+            except OSError as e:
+                logger.warning(f"Não foi possível gravar o cache do modelo: {str(e)}")
+        return model
+    
     def _load_vectorizer(self):
         """
         Carrega o vetorizador TF-IDF.
@@ -99,12 +188,68 @@ class MLModelService:
         como converter sintomas em números da mesma forma.
         """
         try:
-            self.vectorizer = joblib.load(self.vectorizer_path)
+            self.vectorizer = joblib.load(self.artifacts.verify(settings.VECTORIZER_FILE))
+            self._analyzer = self.vectorizer.build_analyzer()
             logger.info(f"✓ Vetorizador carregado de: {self.vectorizer_path}")
         except Exception as e:
             logger.error(f"✗ Erro ao carregar vetorizador: {str(e)}")
             raise
     
+    def _load_normalizer(self):
+        """
+        Monta o normalizador de sintomas a partir do vocabulário (se NORMALIZER_ENABLED).
+        
+        EXPLICAÇÃO:
+        Corrige acentos e erros de digitação das palavras que o
+        vetorizador não conhece. Veja app/services/normalizer.py.
+        """
+        self.normalizer = None
+        if not settings.NORMALIZER_ENABLED:
+            return
+        
+        self.normalizer = SymptomNormalizer(
+            self.vectorizer, max_distance=settings.NORMALIZER_MAX_EDIT_DISTANCE
+        )
+        logger.info(f"✓ Normalizador de sintomas pronto "
+                    f"({self.normalizer.stats()['delete_index_size']} deleções indexadas)")
+    
+    def _load_suggestions(self):
+        """
+        Monta o índice do autocomplete de sintomas.
+        
+        EXPLICAÇÃO:
+        Usa model/sugestoes_HealthIA.json (palavras e expressões do
+        dataset com a frequência de cada uma) ou, se o arquivo não
+        existir, as palavras do vocabulário. Veja app/services/suggest.py.
+        """
+        suggestions_path = os.path.join(settings.MODEL_PATH, settings.SUGGESTIONS_FILE)
+        if os.path.exists(suggestions_path):
+            self.artifacts.verify(settings.SUGGESTIONS_FILE)
+        self.suggestions = build_index(suggestions_path, self.vectorizer)
+        logger.info(f"✓ Autocomplete pronto ({self.suggestions.size} sugestões)")
+    
+    def _load_similar_cases(self):
+        """
+        Carrega o índice invertido dos casos do treino (se existir).
+        
+        EXPLICAÇÃO:
+        O arquivo é gerado por `python -m app.tools.build_similar_index`.
+        Sem ele, o endpoint /similar responde 503. Veja app/services/similar.py.
+        """
+        self.similar_cases = None
+        similar_path = os.path.join(settings.MODEL_PATH, settings.SIMILAR_CASES_FILE)
+        if not os.path.exists(similar_path):
+            logger.info(f"Índice de casos parecidos não encontrado ({similar_path})")
+            return
+        
+        try:
+            self.artifacts.verify(settings.SIMILAR_CASES_FILE)
+            self.similar_cases = SimilarCases(similar_path, self.vectorizer)
+            logger.info(f"✓ Índice de casos parecidos carregado ({self.similar_cases.size} casos)")
+        except Exception as e:
+            logger.error(f"✗ Erro ao carregar índice de casos parecidos: {str(e)}")
+            raise
+    
     def _load_encoder(self):
         """
         Carrega o encoder de labels.
@@ -118,12 +263,154 @@ class MLModelService:
         Encoder traduz: 5 → "Diabetes Tipo 1"
         """
         try:
-            self.encoder = joblib.load(self.encoder_path)
+            self.encoder = joblib.load(self.artifacts.verify(settings.ENCODER_FILE))
             logger.info(f"✓ Encoder carregado de: {self.encoder_path}")
         except Exception as e:
             logger.error(f"✗ Erro ao carregar encoder: {str(e)}")
             raise
     
+    def _load_backend(self):
+        """
+        Escolhe quem vai calcular as probabilidades (settings.INFERENCE_BACKEND).
+        
+        EXPLICAÇÃO:
+        - "xgboost": vetorizador + modelo carregados acima (padrão)
+        - "onnx": grafo ONNX gerado por `python -m app.tools.export_onnx`
+        Veja app/services/backends.py.
+        """
+        try:
+            if settings.INFERENCE_BACKEND == "onnx":
+                onnx_path = self.artifacts.verify(settings.ONNX_FILE)
+                self.backend = OnnxBackend(onnx_path, threads=self.cpu_plan["booster_threads"])
+            else:
+                self.backend = XGBoostBackend(self.vectorizer, self.model)
+            logger.info(f"✓ Backend de inferência: {self.backend.name}")
+        except Exception as e:
+            logger.error(f"✗ Erro ao carregar backend de inferência: {str(e)}")
+            raise
+    
+    def _load_fast_path(self):
+        """
+        Carrega o modelo linear da cascata (se CASCADE_ENABLED).
+        
+        EXPLICAÇÃO:
+        O arquivo é gerado por `python -m app.tools.distill_linear`.
+        Veja app/services/cascade.py.
+        """
+        self.fast_path = None
+        if not settings.CASCADE_ENABLED:
+            return
+        
+        try:
+            linear_path = self.artifacts.verify(settings.LINEAR_FILE)
+            self.fast_path = LinearFastPath(linear_path, self.vectorizer)
+            logger.info(
+                f"✓ Cascata linear carregada de: {linear_path} "
+                f"(margem mínima {self.fast_path.threshold:.4f})"
+            )
+        except Exception as e:
+            logger.error(f"✗ Erro ao carregar modelo linear da cascata: {str(e)}")
+            raise
+    
+    def _load_explainer(self):
+        """
+        Prepara as explicações do /explain (nomes das palavras + cache).
+        
+        EXPLICAÇÃO:
+        O cache é recriado a cada (re)carga: explicações do modelo antigo
+        não valem para o novo.
+        """
+        self._feature_names = self.vectorizer.get_feature_names_out()
+        self.explanation_cache = LRUCache(settings.EXPLAIN_CACHE_SIZE)
+    
+    def _load_drift_monitor(self):
+        """
+        Cria o monitor de drift (se DRIFT_ENABLED).
+        
+        EXPLICAÇÃO:
+        Recriado a cada (re)carga: vocabulário e doenças podem ter mudado,
+        e as estatísticas do modelo antigo não se comparam com as do novo.
+        Veja app/services/drift.py.
+        """
+        self.drift_monitor = None
+        if not settings.DRIFT_ENABLED:
+            return
+        
+        classes = self.get_available_diseases()
+        self._class_index = {name: index for index, name in enumerate(classes)}
+        self.drift_monitor = DriftMonitor(
+            classes,
+            window_seconds=settings.DRIFT_WINDOW_SECONDS,
+            buckets=settings.DRIFT_BUCKETS,
+            sketch_depth=settings.DRIFT_SKETCH_DEPTH,
+            sketch_width=settings.DRIFT_SKETCH_WIDTH,
+            top_k=settings.DRIFT_TOP_K,
+        )
+    
+    def _load_prediction_cache(self):
+        """
+        Cria o cache persistente de predições (se PREDICTION_CACHE_ENABLED).
+        
+        EXPLICAÇÃO:
+        A chave do cache inclui o hash dos artefatos que definem a
+        predição; com artefatos novos o hash muda e as entradas antigas
+        deixam de valer. A thread de gravação é iniciada pelo main.py,
+        no startup de cada worker. Veja app/services/prediction_cache.py.
+        """
+        if not settings.PREDICTION_CACHE_ENABLED:
+            return
+        
+        self.prediction_cache = PredictionCache(
+            settings.PREDICTION_CACHE_PATH,
+            self.model_hash,
+            memory_entries=settings.PREDICTION_CACHE_MEMORY_ENTRIES,
+            max_bytes=int(settings.PREDICTION_CACHE_MAX_MB * 1024 * 1024),
+        )
+    
+    def _compute_model_hash(self):
+        """
+        Hash de tudo que define a predição: artefatos carregados + backend.
+        
+        EXPLICAÇÃO:
+        Modelo, vetorizador e encoder sempre; o grafo ONNX e o modelo
+        linear só quando estão em uso. Usa os sha256 já calculados na
+        conferência (nenhum arquivo é lido de novo). Aparece no /model-info
+        e no header X-Model-Hash de cada resposta, e é parte da chave do
+        cache de predições. O normalizador não entra: ele roda antes da
+        chave do cache ser montada.
+        """
+        names = [settings.MODEL_FILE, settings.VECTORIZER_FILE, settings.ENCODER_FILE]
+        if settings.INFERENCE_BACKEND == "onnx":
+            names.append(settings.ONNX_FILE)
+        if self.fast_path is not None:
+            names.append(settings.LINEAR_FILE)
+        
+        self.model_hash = self.artifacts.digest(
+            names, extra=f"{self.backend.name}|cascade={self.fast_path is not None}"
+        )
+        logger.info(f"✓ Hash do modelo: {self.model_hash}")
+    
+    def _cache_key(self, tokens: List[str]) -> str:
+        """
+        Chave canônica dos sintomas: palavras do vocabulário, em ordem alfabética.
+        
+        EXPLICAÇÃO:
+        O vetor TF-IDF só depende de QUANTAS vezes cada palavra conhecida
+        aparece. Ordem e palavras desconhecidas não mudam a predição, então
+        "febre alta" e "alta febre" compartilham a mesma entrada. As
+        repetições ficam ("febre febre" é outro vetor).
+        """
+        vocabulary = self.vectorizer.vocabulary_
+        return " ".join(sorted(token for token in tokens if token in vocabulary))
+    
+    def _record_drift(self, tokens: List[str], result: Dict):
+        """Passa as palavras da requisição e o diagnóstico para o monitor de drift."""
+        vocabulary = self.vectorizer.vocabulary_
+        unknown = [token for token in tokens if token not in vocabulary]
+        self.drift_monitor.record(
+            tokens, unknown, self._class_index[result["diagnosis"]], result["confidence"]
+        )
+    
     def predict(self, symptoms: str) -> Dict:
         """
         Faz a predição de diagnóstico baseado em sintomas.
@@ -150,37 +437,294 @@ class MLModelService:
             
             # PASSO 1: Limpar e preparar sintomas
             symptoms_cleaned = self._preprocess_symptoms(symptoms)
+            tokens = self._analyzer(symptoms_cleaned)
             
-            # PASSO 2: Vetorizar sintomas (texto → números)
-            symptoms_vectorized = self.vectorizer.transform([symptoms_cleaned])
-            logger.info(f"Sintomas vetorizados: shape = {symptoms_vectorized.shape}")
+            # Cache persistente: mesma chave canônica = mesma predição
+            cache_key = None
+            result = None
+            if self.prediction_cache is not None:
+                cache_key = self._cache_key(tokens)
+                cached = self.prediction_cache.get(cache_key)
+                if cached is not None:
+                    result = {**cached, "symptoms_processed": symptoms_cleaned.split()}
             
-            # PASSO 3: Fazer predição com o modelo
-            # predict() retorna o número da classe
-            prediction = self.model.predict(symptoms_vectorized)
+            # PASSOS 2 a 6: Vetorizar, prever e formatar
+            # Se outra thread já está calculando os MESMOS sintomas
+            # normalizados, esperamos o resultado dela (single-flight).
+            if result is None:
+                result = self._singleflight.do(
+                    symptoms_cleaned,
+                    lambda: self._run_and_cache(symptoms_cleaned, cache_key)
+                )
             
-            # PASSO 4: Obter probabilidades (confiança)
-            # predict_proba() retorna array com probabilidade de cada classe
-            prediction_proba = self.model.predict_proba(symptoms_vectorized)
-            confidence = float(np.max(prediction_proba) * 100)  # Converter para porcentagem
+            # Estatísticas de drift (cada requisição conta, mesmo as
+            # que aproveitaram o resultado de outra ou do cache)
+            if self.drift_monitor is not None:
+                self._record_drift(tokens, result)
             
-            # PASSO 5: Decodificar número → nome da doença
-            diagnosis = self.encoder.classes_[int(prediction[0])]
-            
-            logger.info(f"✓ Diagnóstico: {diagnosis} (confiança: {confidence:.2f}%)")
-            
-            # PASSO 6: Retornar resultado formatado
-            return {
-                "diagnosis": diagnosis,
-                "confidence": round(confidence, 2),
-                "symptoms_processed": symptoms_cleaned.split(),
-                "all_probabilities": self._get_top_predictions(prediction_proba[0], top_n=3)
-            }
+            # Cópia rasa: cada chamador recebe seu próprio dicionário
+            return dict(result)
             
         except Exception as e:
             logger.error(f"✗ Erro na predição: {str(e)}")
             raise Exception(f"Erro ao processar diagnóstico: {str(e)}")
     
+    def _run_and_cache(self, symptoms_cleaned: str, cache_key: Optional[str]) -> Dict:
+        """Roda o modelo e guarda o resultado no cache persistente (se ligado)."""
+        result = self._run_model(symptoms_cleaned)
+        if cache_key is not None:
+            self.prediction_cache.put(cache_key, self._cache_entry(result))
+        return result
+    
+    @staticmethod
+    def _cache_entry(result: Dict) -> Dict:
+        """O que o cache guarda de uma predição (symptoms_processed é de cada requisição)."""
+        return {
+            "diagnosis": result["diagnosis"],
+            "confidence": result["confidence"],
+            "all_probabilities": result["all_probabilities"],
+        }
+    
+    def warm_prediction_cache(self, texts: List[str], batch_size: int = 256,
+                              deadline: Optional[float] = None) -> Dict:
+        """
+        Calcula em lote as predições que ainda não estão no cache persistente.
+        
+        EXPLICAÇÃO:
+        Usado pelo aquecimento do startup (app/services/warmup.py). Textos
+        com a mesma chave canônica são calculados uma vez só, e os que o
+        cache já tem (em memória ou no disco, ex: calculados por outro
+        worker) não voltam ao modelo. O resultado é o mesmo de predict():
+        com a cascata ligada, o linear responde quando tem margem.
+        
+        Args:
+            texts: Textos de sintomas, do mais para o menos importante
+            batch_size: Textos por chamada ao modelo
+            deadline: time.monotonic() limite; os lotes restantes são pulados
+        
+        Returns:
+            Dict com keys (chaves distintas), cached (já estavam no cache),
+            scored (calculadas agora) e skipped (sem tempo)
+        """
+        pending: Dict[str, str] = {}
+        seen = set()
+        cached = 0
+        for text in texts:
+            symptoms_cleaned = self._preprocess_symptoms(text)
+            key = self._cache_key(self._analyzer(symptoms_cleaned))
+            if key in seen:
+                continue
+            seen.add(key)
+            if self.prediction_cache.get(key) is not None:
+                cached += 1
+            else:
+                pending[key] = symptoms_cleaned
+        
+        items = list(pending.items())
+        scored = 0
+        for start in range(0, len(items), batch_size):
+            if deadline is not None and time.monotonic() > deadline:
+                break
+            batch = items[start:start + batch_size]
+            probabilities = self._predict_proba_batch([symptoms_cleaned for _, symptoms_cleaned in batch])
+            for (key, symptoms_cleaned), row in zip(batch, probabilities):
+                result = self._format_result(symptoms_cleaned, row)
+                self.prediction_cache.put(key, self._cache_entry(result))
+            scored += len(batch)
+        
+        return {"keys": len(seen), "cached": cached, "scored": scored, "skipped": len(items) - scored}
+    
+    def _predict_proba_batch(self, cleaned: List[str]) -> np.ndarray:
+        """
+        Probabilidades de um lote pelo mesmo caminho de _run_model().
+        
+        EXPLICAÇÃO:
+        Sem cascata, uma chamada ao backend. Com cascata, o linear roda no
+        lote inteiro e só as linhas sem margem vão para o modelo completo
+        (sem as amostras de conferência nem as métricas da cascata, que
+        medem requisições reais).
+        """
+        if self.fast_path is None:
+            return self.backend.predict_proba(cleaned)
+        
+        probabilities = self.fast_path.predict_proba(self.vectorizer.transform(cleaned))
+        escalate = [
+            index for index, row in enumerate(probabilities)
+            if not self.fast_path.is_confident(row)
+        ]
+        if escalate:
+            probabilities[escalate] = self.backend.predict_proba([cleaned[index] for index in escalate])
+        return probabilities
+    
+    def predict_batch(self, symptoms_list: List[str]) -> List[Dict]:
+        """
+        Faz a predição de vários textos de uma vez.
+        
+        EXPLICAÇÃO:
+        Uma única chamada ao backend para o lote inteiro: vetorizar e
+        rodar as árvores sobre uma matriz com N linhas é muito mais
+        rápido que N chamadas de uma linha. Usado pelos jobs offline
+        (ex: app.tools.batch_score), que não passam pelo single-flight.
+        
+        O lote vai sempre para o modelo completo, mesmo com a cascata
+        ligada: ela existe para reduzir a latência de UMA requisição.
+        
+        Args:
+            symptoms_list: Textos de sintomas
+        
+        Returns:
+            Um Dict (mesmo formato de predict()) por texto, na mesma ordem
+        """
+        if not symptoms_list:
+            return []
+        
+        cleaned = [self._preprocess_symptoms(symptoms) for symptoms in symptoms_list]
+        probabilities = self.backend.predict_proba(cleaned)
+        return [
+            self._format_result(symptoms_cleaned, row)
+            for symptoms_cleaned, row in zip(cleaned, probabilities)
+        ]
+    
+    def _run_model(self, symptoms_cleaned: str) -> Dict:
+        """
+        Executa o modelo sobre sintomas já pré-processados.
+        
+        EXPLICAÇÃO:
+        Separado do predict() para que outras partes (ex: o canary do
+        /readyz) possam rodar exatamente o mesmo caminho do modelo.
+        
+        Com CASCADE_ENABLED, o modelo linear responde primeiro e só os
+        casos com margem baixa vão para o modelo completo (veja cascade.py).
+        
+        Args:
+            symptoms_cleaned: Sintomas já limpos por _preprocess_symptoms
+        
+        Returns:
+            Dict no mesmo formato de predict()
+        """
+        if self.fast_path is None:
+            # PASSOS 2 a 4: Vetorizar (texto → números) e obter probabilidades
+            # O backend (XGBoost nativo ou ONNX) faz as duas coisas.
+            probabilities = self.backend.predict_proba([symptoms_cleaned])[0]
+            return self._format_result(symptoms_cleaned, probabilities)
+        
+        # CASCATA: modelo linear primeiro
+        start = time.perf_counter()
+        probabilities = self.fast_path.predict_proba_text(symptoms_cleaned)
+        linear_ms = (time.perf_counter() - start) * 1000
+        
+        if self.fast_path.is_confident(probabilities):
+            self.cascade_stats.record(linear_ms, None)
+            
+            # Amostra: conferir a resposta rápida contra o modelo completo
+            if random.random() < settings.CASCADE_SHADOW_RATE:
+                full = self.backend.predict_proba([symptoms_cleaned])[0]
+                self.cascade_stats.record_shadow(
+                    int(np.argmax(full)) == int(np.argmax(probabilities))
+                )
+            return self._format_result(symptoms_cleaned, probabilities)
+        
+        # Margem baixa: escalar para o modelo completo
+        start = time.perf_counter()
+        probabilities = self.backend.predict_proba([symptoms_cleaned])[0]
+        self.cascade_stats.record(linear_ms, (time.perf_counter() - start) * 1000)
+        return self._format_result(symptoms_cleaned, probabilities)
+    
+    def _format_result(self, symptoms_cleaned: str, probabilities: np.ndarray, top_n: int = 3) -> Dict:
+        """
+        Monta o resultado a partir das probabilidades de cada classe.
+        
+        Args:
+            symptoms_cleaned: Sintomas já pré-processados
+            probabilities: Probabilidade de cada classe (ordem do encoder)
+            top_n: Quantas doenças em all_probabilities
+        
+        Returns:
+            Dict no mesmo formato de predict()
+        """
+        # A classe prevista é a de maior probabilidade (é o que o predict()
+        # do XGBoost faz por dentro), então evitamos rodar o modelo duas vezes.
+        prediction = int(np.argmax(probabilities))
+        confidence = float(probabilities[prediction] * 100)  # Converter para porcentagem
+        
+        # PASSO 5: Decodificar número → nome da doença
+        diagnosis = self.encoder.classes_[prediction]
+        
+        logger.info(f"✓ Diagnóstico: {diagnosis} (confiança: {confidence:.2f}%)")
+        
+        # PASSO 6: Retornar resultado formatado
+        return {
+            "diagnosis": diagnosis,
+            "confidence": round(confidence, 2),
+            "symptoms_processed": symptoms_cleaned.split(),
+            "all_probabilities": self._get_top_predictions(probabilities, top_n=top_n)
+        }
+    
+    def analyze(self, symptoms: str) -> Tuple[str, List[str]]:
+        """
+        Pré-processa os sintomas e separa as palavras como o vetorizador faz.
+        
+        EXPLICAÇÃO:
+        Usado pelas sessões (app/services/sessions.py), que guardam as
+        palavras de cada sintoma para montar o vetor TF-IDF por contagem.
+        
+        Returns:
+            (sintomas pré-processados, palavras)
+        """
+        symptoms_cleaned = self._preprocess_symptoms(symptoms)
+        return symptoms_cleaned, self._analyzer(symptoms_cleaned)
+    
+    def predict_counts(self, counts: Dict[str, int], symptoms_text: str, top_n: int = 3) -> Dict:
+        """
+        Faz a predição a partir da contagem de cada palavra.
+        
+        EXPLICAÇÃO:
+        Monta o mesmo vetor que vectorizer.transform(texto) geraria
+        (contagem × idf, norma L2) direto das contagens, sem reprocessar
+        o texto. Palavras fora do vocabulário são ignoradas, como no
+        vetorizador. Sempre usa o modelo XGBoost (o grafo ONNX recebe texto).
+        
+        Args:
+            counts: Palavra → número de ocorrências
+            symptoms_text: Texto correspondente (só para symptoms_processed)
+            top_n: Quantas doenças em all_probabilities
+        
+        Returns:
+            Dict no mesmo formato de predict()
+        """
+        vocabulary = self.vectorizer.vocabulary_
+        known = sorted(
+            (vocabulary[token], count) for token, count in counts.items() if token in vocabulary
+        )
+        indices = np.array([index for index, _ in known], dtype=np.int32)
+        weights = np.array([count for _, count in known], dtype=np.float64) * self.vectorizer.idf_[indices]
+        if len(weights):
+            weights /= np.sqrt(weights @ weights)
+        
+        X = sp.csr_matrix(
+            (weights, indices, np.array([0, len(indices)])),
+            shape=(1, len(self.vectorizer.idf_))
+        )
+        probabilities = self.model.predict_proba(X)[0]
+        return self._format_result(symptoms_text, probabilities, top_n=top_n)
+    
+    def self_test(self, symptoms: str) -> Dict:
+        """
+        Predição de teste usada pelo canary de readiness.
+        
+        EXPLICAÇÃO:
+        Roda o caminho completo (pré-processamento + vetorização + modelo),
+        mas sem passar por nada que não seja o próprio modelo, para que
+        a latência medida seja a da inferência real.
+        
+        Args:
+            symptoms: Sintomas de teste
+        
+        Returns:
+            Dict no mesmo formato de predict()
+        """
+        return self._run_model(self._preprocess_symptoms(symptoms))
+    
     def _preprocess_symptoms(self, symptoms: str) -> str:
         """
         Limpa e prepara os sintomas para processamento.
@@ -204,6 +748,10 @@ class MLModelService:
         # Remover espaços extras
         symptoms_clean = " ".join(symptoms_clean.split())
         
+        # Corrigir acentos e erros de digitação ("cansaco" → "cansaço")
+        if self.normalizer is not None:
+            symptoms_clean = self.normalizer.normalize(symptoms_clean)
+        
         return symptoms_clean
     
     def _get_top_predictions(self, probabilities: np.ndarray, top_n: int = 3) -> List[Dict]:
@@ -238,6 +786,158 @@ class MLModelService:
         
         return top_predictions
     
+    def get_metrics(self) -> Dict:
+        """
+        Retorna métricas de execução do serviço.
+        
+        EXPLICAÇÃO:
+        Diferente de get_model_info() (estático), estes números mudam
+        a cada requisição. Expostos no endpoint /metrics.
+        
+        Returns:
+            Dict com as métricas
+        """
+        return {
+            "singleflight": self._singleflight.stats(),
+            "cascade": self.cascade_stats.stats() if self.fast_path is not None else None,
+            "normalizer": self.normalizer.stats() if self.normalizer is not None else None,
+            "explanation_cache": self.explanation_cache.stats(),
+            "prediction_cache": self.prediction_cache.stats() if self.prediction_cache is not None else None,
+        }
+    
+    def suggest(self, query: str, limit: int = 10) -> List[Dict]:
+        """
+        Sugestões de sintomas que começam com o texto digitado.
+        
+        Args:
+            query: Começo do sintoma (ex: "dor na")
+            limit: Máximo de sugestões
+        
+        Returns:
+            Lista de {"text", "frequency"}, da mais para a menos frequente
+        """
+        return self.suggestions.search(query, limit)
+    
+    def find_similar(self, symptoms: str, k: int = 5) -> Dict:
+        """
+        Casos do treino mais parecidos com os sintomas.
+        
+        Args:
+            symptoms: Sintomas em texto livre
+            k: Quantos casos retornar
+        
+        Returns:
+            Dict com symptoms_processed e cases (lista de
+            {"symptoms", "diagnosis", "similarity"})
+        
+        Raises:
+            RuntimeError: Índice de casos não carregado
+        """
+        if self.similar_cases is None:
+            raise RuntimeError(
+                "Índice de casos parecidos não gerado: "
+                "python -m app.tools.build_similar_index"
+            )
+        
+        symptoms_cleaned = self._preprocess_symptoms(symptoms)
+        return {
+            "symptoms_processed": symptoms_cleaned.split(),
+            "cases": self.similar_cases.search(symptoms_cleaned, k),
+        }
+    
+    def explain(self, symptoms: str, top_k: int = 5) -> Dict:
+        """
+        Diagnóstico + quanto cada palavra dos sintomas pesou nele.
+        
+        EXPLICAÇÃO:
+        Com pred_contribs=True o XGBoost devolve, para cada classe, a
+        contribuição de cada palavra para a pontuação (margem, antes do
+        softmax) daquela classe, mais um valor base (bias). A soma das
+        contribuições é a própria margem, então o softmax das somas dá
+        as mesmas probabilidades de predict_proba: o diagnóstico sai da
+        mesma chamada.
+        
+        Calcular as contribuições custa algumas vezes uma predição, então
+        o resultado fica num cache LRU com chave no VETOR TF-IDF (índices
+        + pesos), e não no texto: "febre alta" e "alta, febre" viram o
+        mesmo vetor e usam a mesma entrada do cache.
+        
+        Sempre usa o modelo XGBoost (o grafo ONNX não calcula contribuições).
+        
+        Args:
+            symptoms: Sintomas em texto livre
+            top_k: Quantas palavras retornar
+        
+        Returns:
+            Dict com diagnosis, confidence, symptoms_processed, base_value
+            e contributions (lista de {"token", "contribution"}, da que mais
+            favoreceu o diagnóstico para a que mais pesou contra)
+        """
+        symptoms_cleaned = self._preprocess_symptoms(symptoms)
+        
+        # Vetor canônico: índices em ordem crescente + pesos
+        X = self.vectorizer.transform([symptoms_cleaned])
+        X.sort_indices()
+        key = X.indices.tobytes() + X.data.tobytes()
+        
+        explanation = self.explanation_cache.get(key)
+        if explanation is None:
+            explanation = self._compute_explanation(X)
+            self.explanation_cache.put(key, explanation)
+        
+        return {
+            **explanation,
+            "symptoms_processed": symptoms_cleaned.split(),
+            "contributions": explanation["contributions"][:top_k],
+        }
+    
+    def _compute_explanation(self, X) -> Dict:
+        """
+        Roda pred_contribs para UMA linha já vetorizada.
+        
+        Returns:
+            Dict com diagnosis, confidence, base_value e contributions
+            (todas as palavras conhecidas do texto, ordenadas)
+        """
+        # (n_classes × (n_palavras + 1)): a última coluna é o valor base
+        contributions = self.model.get_booster().predict(
+            xgb.DMatrix(X), pred_contribs=True
+        )[0]
+        
+        margins = contributions.sum(axis=1)
+        probabilities = np.exp(margins - margins.max())
+        probabilities /= probabilities.sum()
+        prediction = int(np.argmax(probabilities))
+        
+        row = contributions[prediction]
+        tokens = sorted(
+            (
+                {"token": str(self._feature_names[index]), "contribution": round(float(row[index]), 4)}
+                for index in X.indices
+            ),
+            key=lambda item: (-item["contribution"], item["token"])
+        )
+        
+        return {
+            "diagnosis": self.encoder.classes_[prediction],
+            "confidence": round(float(probabilities[prediction] * 100), 2),
+            "base_value": round(float(row[-1]), 4),
+            "contributions": tokens,
+        }
+    
+    def get_available_diseases(self) -> List[str]:
+        """
+        Doenças que o modelo carregado sabe diagnosticar.
+        
+        EXPLICAÇÃO:
+        Vêm do encoder (as classes com que o modelo foi treinado), e não
+        do dataset: a API não precisa ler os dados de treino.
+        
+        Returns:
+            Lista de nomes de doenças, em ordem alfabética
+        """
+        return [str(disease) for disease in self.encoder.classes_]
+    
     def get_model_info(self) -> Dict:
         """
         Retorna informações sobre o modelo carregado.
@@ -249,12 +949,20 @@ class MLModelService:
         Returns:
             Dict com informações do modelo
         """
+        available_diseases = self.get_available_diseases()
+        
         return {
             "model_loaded": self.model is not None,
             "vectorizer_loaded": self.vectorizer is not None,
             "encoder_loaded": self.encoder is not None,
-            "available_diseases": get_available_diseases(),
-            "total_diseases": len(get_available_diseases())
+            "available_diseases": available_diseases,
+            "total_diseases": len(available_diseases),
+            "model_version": self.model_version,
+            "model_hash": self.model_hash,
+            "artifacts": {name: sha256[:12] for name, sha256 in sorted(self.artifacts.hashes.items())},
+            "inference_backend": self.backend.name,
+            "cascade_enabled": self.fast_path is not None,
+            "cpu_plan": self.cpu_plan
         }
 
 
@@ -0,0 +1,242 @@
+"""
+Normalização de sintomas - Corrige acentos e erros de digitação
+
+EXPLICAÇÃO:
+O vetorizador TF-IDF só conhece as palavras EXATAS do treino. Quem digita
+"cansaco" (sem cedilha), "poliuria" (sem acento) ou "taquicardía"
+(acento a mais) manda uma palavra desconhecida, que vira zero na matriz:
+o modelo perde a pista e chuta com confiança baixa.
+
+Antes da vetorização, cada palavra fora do vocabulário é trocada pela
+palavra do vocabulário mais parecida:
+
+1. ACENTOS: comparamos as palavras sem acentos ("cansaço" → "cansaco").
+   Se a versão sem acentos bate com uma palavra conhecida, usamos ela.
+2. ERROS DE DIGITAÇÃO (índice de deleções do SymSpell): na carga,
+   para cada palavra do vocabulário (sem acentos) guardamos todas as
+   versões com até N letras apagadas: "febre" → "ebre", "fbre", "fere"...
+   Na consulta, apagamos letras da palavra digitada ("febrre" → "febre")
+   e procuramos no índice. Duas palavras a distância ≤ N sempre têm uma
+   deleção em comum, então os candidatos saem de consultas a dicionário,
+   sem comparar com o vocabulário inteiro. Depois conferimos a distância
+   real (Damerau-Levenshtein) de cada candidato.
+
+Palavras curtas só têm os acentos corrigidos: "pelo" está a uma letra de
+"pele", e corrigir isso mudaria o sentido. Palavras de 5 a 8 letras
+aceitam 1 erro, e a partir de 9 letras, 2 (até settings.NORMALIZER_MAX_EDIT_DISTANCE).
+
+Palavras mais longas que a maior palavra do vocabulário (mais os erros
+aceitos) não têm candidato possível e são descartadas sem busca.
+
+Cada palavra diferente é corrigida uma vez e guardada num dicionário;
+nas próximas vezes a correção custa uma consulta (microssegundos).
+"""
+
+import re
+import threading
+import unicodedata
+from typing import Dict, List, Optional, Set
+
+# Máximo de palavras diferentes guardadas no cache de correções
+CACHE_SIZE = 50000
+
+
+def fold_accents(text: str) -> str:
+    """Remove os acentos: "taquicardía" → "taquicardia", "cansaço" → "cansaco"."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def deletes(word: str, distance: int) -> Set[str]:
+    """Todas as versões de `word` com até `distance` letras apagadas (incluindo ela)."""
+    found = {word}
+    frontier = {word}
+    for _ in range(distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        found |= frontier
+    return found
+
+
+def edit_distance(a: str, b: str) -> int:
+    """
+    Distância de Damerau-Levenshtein (versão "optimal string alignment").
+
+    Conta inserções, remoções, trocas e transposições de letras vizinhas
+    ("fberb" → "febre" custa 2).
+    """
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class SymptomNormalizer:
+    """
+    Troca palavras desconhecidas pela palavra conhecida mais próxima.
+
+    Attributes:
+        max_distance: Maior distância de edição aceita
+    """
+
+    def __init__(self, vectorizer, max_distance: int = 2):
+        """
+        Monta os índices a partir do vocabulário do vetorizador.
+
+        Args:
+            vectorizer: TfidfVectorizer treinado (vocabulary_, idf_, token_pattern)
+            max_distance: Maior distância de edição aceita
+        """
+        self.max_distance = max_distance
+        self._vocabulary = vectorizer.vocabulary_
+        self._token_re = re.compile(vectorizer.token_pattern)
+
+        # Em empates, preferimos a palavra mais comum no treino (menor IDF)
+        idf = getattr(vectorizer, "idf_", None)
+        self._rank = {
+            term: (float(idf[index]) if idf is not None else 0.0, term)
+            for term, index in self._vocabulary.items()
+        }
+
+        # Palavra sem acentos → palavra do vocabulário
+        self._folded: Dict[str, str] = {}
+        for term in sorted(self._vocabulary, key=self._rank.get):
+            self._folded.setdefault(fold_accents(term), term)
+
+        # Índice de deleções: deleção → palavras sem acentos que a geram
+        self._deletes: Dict[str, List[str]] = {}
+        for folded in self._folded:
+            for deleted in deletes(folded, max_distance):
+                self._deletes.setdefault(deleted, []).append(folded)
+
+        # Palavra mais longa do vocabulário (sem acentos)
+        self._max_length = max(map(len, self._folded), default=0)
+
+        self._cache: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.tokens = 0
+        self.accent_fixed = 0
+        self.typo_fixed = 0
+        self.unknown = 0
+
+    def _allowed_distance(self, length: int) -> int:
+        """Erros aceitos para uma palavra com `length` letras."""
+        if length <= 4:
+            return 0
+        if length <= 8:
+            return min(1, self.max_distance)
+        return self.max_distance
+
+    def _lookup(self, token: str) -> Optional[str]:
+        """
+        Palavra do vocabulário mais próxima de `token` (ou None).
+        """
+        folded = fold_accents(token)
+        if folded in self._folded:
+            return self._folded[folded]
+
+        allowed = self._allowed_distance(len(folded))
+        if allowed == 0:
+            return None
+
+        # Mais longa que qualquer palavra conhecida + erros aceitos: não há
+        # candidato possível. Sem este corte, gerar as deleções custa
+        # O(n²) em uma palavra gigante (um /predict barato para travar a CPU)
+        if len(folded) > self._max_length + allowed:
+            return None
+
+        best = None
+        best_key = None
+        seen = set()
+        for deleted in deletes(folded, allowed):
+            for candidate in self._deletes.get(deleted, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                distance = edit_distance(folded, candidate)
+                if distance > allowed:
+                    continue
+                term = self._folded[candidate]
+                key = (distance, self._rank[term])
+                if best_key is None or key < best_key:
+                    best, best_key = term, key
+        return best
+
+    def correct(self, token: str) -> str:
+        """
+        Corrige UMA palavra (já em minúsculas).
+
+        Returns:
+            A palavra do vocabulário, ou a própria palavra se não houver
+            nenhuma próxima o suficiente
+        """
+        if token in self._vocabulary:
+            return token
+
+        corrected = self._cache.get(token)
+        if corrected is None:
+            corrected = self._lookup(token) or token
+            if len(self._cache) >= CACHE_SIZE:
+                self._cache.clear()
+            self._cache[token] = corrected
+        return corrected
+
+    def normalize(self, text: str) -> str:
+        """
+        Corrige todas as palavras desconhecidas do texto.
+
+        EXPLICAÇÃO:
+        Usa a mesma regra de palavras do vetorizador (token_pattern), então
+        pontuação e palavras de uma letra ficam como estão.
+
+        Args:
+            text: Sintomas já em minúsculas (veja _preprocess_symptoms)
+
+        Returns:
+            Texto com as palavras corrigidas
+        """
+        counts = {"tokens": 0, "accent": 0, "typo": 0, "unknown": 0}
+
+        def replace(match) -> str:
+            token = match.group()
+            counts["tokens"] += 1
+            if token in self._vocabulary:
+                return token
+            corrected = self.correct(token)
+            if corrected == token:
+                counts["unknown"] += 1
+            elif fold_accents(corrected) == fold_accents(token):
+                counts["accent"] += 1
+            else:
+                counts["typo"] += 1
+            return corrected
+
+        normalized = self._token_re.sub(replace, text)
+
+        with self._lock:
+            self.tokens += counts["tokens"]
+            self.accent_fixed += counts["accent"]
+            self.typo_fixed += counts["typo"]
+            self.unknown += counts["unknown"]
+        return normalized
+
+    def stats(self) -> Dict:
+        """Palavras vistas, corrigidas (acento / digitação) e ainda desconhecidas."""
+        with self._lock:
+            corrected = self.accent_fixed + self.typo_fixed
+            return {
+                "tokens": self.tokens,
+                "accent_fixed": self.accent_fixed,
+                "typo_fixed": self.typo_fixed,
+                "unknown": self.unknown,
+                "corrected_rate": round(corrected / self.tokens, 4) if self.tokens else None,
+                "unknown_rate": round(self.unknown / self.tokens, 4) if self.tokens else None,
+                "vocabulary_size": len(self._vocabulary),
+                "delete_index_size": len(self._deletes),
+            }
@@ -0,0 +1,390 @@
+"""
+Cache persistente de predições - Sobrevive a restarts e deploys
+
+EXPLICAÇÃO:
+Todo restart esvazia a memória: nos primeiros minutos depois de um deploy
+toda requisição roda o modelo do zero ("cache frio"). Com este cache, as
+predições ficam também num arquivo SQLite, e um worker novo já começa
+com as respostas que os anteriores calcularam.
+
+CAMADAS:
+1. LRU em memória (app/services/cache.py): microssegundos.
+2. SQLite em disco: consultado quando a LRU não tem a chave (dezenas de
+   microssegundos, ainda bem menos que uma predição). Um acerto aqui
+   volta para a LRU.
+3. Modelo: só quando nenhuma camada tem a resposta. O resultado vai
+   para a LRU na hora e para o disco em segundo plano: uma thread grava
+   em lotes (uma transação por lote), como a auditoria. Com a fila
+   cheia a gravação é descartada (é só um cache).
+
+CHAVE = (hash dos artefatos do modelo, sintomas canônicos):
+- o hash muda quando qualquer arquivo que influencia a predição muda
+  (modelo, vetorizador, encoder...). Entradas de outro hash nunca são
+  usadas, e são apagadas quando a thread de gravação inicia;
+- sintomas canônicos = palavras CONHECIDAS pelo vetorizador, em ordem
+  alfabética. O TF-IDF ignora a ordem e as palavras desconhecidas, então
+  "febre alta", "alta, febre" e "febre alta xyz" são o mesmo vetor e a
+  mesma predição.
+
+TAMANHO: o arquivo é limitado a `max_bytes`. Passando disso, saem as
+entradas mais antigas (10% por vez); o SQLite reaproveita as páginas
+liberadas, então o arquivo para de crescer.
+
+FALHAS DO SQLITE (diretório sem permissão, disco cheio...) nunca
+derrubam a thread de gravação: ela reabre o banco com espera crescente
+entre as tentativas, e enquanto isso o cache funciona só em memória.
+
+Cada worker (pre-fork) abre as próprias conexões (as de antes do fork
+não podem ser usadas), e o modo WAL deixa vários workers lerem e
+gravarem o mesmo arquivo.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from app.services.cache import LRUCache
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS predictions (
+    model_hash TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (model_hash, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS predictions_created_at ON predictions (created_at);
+"""
+
+# Fração das entradas apagada de cada vez quando o arquivo passa do limite
+EVICT_FRACTION = 0.1
+
+# Maior espera entre tentativas de reabrir o banco (backoff exponencial)
+MAX_RETRY_SECONDS = 30.0
+
+
+class PredictionCache:
+    """
+    LRU em memória + SQLite em disco, com gravação em segundo plano.
+
+    Attributes:
+        model_hash: Hash dos artefatos do modelo atual (parte da chave)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        model_hash: str,
+        memory_entries: int,
+        max_bytes: int,
+        write_queue: int = 10000,
+        batch_size: int = 256,
+        flush_interval: float = 0.5,
+    ):
+        self.path = path
+        self.model_hash = model_hash
+        self.max_bytes = max_bytes
+        self.write_queue = write_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.memory = LRUCache(memory_entries)
+
+        self._local = threading.local()
+        self._pending: Deque[Tuple[str, str, float]] = deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+        self.disk_hits = 0
+        self.disk_misses = 0
+        self.written = 0
+        self.write_dropped = 0
+        self.evicted = 0
+        self.purged = 0
+        self.preloaded = 0
+        self.connect_errors = 0
+
+    # ------------------------------------------------------------------
+    # Conexões
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        """Abre o banco em modo WAL e cria a tabela (se preciso)."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=30.0)
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+        except sqlite3.Error:
+            connection.close()
+            raise
+        return connection
+
+    def _reader(self) -> sqlite3.Connection:
+        """
+        Conexão de leitura da thread atual.
+
+        EXPLICAÇÃO:
+        Conexões SQLite não podem ser compartilhadas entre threads, nem
+        usadas depois de um fork(). Guardamos uma por thread, junto com o
+        pid do processo que a abriu.
+        """
+        pid = os.getpid()
+        if getattr(self._local, "pid", None) != pid:
+            self._local.connection = self._connect()
+            self._local.pid = pid
+        return self._local.connection
+
+    # ------------------------------------------------------------------
+    # Leitura e escrita
+    # ------------------------------------------------------------------
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Predição guardada para os sintomas canônicos `key` (ou None).
+        """
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+
+        try:
+            row = self._reader().execute(
+                "SELECT value FROM predictions WHERE model_hash = ? AND key = ?",
+                (self.model_hash, key),
+            ).fetchone()
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Erro ao ler o cache de predições: {str(e)}")
+            return None
+
+        if row is None:
+            self.disk_misses += 1
+            return None
+        self.disk_hits += 1
+        value = json.loads(row[0])
+        self.memory.put(key, value)
+        return value
+
+    def put(self, key: str, value: Dict):
+        """Guarda na LRU e agenda a gravação em disco (descartada se a fila estiver cheia)."""
+        self.memory.put(key, value)
+        record = (key, json.dumps(value, ensure_ascii=False), time.time())
+        with self._lock:
+            if len(self._pending) >= self.write_queue:
+                self.write_dropped += 1
+                return
+            self._pending.append(record)
+            if len(self._pending) >= self.batch_size:
+                self._not_empty.notify()
+
+    def preload(self, limit: int) -> int:
+        """
+        Carrega na LRU as `limit` entradas mais recentes do modelo atual.
+
+        EXPLICAÇÃO:
+        Chamado no startup de cada worker: as respostas mais recentes
+        (as mais prováveis de se repetir) já saem da memória.
+
+        Returns:
+            Quantas entradas foram carregadas
+        """
+        rows = self._reader().execute(
+            "SELECT key, value FROM predictions WHERE model_hash = ? "
+            "ORDER BY created_at DESC LIMIT ?",
+            (self.model_hash, limit),
+        ).fetchall()
+        # Da mais antiga para a mais recente: a mais recente fica no topo da LRU
+        for key, value in reversed(rows):
+            self.memory.put(key, json.loads(value))
+        self.preloaded += len(rows)
+        return len(rows)
+
+    # ------------------------------------------------------------------
+    # Thread de gravação
+    # ------------------------------------------------------------------
+
+    def _used_bytes(self, connection: sqlite3.Connection) -> int:
+        """Bytes ocupados pelas páginas em uso (sem as páginas livres)."""
+        page_count = connection.execute("PRAGMA page_count").fetchone()[0]
+        freelist = connection.execute("PRAGMA freelist_count").fetchone()[0]
+        page_size = connection.execute("PRAGMA page_size").fetchone()[0]
+        return (page_count - freelist) * page_size
+
+    def _enforce_size(self, connection: sqlite3.Connection):
+        """Apaga as entradas mais antigas enquanto o arquivo passa de max_bytes."""
+        while self._used_bytes(connection) > self.max_bytes:
+            total = connection.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+            if total == 0:
+                return
+            count = max(1, int(total * EVICT_FRACTION))
+            with connection:
+                cursor = connection.execute(
+                    "DELETE FROM predictions WHERE (model_hash, key) IN ("
+                    "SELECT model_hash, key FROM predictions ORDER BY created_at LIMIT ?)",
+                    (count,),
+                )
+            self.evicted += cursor.rowcount
+
+    def _take_batch(self) -> List[Tuple[str, str, float]]:
+        """Espera por um lote (ou pelo intervalo) e o retira da fila."""
+        with self._lock:
+            self._not_empty.wait_for(
+                lambda: self._stopping or len(self._pending) >= self.batch_size,
+                self.flush_interval,
+            )
+            return [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+
+    def _open(self, purge: bool) -> sqlite3.Connection:
+        """
+        Abre a conexão de gravação e deixa o arquivo dentro dos limites.
+
+        Args:
+            purge: Se True, apaga as entradas de outros hashes (só na primeira abertura)
+        """
+        connection = self._connect()
+        try:
+            if purge:
+                with connection:
+                    cursor = connection.execute(
+                        "DELETE FROM predictions WHERE model_hash != ?", (self.model_hash,)
+                    )
+                self.purged += cursor.rowcount
+            self._enforce_size(connection)
+        except sqlite3.Error:
+            connection.close()
+            raise
+        return connection
+
+    def _wait(self, seconds: float):
+        """Espera `seconds` segundos (ou até o stop())."""
+        with self._lock:
+            self._not_empty.wait_for(lambda: self._stopping, seconds)
+
+    def _run(self):
+        """
+        Laço da thread: apaga outros hashes, depois grava lotes até stop().
+
+        EXPLICAÇÃO:
+        Nenhuma falha do SQLite encerra a thread. Sem conexão (ou depois de
+        um erro), o banco é reaberto esperando o dobro a cada falha (até
+        MAX_RETRY_SECONDS); o lote que falhou é descartado (é só um cache).
+        No stop(), com o banco indisponível, a fila é descartada.
+        """
+        connection: Optional[sqlite3.Connection] = None
+        needs_purge = True
+        delay = self.flush_interval
+        try:
+            while True:
+                if connection is None:
+                    try:
+                        connection = self._open(purge=needs_purge)
+                        needs_purge = False
+                    except (sqlite3.Error, OSError) as e:
+                        self.connect_errors += 1
+                        logger.warning(f"Não foi possível abrir o cache de predições ({self.path}): "
+                                       f"{str(e)}; nova tentativa em {delay:.1f} s")
+                        if self._stopping:
+                            with self._lock:
+                                self.write_dropped += len(self._pending)
+                                self._pending.clear()
+                            break
+                        self._wait(delay)
+                        delay = min(delay * 2, MAX_RETRY_SECONDS)
+                        continue
+
+                batch = self._take_batch()
+                if not batch:
+                    if self._stopping:
+                        break
+                    continue
+                try:
+                    with connection:
+                        connection.executemany(
+                            "INSERT OR REPLACE INTO predictions (model_hash, key, value, created_at) "
+                            "VALUES (?, ?, ?, ?)",
+                            [(self.model_hash, key, value, created_at) for key, value, created_at in batch],
+                        )
+                    self.written += len(batch)
+                    self._enforce_size(connection)
+                    delay = self.flush_interval
+                except sqlite3.Error as e:
+                    logger.warning(f"Erro ao gravar {len(batch)} predições no cache: {str(e)}")
+                    self.write_dropped += len(batch)
+                    # Reabrir a conexão na próxima volta, sem insistir em loop
+                    connection.close()
+                    connection = None
+                    if not self._stopping:
+                        self._wait(delay)
+                        delay = min(delay * 2, MAX_RETRY_SECONDS)
+        finally:
+            if connection is not None:
+                connection.close()
+
+    def start(self, preload: int = 0):
+        """
+        Inicia a thread de gravação e carrega as entradas recentes (no startup do worker).
+
+        Args:
+            preload: Quantas entradas recentes carregar na LRU
+        """
+        if self._thread is not None:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="prediction-cache-writer", daemon=True)
+        self._thread.start()
+        if preload > 0:
+            try:
+                loaded = self.preload(preload)
+                logger.info(f"✓ Cache de predições: {loaded} entradas carregadas de {self.path}")
+            except (sqlite3.Error, OSError) as e:
+                logger.warning(f"Cache de predições começa vazio: {str(e)}")
+
+    def stop(self, timeout: float = 10.0):
+        """Grava o que está na fila e encerra a thread (no shutdown)."""
+        if self._thread is None:
+            return
+        with self._lock:
+            self._stopping = True
+            self._not_empty.notify()
+        self._thread.join(timeout)
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        """Se a thread de gravação está ativa (iniciada e ainda viva)."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def stats(self) -> Dict:
+        """Acertos por camada, gravações e tamanho do arquivo."""
+        try:
+            file_bytes = os.path.getsize(self.path)
+        except OSError:
+            file_bytes = 0
+        return {
+            "path": self.path,
+            "model_hash": self.model_hash,
+            "memory": self.memory.stats(),
+            "disk_hits": self.disk_hits,
+            "disk_misses": self.disk_misses,
+            "pending_writes": len(self._pending),
+            "written": self.written,
+            "write_dropped": self.write_dropped,
+            "evicted": self.evicted,
+            "purged_other_models": self.purged,
+            "preloaded": self.preloaded,
+            "connect_errors": self.connect_errors,
+            "writer_alive": self.running,
+            "file_bytes": file_bytes,
+            "max_bytes": self.max_bytes,
+        }
@@ -0,0 +1,141 @@
+"""
+Readiness - Decide se o worker pode receber tráfego
+
+EXPLICAÇÃO:
+Orquestradores (Kubernetes, load balancers, autoscalers) fazem duas
+perguntas diferentes:
+
+1. LIVENESS (/livez): "O processo está vivo?"
+   Se não, reinicia o container.
+
+2. READINESS (/readyz): "Este worker consegue atender bem AGORA?"
+   Se não, para de mandar tráfego para ele (sem reiniciar).
+
+Para responder a segunda pergunta olhamos:
+- Warmup: o worker já terminou de aquecer?
+- Fila do executor: tem muita predição esperando thread?
+- Canary: uma predição de teste que roda periodicamente em background.
+  Se o último teste bem-sucedido é muito antigo (worker travado) ou
+  demorou demais (worker lento), o worker fica "not ready".
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+
+from app.core.config import settings
+from app.services.ml_service import ml_service
+from app.services.executor import inference_executor
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+
+class ReadinessMonitor:
+    """
+    Acompanha warmup, fila de inferência e o canary de predição.
+    """
+
+    def __init__(self):
+        self.warm = False
+        self.last_success_at: Optional[float] = None  # time.monotonic()
+        self.last_latency_ms: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_canary(self) -> bool:
+        """
+        Executa UMA predição de teste pelo executor de inferência.
+
+        EXPLICAÇÃO:
+        Passamos pelo mesmo pool de threads das requisições reais,
+        então a latência medida inclui o tempo de fila. Um worker
+        sobrecarregado aparece como "canary lento".
+
+        O primeiro canary que funciona (no startup ou no loop, se o do
+        startup falhou) marca o worker como aquecido.
+
+        Returns:
+            True se a predição funcionou
+        """
+        start = time.perf_counter()
+        try:
+            await inference_executor.run(ml_service.self_test, settings.CANARY_SYMPTOMS)
+        except Exception as e:
+            self.last_error = str(e)
+            logger.error(f"✗ Canary de predição falhou: {str(e)}")
+            return False
+
+        self.last_latency_ms = (time.perf_counter() - start) * 1000
+        self.last_success_at = time.monotonic()
+        self.last_error = None
+        if not self.warm:
+            self.warm = True
+            logger.info(f"✓ Warmup concluído ({self.last_latency_ms:.1f} ms)")
+        return True
+
+    async def _canary_loop(self):
+        """Roda o canary para sempre, a cada CANARY_INTERVAL_SECONDS."""
+        while True:
+            await asyncio.sleep(settings.CANARY_INTERVAL_SECONDS)
+            await self.run_canary()
+
+    async def start(self):
+        """
+        Aquece o worker e inicia o canary em background.
+
+        EXPLICAÇÃO:
+        O primeiro canary serve de warmup: só marcamos o worker como
+        aquecido depois que uma predição completa funcionou. Se ele falhar,
+        o worker fica "not ready" até um canary do loop funcionar.
+        """
+        await self.run_canary()
+        self._task = asyncio.create_task(self._canary_loop())
+
+    async def stop(self):
+        """Para o canary (chamado no shutdown)."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def status(self) -> Dict:
+        """
+        Avalia todas as condições de readiness.
+
+        Returns:
+            Dict com "ready" (bool) e o detalhe de cada verificação
+        """
+        queue_depth = inference_executor.queue_depth
+
+        if self.last_success_at is None:
+            canary_age = None
+        else:
+            canary_age = time.monotonic() - self.last_success_at
+
+        checks = {
+            "warm": self.warm,
+            "queue_ok": queue_depth <= settings.READINESS_MAX_QUEUE_DEPTH,
+            "canary_fresh": (
+                canary_age is not None
+                and canary_age <= settings.CANARY_MAX_AGE_SECONDS
+            ),
+            "canary_fast": (
+                self.last_latency_ms is not None
+                and self.last_latency_ms <= settings.CANARY_MAX_LATENCY_MS
+            ),
+        }
+
+        return {
+            "ready": all(checks.values()),
+            "checks": checks,
+            "queue_depth": queue_depth,
+            "active": inference_executor.active,
+            "canary_age_seconds": None if canary_age is None else round(canary_age, 3),
+            "canary_latency_ms": None if self.last_latency_ms is None else round(self.last_latency_ms, 3),
+            "canary_error": self.last_error,
+        }
+
+
+# INSTÂNCIA GLOBAL
+readiness_monitor = ReadinessMonitor()
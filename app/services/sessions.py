@@ -0,0 +1,189 @@
+"""
+Sessões de sintomas - Diagnóstico atualizado a cada sintoma (WebSocket /sessions)
+
+EXPLICAÇÃO:
+O frontend em formato de chat manda um sintoma por vez. Pelo /predict,
+ele precisa reenviar o texto INTEIRO a cada sintoma novo, e o servidor
+limpa, tokeniza e vetoriza tudo de novo.
+
+Numa sessão, o servidor guarda a CONTAGEM de cada palavra já enviada:
+- "add": tokeniza só o sintoma novo e soma as palavras dele;
+- "remove": subtrai as palavras que aquele sintoma tinha somado;
+- "reset": zera tudo.
+
+O vetor TF-IDF sai direto das contagens (contagem × idf, com norma L2,
+igual ao TfidfVectorizer), sem reprocessar o texto acumulado.
+
+MEMÓRIA LIMITADA:
+- no máximo settings.SESSION_MAX_SESSIONS sessões: ao abrir uma nova
+  com o limite atingido, sai a usada há mais tempo;
+- sessões sem atividade há settings.SESSION_IDLE_SECONDS são descartadas;
+- cada sessão guarda no máximo settings.SESSION_MAX_SYMPTOMS sintomas.
+
+O cliente pode reconectar com o session_id e continuar de onde parou,
+enquanto a sessão não tiver sido descartada.
+"""
+
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+
+class SymptomSession:
+    """
+    Sintomas de uma conversa e as contagens das palavras deles.
+
+    Attributes:
+        session_id: Identificador enviado ao cliente
+        entries: (sintoma pré-processado, palavras) de cada sintoma, na ordem
+        counts: Palavra → quantas vezes aparece somando todos os sintomas
+        connected: Se há uma conexão usando a sessão agora
+    """
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.entries: List[Tuple[str, List[str]]] = []
+        self.counts: Dict[str, int] = {}
+        self.connected = False
+        self.last_seen = time.monotonic()
+
+    @property
+    def symptoms(self) -> List[str]:
+        """Sintomas da sessão, na ordem em que foram enviados."""
+        return [text for text, _ in self.entries]
+
+    def add(self, symptoms_cleaned: str, tokens: List[str]):
+        """
+        Soma as palavras de um sintoma novo.
+
+        Raises:
+            ValueError: A sessão já tem SESSION_MAX_SYMPTOMS sintomas
+        """
+        if len(self.entries) >= settings.SESSION_MAX_SYMPTOMS:
+            raise ValueError(f"Limite de {settings.SESSION_MAX_SYMPTOMS} sintomas por sessão atingido")
+        self.entries.append((symptoms_cleaned, tokens))
+        for token in tokens:
+            self.counts[token] = self.counts.get(token, 0) + 1
+
+    def remove(self, symptoms_cleaned: str):
+        """
+        Subtrai as palavras de um sintoma enviado antes (o mais recente igual).
+
+        Raises:
+            ValueError: Nenhum sintoma da sessão é igual ao informado
+        """
+        for position in range(len(self.entries) - 1, -1, -1):
+            if self.entries[position][0] == symptoms_cleaned:
+                break
+        else:
+            raise ValueError(f"Sintoma não encontrado na sessão: {symptoms_cleaned}")
+
+        _, tokens = self.entries.pop(position)
+        for token in tokens:
+            remaining = self.counts[token] - 1
+            if remaining:
+                self.counts[token] = remaining
+            else:
+                del self.counts[token]
+
+    def reset(self):
+        """Remove todos os sintomas."""
+        self.entries.clear()
+        self.counts.clear()
+
+
+class SessionStore:
+    """
+    Sessões abertas, da usada há mais tempo para a mais recente.
+
+    EXPLICAÇÃO:
+    Só o event loop usa o store (as rotas WebSocket), então não há lock,
+    como no controle de admissão. A limpeza das sessões ociosas acontece
+    sempre que uma sessão é aberta: basta olhar o começo da fila.
+    """
+
+    def __init__(self, max_sessions: int, idle_seconds: float):
+        self.max_sessions = max_sessions
+        self.idle_seconds = idle_seconds
+        self._sessions: "OrderedDict[str, SymptomSession]" = OrderedDict()
+        self.opened = 0
+        self.resumed = 0
+        self.evicted_idle = 0
+        self.evicted_full = 0
+
+    def _evict(self, now: float):
+        """Descarta as sessões ociosas e, se ainda cheio, as mais antigas."""
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if now - oldest.last_seen <= self.idle_seconds:
+                break
+            self._sessions.popitem(last=False)
+            self.evicted_idle += 1
+
+        while len(self._sessions) >= self.max_sessions:
+            self._sessions.popitem(last=False)
+            self.evicted_full += 1
+
+    def open(self, session_id: Optional[str] = None) -> SymptomSession:
+        """
+        Retoma a sessão `session_id` ou cria uma nova.
+
+        Args:
+            session_id: Sessão a retomar (desconhecida ou None = nova sessão)
+
+        Returns:
+            A sessão, já marcada como conectada
+
+        Raises:
+            ValueError: A sessão já está sendo usada por outra conexão
+        """
+        now = time.monotonic()
+        session = self.get(session_id) if session_id else None
+        if session is not None:
+            if session.connected:
+                raise ValueError("Sessão já está aberta em outra conexão")
+            self.resumed += 1
+        else:
+            self._evict(now)
+            session = SymptomSession(uuid.uuid4().hex)
+            self._sessions[session.session_id] = session
+            self.opened += 1
+
+        session.connected = True
+        return session
+
+    def get(self, session_id: str) -> Optional[SymptomSession]:
+        """
+        A sessão (ou None se não existe / foi descartada), marcando atividade agora.
+        """
+        session = self._sessions.get(session_id)
+        if session is None:
+            return None
+        now = time.monotonic()
+        if now - session.last_seen > self.idle_seconds:
+            del self._sessions[session_id]
+            self.evicted_idle += 1
+            return None
+        session.last_seen = now
+        self._sessions.move_to_end(session_id)
+        return session
+
+    def stats(self) -> Dict:
+        """Sessões guardadas e contadores de abertura/descarte."""
+        return {
+            "sessions": len(self._sessions),
+            "connected": sum(1 for session in self._sessions.values() if session.connected),
+            "max_sessions": self.max_sessions,
+            "idle_seconds": self.idle_seconds,
+            "opened": self.opened,
+            "resumed": self.resumed,
+            "evicted_idle": self.evicted_idle,
+            "evicted_full": self.evicted_full,
+        }
+
+
+# INSTÂNCIA GLOBAL
+session_store = SessionStore(settings.SESSION_MAX_SESSIONS, settings.SESSION_IDLE_SECONDS)
@@ -0,0 +1,143 @@
+"""
+Casos parecidos - Exemplos do treino mais próximos dos sintomas (POST /similar)
+
+EXPLICAÇÃO:
+Junto com o diagnóstico, o médico quer ver os casos do treino mais
+parecidos com a descrição do paciente. "Parecido" = similaridade de
+cosseno entre os vetores TF-IDF (os dois já têm norma 1, então é só o
+produto escalar).
+
+ÍNDICE INVERTIDO:
+Comparar a consulta com TODOS os casos (n produtos escalares) fica lento
+quando o dataset cresce. Mas a consulta só tem algumas palavras, e um
+caso sem nenhuma delas tem similaridade 0. Por isso guardamos, para
+cada palavra, a lista dos casos que a contêm e o peso dela em cada um
+("posting list"):
+
+    "febre" → [(caso 3, 0.41), (caso 17, 0.38), ...]
+
+Na consulta percorremos só as listas das palavras da consulta,
+somando peso_consulta × peso_caso por caso, e pegamos os k maiores
+com np.argpartition (sem ordenar todos). O custo depende do tamanho
+dessas listas, e não do número total de casos.
+
+O índice é gerado offline por `python -m app.tools.build_similar_index`
+(model/casos_HealthIA.npz): a API não lê o dataset.
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# Acumulador denso (todos os casos) quando as posting lists somam mais
+# que 1/DENSE_ACCUMULATOR_RATIO dos casos
+DENSE_ACCUMULATOR_RATIO = 16
+
+
+class SimilarCases:
+    """
+    Índice invertido dos casos do treino carregado do .npz.
+
+    Attributes:
+        size: Número de casos indexados
+    """
+
+    def __init__(self, path: str, vectorizer):
+        data = np.load(path)
+        # Posting lists em formato CSC: casos da palavra t em
+        # rows[indptr[t]:indptr[t + 1]], com os pesos em weights
+        self._indptr = data["indptr"]
+        self._rows = data["rows"]
+        self._weights = data["weights"]
+        self._labels = data["labels"]
+        self._classes = [str(name) for name in data["classes"]]
+        # Textos: todos os casos num único bloco UTF-8 + início de cada um
+        self._text_offsets = data["text_offsets"]
+        self._text_blob = data["text_blob"].tobytes()
+        self.size = len(self._labels)
+
+        if not np.array_equal(data["idf"], vectorizer.idf_):
+            raise ValueError(
+                "O índice de casos foi gerado com outro vetorizador: gere de novo com "
+                "python -m app.tools.build_similar_index"
+            )
+
+        self._analyzer = vectorizer.build_analyzer()
+        self._vocabulary = vectorizer.vocabulary_
+        self._idf = vectorizer.idf_
+
+    def _query_vector(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        TF-IDF da consulta sem montar a matriz do scikit-learn.
+
+        Returns:
+            (índices das palavras conhecidas, pesos com norma L2 = 1)
+        """
+        counts: Dict[int, int] = {}
+        for term in self._analyzer(text):
+            index = self._vocabulary.get(term)
+            if index is not None:
+                counts[index] = counts.get(index, 0) + 1
+
+        indices = np.fromiter(counts.keys(), dtype=np.intp, count=len(counts))
+        weights = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+        weights *= self._idf[indices]
+        if len(weights):
+            weights /= np.sqrt(weights @ weights)
+        return indices, weights
+
+    def _text(self, row: int) -> str:
+        start, end = self._text_offsets[row], self._text_offsets[row + 1]
+        return self._text_blob[start:end].decode("utf-8")
+
+    def search(self, text: str, k: int) -> List[Dict]:
+        """
+        Os k casos mais parecidos com o texto.
+
+        Args:
+            text: Sintomas já pré-processados
+            k: Quantos casos retornar
+
+        Returns:
+            Lista de {"symptoms", "diagnosis", "similarity"} (0 a 1),
+            do mais para o menos parecido. Vazia se nenhuma palavra da
+            consulta for conhecida.
+        """
+        indices, weights = self._query_vector(text)
+        if len(indices) == 0:
+            return []
+
+        # Juntar as posting lists das palavras da consulta
+        starts, ends = self._indptr[indices], self._indptr[indices + 1]
+        rows = np.concatenate([self._rows[s:e] for s, e in zip(starts, ends)])
+        contributions = np.concatenate([
+            self._weights[s:e] * w for s, e, w in zip(starts, ends, weights)
+        ])
+        if len(rows) == 0:
+            return []
+
+        # Somar por caso e pegar os k maiores. Com poucas entradas, só os
+        # casos tocados (np.unique ordena as entradas); com muitas (palavras
+        # comuns como "dor"), um acumulador com todos os casos sai mais
+        # barato que ordenar
+        if len(rows) * DENSE_ACCUMULATOR_RATIO < self.size:
+            touched, inverse = np.unique(rows, return_inverse=True)
+            scores = np.bincount(inverse, weights=contributions)
+        else:
+            scores = np.bincount(rows, weights=contributions, minlength=self.size)
+            touched = np.flatnonzero(scores)
+            scores = scores[touched]
+        if len(scores) > k:
+            best = np.argpartition(-scores, k - 1)[:k]
+        else:
+            best = np.arange(len(scores))
+        best = best[np.lexsort((touched[best], -scores[best]))]
+
+        return [
+            {
+                "symptoms": self._text(int(touched[i])),
+                "diagnosis": self._classes[int(self._labels[touched[i]])],
+                "similarity": round(float(scores[i]), 4),
+            }
+            for i in best
+        ]
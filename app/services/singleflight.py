@@ -0,0 +1,94 @@
+"""
+Single-flight - Uma única computação para chamadas idênticas simultâneas
+
+EXPLICAÇÃO:
+Em picos (ex: um surto), muitos clientes mandam EXATAMENTE o mesmo texto
+de sintomas ao mesmo tempo. Sem este módulo, cada requisição vetoriza e
+roda o modelo de novo, produzindo o mesmo resultado N vezes.
+
+Com single-flight:
+- A primeira chamada com uma chave ("líder") faz a computação.
+- As chamadas com a mesma chave que chegam ENQUANTO o líder trabalha
+  esperam e recebem o mesmo resultado (ou o mesmo erro).
+- Assim que o líder termina, a chave é liberada. Não é um cache:
+  chamadas depois disso computam de novo.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Optional
+
+
+class _Call:
+    """Uma computação em andamento e quem está esperando por ela."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Agrupa chamadas simultâneas com a mesma chave.
+
+    EXPLICAÇÃO:
+    Usado pelas threads do executor de inferência, por isso o
+    dicionário de chamadas em andamento é protegido por um lock.
+    O lock só é segurado para consultar/atualizar o dicionário,
+    nunca durante a computação.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self.executions = 0  # Computações realmente feitas
+        self.deduplicated = 0  # Computações economizadas
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        Executa fn() uma vez por chave entre chamadas simultâneas.
+
+        Args:
+            key: Chave da computação (ex: sintomas normalizados)
+            fn: Função sem argumentos que faz a computação
+
+        Returns:
+            O resultado de fn() (compartilhado entre as chamadas)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self.executions += 1
+            else:
+                self.deduplicated += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result
+
+    def stats(self) -> Dict[str, int]:
+        """Contadores de computações feitas e economizadas."""
+        return {
+            "executions": self.executions,
+            "deduplicated": self.deduplicated,
+            "in_flight": len(self._calls),
+        }
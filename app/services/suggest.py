@@ -0,0 +1,125 @@
+"""
+Autocomplete de sintomas - Sugestões por prefixo (GET /symptoms/suggest)
+
+EXPLICAÇÃO:
+Enquanto o paciente digita, o frontend pede sugestões de palavras e
+expressões que o modelo conhece ("dor nas" → "dor nas juntas", ...).
+Cada tecla é uma requisição, então a busca precisa ser muito rápida.
+
+ESTRUTURA (montada uma vez, quando o modelo carrega):
+- As sugestões (sem acentos, em minúsculas) ficam num ARRAY ORDENADO.
+  Todas as que começam com um prefixo formam um trecho contínuo do
+  array, achado com duas buscas binárias (bisect): O(log n).
+- Cada sugestão tem uma posição no ranking (mais frequente = 0). Dentro
+  do trecho, pegamos as `limit` de melhor ranking com um heap.
+- Prefixos curtos (até PRECOMPUTED_PREFIX letras) casam com trechos
+  enormes ("d" → metade do array), então o top-k deles é calculado
+  na montagem e a resposta é uma consulta a dicionário.
+
+As sugestões vêm de model/sugestoes_HealthIA.json (gerado por
+`python -m app.tools.build_suggestions`, com a frequência de cada
+expressão no dataset). Sem o arquivo, usamos só as palavras do
+vocabulário do vetorizador, ordenadas pelo IDF (menor IDF = aparece
+em mais exemplos).
+"""
+
+import heapq
+import json
+import os
+import re
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+from app.services.normalizer import fold_accents
+
+# Prefixos com até este número de letras têm o top-k pré-calculado
+PRECOMPUTED_PREFIX = 3
+# Quantas sugestões são pré-calculadas por prefixo curto
+PRECOMPUTED_TOP_K = 20
+
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_query(text: str) -> str:
+    """
+    Mesmo tratamento de _preprocess_symptoms (minúsculas, sem vírgulas,
+    espaços simples), mas mantendo um espaço no fim: "dor " só casa com
+    expressões que continuam depois de "dor".
+    """
+    return _SPACES.sub(" ", text.lower().replace(",", " ")).lstrip()
+
+
+class SuggestionIndex:
+    """
+    Array ordenado de sugestões com busca por prefixo.
+
+    Attributes:
+        size: Número de sugestões
+    """
+
+    def __init__(self, entries: List[Tuple[str, Optional[int]]], order: List[int]):
+        """
+        Args:
+            entries: (texto, frequência) de cada sugestão
+            order: Índices de `entries` do melhor para o pior ranking
+        """
+        # Resultados prontos, na ordem do ranking
+        self._items = [{"text": entries[i][0], "frequency": entries[i][1]} for i in order]
+        self.size = len(self._items)
+
+        keyed = sorted((fold_accents(item["text"]), rank) for rank, item in enumerate(self._items))
+        self._keys = [key for key, _ in keyed]
+        self._ranks = [rank for _, rank in keyed]
+
+        self._top: Dict[str, List[int]] = {}
+        for key, rank in keyed:
+            for length in range(1, min(PRECOMPUTED_PREFIX, len(key)) + 1):
+                self._top.setdefault(key[:length], []).append(rank)
+        for prefix, ranks in self._top.items():
+            self._top[prefix] = heapq.nsmallest(PRECOMPUTED_TOP_K, ranks)
+
+    def search(self, query: str, limit: int) -> List[Dict]:
+        """
+        Sugestões que começam com `query`, da mais para a menos frequente.
+
+        Args:
+            query: Texto digitado (acentos e maiúsculas são ignorados)
+            limit: Máximo de sugestões
+
+        Returns:
+            Lista de {"text", "frequency"}
+        """
+        prefix = fold_accents(normalize_query(query))
+        if not prefix:
+            return []
+
+        if len(prefix) <= PRECOMPUTED_PREFIX and limit <= PRECOMPUTED_TOP_K:
+            ranks = self._top.get(prefix, [])[:limit]
+        else:
+            start = bisect_left(self._keys, prefix)
+            end = bisect_left(self._keys, prefix + "\uffff", start)
+            ranks = heapq.nsmallest(limit, self._ranks[start:end])
+        return [self._items[rank] for rank in ranks]
+
+
+def build_index(path: str, vectorizer) -> SuggestionIndex:
+    """
+    Monta o índice do arquivo de sugestões ou, sem ele, do vocabulário.
+
+    Args:
+        path: model/sugestoes_HealthIA.json
+        vectorizer: TfidfVectorizer carregado
+
+    Returns:
+        SuggestionIndex pronto para busca
+    """
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            entries = [(item["text"], int(item["frequency"])) for item in json.load(f)]
+        order = sorted(range(len(entries)), key=lambda i: (-entries[i][1], entries[i][0]))
+        return SuggestionIndex(entries, order)
+
+    terms = sorted(vectorizer.vocabulary_)
+    idf = vectorizer.idf_
+    order = sorted(range(len(terms)), key=lambda i: (idf[vectorizer.vocabulary_[terms[i]]], terms[i]))
+    return SuggestionIndex([(term, None) for term in terms], order)
@@ -0,0 +1,151 @@
+"""
+Aquecimento - Enche o cache de predições antes do worker ficar pronto
+
+EXPLICAÇÃO:
+Logo depois de um deploy nenhuma resposta está em memória, e o p99 sobe
+até o tráfego encher o cache. No startup de cada worker (main.py), antes
+do canary marcar o worker como pronto, calculamos em lote:
+
+1. TRÁFEGO RECENTE: as settings.WARMUP_TRAFFIC_TOP_K entradas mais
+   frequentes das últimas WARMUP_TRAFFIC_WINDOW_SECONDS, lidas do banco
+   da auditoria (app/services/audit.py), que todos os workers gravam;
+2. CORPUS: as frases do treino, do arquivo settings.WARMUP_FILE (gerado
+   offline por `python -m app.tools.build_warmup`: a API não lê o dataset).
+
+O tráfego vem primeiro: se o aquecimento passar de WARMUP_MAX_SECONDS,
+o worker fica pronto com o que já aqueceu. Entradas que o cache já tem
+(no disco, calculadas por outro worker ou antes do restart) não voltam
+ao modelo.
+
+Só faz sentido com o cache de predições ligado (PREDICTION_CACHE_ENABLED).
+"""
+
+import json
+import logging
+import os
+import pathlib
+import sqlite3
+import time
+from typing import Dict, List, Tuple
+
+from app.core.config import settings
+from app.services.executor import inference_executor
+from app.services.ml_service import ml_service
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+
+def load_corpus_phrases(path: str) -> List[str]:
+    """
+    Frases do arquivo de aquecimento (lista vazia se o arquivo não existe).
+    """
+    if not os.path.exists(path):
+        logger.warning(f"Arquivo de aquecimento não encontrado: {path} (python -m app.tools.build_warmup)")
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [entry["text"] for entry in json.load(f)]
+
+
+def recent_traffic(audit_path: str, window_seconds: float, top_k: int) -> Tuple[List[str], int, int]:
+    """
+    Entradas mais frequentes do tráfego recente, pela auditoria.
+
+    EXPLICAÇÃO:
+    Agrupa pelos sintomas normalizados (symptoms_processed): "Febre alta"
+    e "febre, alta" contam como a mesma entrada. O banco é aberto só para
+    leitura; com WAL, isso não atrapalha a thread que grava nele.
+
+    Returns:
+        (entradas da mais para a menos frequente, requisições cobertas por
+        elas, total de requisições na janela)
+    """
+    if not os.path.exists(audit_path):
+        return [], 0, 0
+
+    since = time.time() - window_seconds
+    # URI com o caminho escapado: "?", "#" ou "%" no nome não viram parâmetros
+    uri = pathlib.Path(audit_path).resolve().as_uri() + "?mode=ro"
+    connection = sqlite3.connect(uri, uri=True, timeout=5.0)
+    try:
+        rows = connection.execute(
+            "SELECT symptoms_processed, COUNT(*) AS hits FROM predictions "
+            "WHERE created_at >= ? GROUP BY symptoms_processed ORDER BY hits DESC LIMIT ?",
+            (since, top_k),
+        ).fetchall()
+        total = connection.execute(
+            "SELECT COUNT(*) FROM predictions WHERE created_at >= ?", (since,)
+        ).fetchone()[0]
+    finally:
+        connection.close()
+
+    return [text for text, _ in rows], sum(hits for _, hits in rows), total
+
+
+def _warm() -> Dict:
+    """Junta as fontes e calcula as predições (roda numa thread do executor)."""
+    start = time.monotonic()
+
+    traffic: List[str] = []
+    covered = total = 0
+    if settings.WARMUP_TRAFFIC_TOP_K > 0:
+        try:
+            traffic, covered, total = recent_traffic(
+                settings.AUDIT_PATH, settings.WARMUP_TRAFFIC_WINDOW_SECONDS, settings.WARMUP_TRAFFIC_TOP_K
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Não foi possível ler o tráfego recente da auditoria: {str(e)}")
+    corpus = load_corpus_phrases(os.path.join(settings.MODEL_PATH, settings.WARMUP_FILE))
+
+    result = ml_service.warm_prediction_cache(
+        traffic + corpus,
+        batch_size=settings.WARMUP_BATCH_SIZE,
+        deadline=start + settings.WARMUP_MAX_SECONDS,
+    )
+    result.update({
+        "traffic_inputs": len(traffic),
+        "traffic_requests_covered": covered,
+        "traffic_requests_total": total,
+        "corpus_phrases": len(corpus),
+        "seconds": round(time.monotonic() - start, 3),
+    })
+    return result
+
+
+async def warm_up() -> Dict:
+    """
+    Aquece o cache de predições deste worker (chamado no startup_event).
+
+    EXPLICAÇÃO:
+    Roda no executor de inferência (o event loop fica livre) e registra
+    no log o tempo e a cobertura: quantas entradas foram calculadas,
+    quantas já estavam no cache, e que fração das requisições recentes
+    as entradas do tráfego representam.
+
+    Returns:
+        Dict com as contagens (vazio se o aquecimento está desligado)
+    """
+    if not settings.WARMUP_ENABLED or ml_service.prediction_cache is None:
+        return {}
+
+    try:
+        result = await inference_executor.run(_warm)
+    except Exception as e:
+        logger.error(f"✗ Aquecimento do cache falhou: {str(e)}")
+        return {}
+
+    ready = result["cached"] + result["scored"]
+    coverage = ready / result["keys"] if result["keys"] else 1.0
+    traffic = f"{result['traffic_inputs']} entradas do tráfego"
+    if result["traffic_requests_total"]:
+        share = result["traffic_requests_covered"] / result["traffic_requests_total"]
+        traffic += f" ({share:.0%} das requisições recentes)"
+    logger.info(
+        f"✓ Aquecimento em {result['seconds']:.2f} s: {traffic} + {result['corpus_phrases']} frases do corpus → "
+        f"{result['keys']} chaves, {result['scored']} calculadas, {result['cached']} já no cache "
+        f"(cobertura {coverage:.0%})"
+    )
+    if result["skipped"]:
+        logger.warning(f"Aquecimento parou no limite de {settings.WARMUP_MAX_SECONDS} s: "
+                       f"{result['skipped']} chaves ficaram de fora")
+    return result
@@ -0,0 +1,8 @@
+"""
+Ferramentas de linha de comando do HealthIA
+
+EXPLICAÇÃO:
+Scripts offline (não fazem parte da API) que trabalham sobre os
+artefatos do modelo em model/. Execute cada um com:
+python -m app.tools.<nome_da_ferramenta>
+"""
@@ -0,0 +1,305 @@
+"""
+Pontuação em lote - Diagnóstico de arquivos inteiros, sem HTTP
+
+EXPLICAÇÃO:
+Lê um arquivo CSV ou NDJSON (JSON Lines, opcionalmente .gz) com textos
+de sintomas e grava um diagnóstico por linha, na MESMA ORDEM da entrada.
+
+1. LEITURA EM BLOCOS: o arquivo é lido em streaming, --chunk-size linhas
+   por vez; nunca fica inteiro na memória.
+2. POOL DE PROCESSOS: cada bloco vai para um processo do pool. Cada
+   processo carrega o modelo UMA vez (ml_service) e pontua o bloco
+   inteiro numa chamada só (MLModelService.predict_batch).
+3. ESCRITA EM ORDEM: os blocos são gravados na ordem da entrada assim que
+   ficam prontos. No máximo 2 blocos por processo ficam "em voo", então a
+   memória não cresce com o tamanho do arquivo.
+4. CHECKPOINT: depois de cada bloco gravado, <saída>.checkpoint.json
+   guarda quantas linhas já foram gravadas e o tamanho da saída. Se o job
+   for interrompido, --resume corta a saída no último bloco completo e
+   continua dali.
+
+Saída NDJSON (.jsonl/.ndjson): {"row", "diagnosis", "confidence",
+"all_probabilities"} por linha. Saída CSV (.csv): row, diagnosis,
+confidence. Linhas sem sintomas saem com "error".
+
+COMO USAR:
+    python -m app.tools.batch_score entrada.csv saida.jsonl
+    python -m app.tools.batch_score entrada.jsonl.gz saida.csv --field sintomas --workers 4
+    python -m app.tools.batch_score entrada.csv saida.jsonl --resume
+"""
+
+import argparse
+import csv
+import gzip
+import io
+import itertools
+import json
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from app.core.config import _available_cores, settings
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Serviço de ML do processo do pool (carregado por _init_worker)
+_service = None
+
+
+def file_format(path: str) -> str:
+    """
+    "csv" ou "ndjson", pela extensão do arquivo (ignorando .gz).
+
+    Raises:
+        ValueError: Extensão desconhecida
+    """
+    name = path[:-3] if path.endswith(".gz") else path
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".jsonl", ".ndjson", ".json")):
+        return "ndjson"
+    raise ValueError(f"Formato de arquivo desconhecido: {path} (use .csv, .jsonl ou .ndjson)")
+
+
+def read_texts(path: str, field: str) -> Iterator[str]:
+    """
+    Percorre os textos de sintomas do arquivo, uma linha por vez.
+
+    Args:
+        path: Arquivo CSV ou NDJSON (pode ser .gz)
+        field: Coluna (CSV) ou chave (NDJSON) com os sintomas
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8", newline="") as f:
+        if file_format(path) == "csv":
+            reader = csv.DictReader(f)
+            if field not in (reader.fieldnames or []):
+                raise ValueError(f"Coluna '{field}' não existe em {path}: {reader.fieldnames}")
+            for row in reader:
+                yield row[field] or ""
+        else:
+            for line in f:
+                if line.strip():
+                    yield str(json.loads(line).get(field) or "")
+
+
+def read_chunks(texts: Iterator[str], chunk_size: int, skip: int) -> Iterator[Tuple[int, List[str]]]:
+    """
+    Agrupa os textos em blocos, pulando as `skip` primeiras linhas.
+
+    Returns:
+        Iterador de (número da primeira linha do bloco, textos do bloco)
+    """
+    texts = itertools.islice(texts, skip, None)
+    start = skip
+    while True:
+        chunk = list(itertools.islice(texts, chunk_size))
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+
+def _init_worker(booster_threads: int):
+    """
+    Roda uma vez em cada processo do pool: carrega o modelo.
+    """
+    # Cada processo pontua um bloco por vez; as threads do XGBoost
+    # dividem os núcleos que sobram para este processo
+    settings.INFERENCE_THREADS = 1
+    settings.BOOSTER_THREADS = booster_threads
+    settings.CASCADE_ENABLED = False
+    # Um log por diagnóstico seria milhões de linhas
+    logging.getLogger("app.services.ml_service").setLevel(logging.WARNING)
+
+    global _service
+    from app.services.ml_service import ml_service
+    _service = ml_service
+
+
+def score_chunk(task: Tuple[int, List[str], str]) -> Tuple[int, bytes]:
+    """
+    Pontua um bloco dentro de um processo do pool.
+
+    EXPLICAÇÃO:
+    O bloco já volta serializado (bytes prontos para gravar), assim o
+    processo principal só escreve no arquivo.
+
+    Args:
+        task: (número da primeira linha, textos, formato da saída)
+
+    Returns:
+        (número de linhas, bytes da saída do bloco)
+    """
+    start, texts, output_format = task
+    valid = [k for k, text in enumerate(texts) if text.strip()]
+    results: List[Dict] = [{"error": "sintomas vazios"} for _ in texts]
+    for k, result in zip(valid, _service.predict_batch([texts[k] for k in valid])):
+        results[k] = result
+
+    buffer = io.StringIO()
+    if output_format == "csv":
+        writer = csv.writer(buffer)
+        for k, result in enumerate(results):
+            writer.writerow([
+                start + k,
+                result.get("diagnosis", ""),
+                result.get("confidence", ""),
+                result.get("error", ""),
+            ])
+    else:
+        for k, result in enumerate(results):
+            record = {"row": start + k}
+            record.update((key, result[key]) for key in
+                          ("diagnosis", "confidence", "all_probabilities", "error") if key in result)
+            buffer.write(json.dumps(record, ensure_ascii=False))
+            buffer.write("\n")
+    return len(texts), buffer.getvalue().encode("utf-8")
+
+
+class Checkpoint:
+    """
+    Progresso do job, gravado em <saída>.checkpoint.json.
+
+    EXPLICAÇÃO:
+    Guarda quantas linhas da entrada já estão na saída e quantos bytes a
+    saída tinha nesse momento. A gravação é atômica (arquivo temporário +
+    os.replace): uma interrupção no meio nunca deixa o checkpoint corrompido.
+    """
+
+    def __init__(self, output_path: str):
+        self.path = output_path + ".checkpoint.json"
+
+    def load(self) -> Optional[Dict]:
+        """Checkpoint anterior, ou None se não houver."""
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def save(self, state: Dict):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+
+def run(args) -> Dict:
+    """
+    Executa o job de pontuação.
+
+    Returns:
+        Resumo: linhas pontuadas, segundos e linhas por segundo
+    """
+    output_format = file_format(args.output)
+    if args.output.endswith(".gz"):
+        raise ValueError("A saída não pode ser .gz: o checkpoint precisa cortar o arquivo")
+
+    job = {
+        "input": os.path.abspath(args.input),
+        "input_bytes": os.path.getsize(args.input),
+        "field": args.field,
+        "format": output_format,
+    }
+    checkpoint = Checkpoint(args.output)
+    previous = checkpoint.load()
+
+    # PASSO 1: começar do zero ou continuar do checkpoint
+    skip, output_bytes = 0, 0
+    if previous is not None:
+        if not args.resume:
+            raise SystemExit(f"Já existe {checkpoint.path}: use --resume para continuar "
+                             f"ou apague o checkpoint e a saída")
+        if previous["job"] != job:
+            raise SystemExit(f"O checkpoint é de outro job ({previous['job']})")
+        if previous["complete"]:
+            logger.info(f"✓ Job já concluído: {previous['rows_done']} linhas em {args.output}")
+            return {"rows": 0, "seconds": 0.0, "rows_per_second": 0.0}
+        skip, output_bytes = previous["rows_done"], previous["output_bytes"]
+        logger.info(f"Continuando do checkpoint: {skip} linhas já gravadas")
+
+    mode = "r+b" if output_bytes else "wb"
+    with open(args.output, mode) as out:
+        # Descarta o que foi gravado depois do último checkpoint
+        out.truncate(output_bytes)
+        out.seek(output_bytes)
+        if output_format == "csv" and not output_bytes:
+            out.write(b"row,diagnosis,confidence,error\n")
+
+        rows_done = skip
+        rows_scored = 0
+        start = time.perf_counter()
+        last_log = start
+
+        def write(result: Tuple[int, bytes]):
+            nonlocal rows_done, rows_scored, last_log
+            count, data = result
+            out.write(data)
+            out.flush()
+            os.fsync(out.fileno())
+            rows_done += count
+            rows_scored += count
+            checkpoint.save({
+                "job": job, "rows_done": rows_done,
+                "output_bytes": out.tell(), "complete": False,
+            })
+
+            now = time.perf_counter()
+            if now - last_log >= args.progress_seconds:
+                logger.info(f"{rows_done} linhas ({rows_scored / (now - start):,.0f} linhas/s)")
+                last_log = now
+
+        # PASSOS 2 e 3: blocos no pool, gravados na ordem de envio
+        booster_threads = max(1, _available_cores() // args.workers)
+        chunks = read_chunks(read_texts(args.input, args.field), args.chunk_size, skip)
+        pending = deque()
+        with ProcessPoolExecutor(
+            max_workers=args.workers, initializer=_init_worker, initargs=(booster_threads,)
+        ) as pool:
+            for chunk_start, texts in chunks:
+                pending.append(pool.submit(score_chunk, (chunk_start, texts, output_format)))
+                if len(pending) >= 2 * args.workers:
+                    write(pending.popleft().result())
+            while pending:
+                write(pending.popleft().result())
+
+        seconds = time.perf_counter() - start
+        checkpoint.save({
+            "job": job, "rows_done": rows_done,
+            "output_bytes": out.tell(), "complete": True,
+        })
+
+    return {
+        "rows": rows_scored,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(rows_scored / seconds, 1) if seconds else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pontua um arquivo de sintomas com o modelo HealthIA")
+    parser.add_argument("input", help="Arquivo .csv, .jsonl ou .ndjson (pode ser .gz)")
+    parser.add_argument("output", help="Arquivo .jsonl/.ndjson ou .csv")
+    parser.add_argument("--field", default="sintomas", help="Coluna/chave com os sintomas")
+    parser.add_argument("--chunk-size", type=int, default=2000, help="Linhas por bloco")
+    parser.add_argument("--workers", type=int, default=_available_cores())
+    parser.add_argument("--resume", action="store_true", help="Continua do checkpoint")
+    parser.add_argument("--progress-seconds", type=float, default=10.0)
+    args = parser.parse_args()
+
+    summary = run(args)
+    logger.info("=" * 70)
+    logger.info(f"✓ {summary['rows']} linhas pontuadas em {summary['seconds']:.1f}s "
+                f"({summary['rows_per_second']:,.0f} linhas/s) → {args.output}")
+    logger.info("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
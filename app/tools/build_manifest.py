@@ -0,0 +1,74 @@
+"""
+Gera o manifesto dos artefatos do modelo (sha256 de cada arquivo)
+
+EXPLICAÇÃO:
+Grava model/manifest_HealthIA.json com o sha256 e o tamanho de cada
+arquivo do diretório. Na carga, a API confere cada artefato contra o
+manifesto e se recusa a carregar um arquivo diferente (veja
+app/services/artifacts.py).
+
+Rode depois de copiar artefatos novos para model/ (ex: depois de um
+treino). As ferramentas que gravam direto em model/ (build_suggestions,
+build_similar_index, build_warmup, distill_linear, export_onnx,
+compress_model) já atualizam a própria entrada.
+
+Os arquivos do manifesto local (artefatos fora do git, gerados por
+export_onnx, distill_linear e compress_model) não entram no manifesto
+versionado; com --local, é o manifesto local que é gerado de novo.
+
+COMO USAR:
+    python -m app.tools.build_manifest
+    python -m app.tools.build_manifest modelo_HealthIA.json vetorizador_HealthIA.pkl
+    python -m app.tools.build_manifest --local modelo_HealthIA.onnx
+"""
+
+import argparse
+import logging
+import os
+
+from app.core.config import settings
+from app.services.artifacts import file_sha256, read_manifest, write_manifest
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera o manifesto (sha256) dos artefatos do modelo")
+    parser.add_argument("names", nargs="*",
+                        help="Arquivos a incluir (padrão: todos os arquivos do diretório)")
+    parser.add_argument("--model-dir", default=settings.MODEL_PATH)
+    parser.add_argument("--local", action="store_true",
+                        help="Gerar o manifesto local (artefatos fora do git)")
+    args = parser.parse_args()
+
+    local_path = os.path.join(args.model_dir, settings.ARTIFACT_LOCAL_MANIFEST_FILE)
+    local_names = set(read_manifest(local_path) or {})
+    if args.local:
+        manifest_path = local_path
+        names = args.names or sorted(
+            name for name in local_names if os.path.isfile(os.path.join(args.model_dir, name))
+        )
+    else:
+        manifest_path = os.path.join(args.model_dir, settings.ARTIFACT_MANIFEST_FILE)
+        names = args.names or sorted(
+            name for name in os.listdir(args.model_dir)
+            if os.path.isfile(os.path.join(args.model_dir, name))
+            and name not in (settings.ARTIFACT_MANIFEST_FILE, settings.ARTIFACT_LOCAL_MANIFEST_FILE)
+            and name not in local_names
+            and not name.endswith(".tmp")
+        )
+
+    artifacts = {}
+    for name in names:
+        path = os.path.join(args.model_dir, name)
+        artifacts[name] = {"sha256": file_sha256(path), "bytes": os.path.getsize(path)}
+        logger.info(f"  {artifacts[name]['sha256'][:12]}  {name}")
+
+    write_manifest(manifest_path, artifacts)
+    logger.info(f"✓ Manifesto com {len(artifacts)} artefatos salvo em: {manifest_path}")
+
+
+if __name__ == "__main__":
+    main()
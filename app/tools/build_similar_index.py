@@ -0,0 +1,95 @@
+"""
+Gera o índice invertido dos casos do treino (POST /similar)
+
+EXPLICAÇÃO:
+Gera model/casos_HealthIA.npz, usado pelo endpoint /similar (veja
+app/services/similar.py). O arquivo guarda:
+- as posting lists (para cada palavra: casos que a contêm e o peso
+  TF-IDF dela em cada um), em formato CSC;
+- o texto e a doença de cada caso;
+- os pesos IDF do vetorizador, para a API recusar um índice gerado com
+  outro vetorizador.
+
+O dataset é lido e vetorizado em blocos (--chunk-size), então a
+ferramenta funciona com centenas de milhares de casos.
+Rode de novo sempre que o dataset ou o vetorizador mudarem.
+
+COMO USAR:
+    python -m app.tools.build_similar_index
+    python -m app.tools.build_similar_index --dataset outro.jsonl.gz --output /tmp/casos.npz
+"""
+
+import argparse
+import itertools
+import logging
+import os
+import time
+
+import joblib
+import numpy as np
+import scipy.sparse as sp
+
+from app.core.config import settings
+from app.services.artifacts import update_manifest
+from app.services.dataset import iter_dataset
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera o índice de casos parecidos")
+    parser.add_argument("--output", default=os.path.join(settings.MODEL_PATH, settings.SIMILAR_CASES_FILE))
+    parser.add_argument("--dataset", default=None,
+                        help="Arquivo .jsonl.gz do dataset (padrão: settings.DATASET_FILE)")
+    parser.add_argument("--chunk-size", type=int, default=50000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    vectorizer = joblib.load(os.path.join(settings.MODEL_PATH, settings.VECTORIZER_FILE))
+
+    blocks = []
+    labels = []
+    classes = {}
+    text_blob = bytearray()
+    text_offsets = [0]
+
+    rows = iter_dataset(args.dataset)
+    while True:
+        chunk = list(itertools.islice(rows, args.chunk_size))
+        if not chunk:
+            break
+        texts = [" ".join(text.lower().replace(",", " ").split()) for text, _ in chunk]
+        blocks.append(vectorizer.transform(texts).astype(np.float32))
+        for text, (_, label) in zip(texts, chunk):
+            labels.append(classes.setdefault(label, len(classes)))
+            text_blob.extend(text.encode("utf-8"))
+            text_offsets.append(len(text_blob))
+
+    X = sp.vstack(blocks).tocsc()
+    X.sort_indices()
+
+    tmp_path = args.output + ".tmp.npz"
+    np.savez(
+        tmp_path,
+        indptr=X.indptr.astype(np.int64),
+        rows=X.indices.astype(np.int32 if X.shape[0] < 2**31 else np.int64),
+        weights=X.data,
+        labels=np.asarray(labels, dtype=np.int32),
+        classes=np.asarray(list(classes)),
+        text_offsets=np.asarray(text_offsets, dtype=np.int64),
+        text_blob=np.frombuffer(bytes(text_blob), dtype=np.uint8),
+        idf=vectorizer.idf_,
+    )
+    os.replace(tmp_path, args.output)
+    update_manifest(args.output)
+
+    lengths = np.diff(X.indptr)
+    logger.info(f"✓ {X.shape[0]} casos, {X.nnz} entradas nas posting lists "
+                f"(maior lista: {lengths.max()} casos) em {time.perf_counter() - start:.1f}s")
+    logger.info(f"✓ Índice salvo em: {args.output} ({os.path.getsize(args.output) / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
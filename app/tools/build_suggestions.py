@@ -0,0 +1,111 @@
+"""
+Gera as sugestões de sintomas do autocomplete (GET /symptoms/suggest)
+
+EXPLICAÇÃO:
+Gera model/sugestoes_HealthIA.json a partir do dataset: as palavras e
+expressões (até --max-words palavras seguidas, ex: "dor nas juntas",
+"perda de peso") que aparecem nos exemplos de treino, cada uma com a
+sua FREQUÊNCIA DE DOCUMENTO (em quantos exemplos aparece). O
+autocomplete ordena as sugestões por essa frequência.
+
+A API não lê o dataset (veja app/services/dataset.py): por isso as
+expressões são extraídas aqui, offline, e a API só carrega o arquivo.
+Sem o arquivo, o autocomplete sugere apenas palavras do vocabulário.
+
+Regras:
+- expressões não começam nem terminam com palavras de ligação
+  ("de", "com", "nas"...): "perda de peso" sim, "perda de" não;
+- expressões de 2+ palavras precisam aparecer em pelo menos --min-df
+  exemplos (as que só aparecem uma vez são recortes de um exemplo).
+
+COMO USAR:
+    python -m app.tools.build_suggestions
+    python -m app.tools.build_suggestions --max-words 3 --min-df 3
+"""
+
+import argparse
+import json
+import logging
+import os
+from typing import Dict, Iterable, List, Tuple
+
+from app.core.config import settings
+from app.services.artifacts import update_manifest
+from app.services.dataset import iter_dataset
+from app.services.suggest import normalize_query
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Palavras de ligação: não começam nem terminam uma sugestão
+CONNECTIVES = {
+    "a", "o", "as", "os", "e", "de", "do", "da", "dos", "das", "no", "na",
+    "nos", "nas", "em", "com", "ao", "aos", "para", "que", "se", "por",
+}
+
+
+def extract_phrases(texts: Iterable[str], max_words: int, min_df: int) -> List[Tuple[str, int]]:
+    """
+    Expressões do dataset com a frequência de documento de cada uma.
+
+    Args:
+        texts: Sintomas de cada exemplo
+        max_words: Tamanho máximo das expressões
+        min_df: Frequência mínima das expressões de 2+ palavras
+
+    Returns:
+        Lista de (expressão, frequência), da mais para a menos frequente
+    """
+    document_frequency: Dict[str, int] = {}
+    for text in texts:
+        words = normalize_query(text).split()
+        found = set()
+        for start in range(len(words)):
+            if words[start] in CONNECTIVES:
+                continue
+            for end in range(start + 1, min(start + max_words, len(words)) + 1):
+                if words[end - 1] not in CONNECTIVES:
+                    found.add(" ".join(words[start:end]))
+        for phrase in found:
+            document_frequency[phrase] = document_frequency.get(phrase, 0) + 1
+
+    phrases = [
+        (phrase, df) for phrase, df in document_frequency.items()
+        if df >= min_df or " " not in phrase
+    ]
+    return sorted(phrases, key=lambda item: (-item[1], item[0]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera as sugestões do autocomplete de sintomas")
+    parser.add_argument("--output", default=os.path.join(settings.MODEL_PATH, settings.SUGGESTIONS_FILE))
+    parser.add_argument("--dataset", default=None,
+                        help="Arquivo .jsonl.gz do dataset (padrão: settings.DATASET_FILE)")
+    parser.add_argument("--max-words", type=int, default=4)
+    parser.add_argument("--min-df", type=int, default=2)
+    args = parser.parse_args()
+
+    phrases = extract_phrases(
+        (text for text, _ in iter_dataset(args.dataset)), args.max_words, args.min_df
+    )
+
+    tmp_path = args.output + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        # Uma sugestão por linha: diffs legíveis quando o dataset muda
+        f.write("[\n")
+        f.write(",\n".join(
+            json.dumps({"text": text, "frequency": df}, ensure_ascii=False)
+            for text, df in phrases
+        ))
+        f.write("\n]\n")
+    os.replace(tmp_path, args.output)
+    update_manifest(args.output)
+
+    words = sum(1 for text, _ in phrases if " " not in text)
+    logger.info(f"✓ {len(phrases)} sugestões ({words} palavras, "
+                f"{len(phrases) - words} expressões) salvas em: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
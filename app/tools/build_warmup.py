@@ -0,0 +1,82 @@
+"""
+Gera as frases de aquecimento do cache de predições (startup dos workers)
+
+EXPLICAÇÃO:
+Gera model/aquecimento_HealthIA.json a partir do dataset: cada texto de
+sintomas diferente dos exemplos de treino, com quantas vezes aparece.
+No startup, cada worker calcula em lote as predições dessas frases e
+guarda no cache de predições ANTES de ficar pronto (app/services/warmup.py).
+
+A API não lê o dataset (veja app/services/dataset.py): por isso as
+frases são extraídas aqui, offline, e a API só carrega o arquivo.
+Sem o arquivo, o aquecimento usa só o tráfego recente.
+
+Textos que só diferem em maiúsculas, vírgulas ou espaços contam como a
+mesma frase. Ordem: da mais para a menos frequente (se o aquecimento
+estourar o tempo limite, as mais comuns já foram calculadas).
+
+COMO USAR:
+    python -m app.tools.build_warmup
+    python -m app.tools.build_warmup --dataset outro.jsonl.gz
+"""
+
+import argparse
+import json
+import logging
+import os
+from typing import Dict, Iterable, List, Tuple
+
+from app.core.config import settings
+from app.services.artifacts import update_manifest
+from app.services.dataset import iter_dataset
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def unique_phrases(texts: Iterable[str]) -> List[Tuple[str, int]]:
+    """
+    Textos diferentes (depois da limpeza básica) com a frequência de cada um.
+
+    Args:
+        texts: Sintomas de cada exemplo
+
+    Returns:
+        Lista de (texto, frequência), do mais para o menos frequente
+    """
+    counts: Dict[str, int] = {}
+    for text in texts:
+        # Mesma limpeza do início de MLModelService._preprocess_symptoms
+        phrase = " ".join(text.lower().replace(",", " ").split())
+        if phrase:
+            counts[phrase] = counts.get(phrase, 0) + 1
+    return sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera as frases de aquecimento do cache de predições")
+    parser.add_argument("--output", default=os.path.join(settings.MODEL_PATH, settings.WARMUP_FILE))
+    parser.add_argument("--dataset", default=None,
+                        help="Arquivo .jsonl.gz do dataset (padrão: settings.DATASET_FILE)")
+    args = parser.parse_args()
+
+    phrases = unique_phrases(text for text, _ in iter_dataset(args.dataset))
+
+    tmp_path = args.output + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        # Uma frase por linha: diffs legíveis quando o dataset muda
+        f.write("[\n")
+        f.write(",\n".join(
+            json.dumps({"text": text, "frequency": count}, ensure_ascii=False)
+            for text, count in phrases
+        ))
+        f.write("\n]\n")
+    os.replace(tmp_path, args.output)
+    update_manifest(args.output)
+
+    logger.info(f"✓ {len(phrases)} frases de aquecimento salvas em: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,409 @@
+"""
+Compressão do modelo XGBoost - Menos árvores, menos nós, números compactos
+
+EXPLICAÇÃO:
+O modelo tem 3000 árvores (150 rodadas × 20 doenças) treinadas com
+só ~200 exemplos. Muitas delas quase não mudam o resultado. Esta
+ferramenta gera uma versão menor do modelo em 4 passos:
+
+1. PODA DE ÁRVORES: uma árvore cujas folhas são quase todas iguais
+   soma praticamente uma CONSTANTE à margem da sua doença. Removemos a
+   árvore e somamos essa constante (média das folhas, ponderada pela
+   cobertura) nas folhas da primeira árvore da mesma doença. O erro na
+   margem é no máximo a distância da média até a folha mais longe dela,
+   max(média - min, max - média): com a cobertura concentrada numa folha,
+   a média fica perto dela e uma folha rara pode errar quase o spread
+   inteiro (não só a metade). Podamos as árvores de menor erro até gastar
+   --margin-budget por doença.
+
+2. FUSÃO DE SPLITS: um nó cujos dois filhos são folhas com valores
+   quase iguais (diferença <= --merge-tolerance) vira uma folha só.
+   Repetimos de baixo para cima até não haver mais fusões.
+
+3. NÚMEROS COMPACTOS: o JSON do XGBoost escreve cada número com 8-9
+   dígitos. Gravamos folhas e limiares com a menor representação que
+   volta ao mesmo float32 (ou float16, com --leaf-dtype/--threshold-dtype)
+   e zeramos o que só é usado no treino (ganho dos splits e pesos
+   dos nós internos). A cobertura (sum_hessian) continua gravada
+   porque as explicações (pred_contribs) dependem dela.
+
+O resultado continua sendo um JSON que o XGBoost carrega direto
+(MODEL_FILE=modelo_HealthIA.compact.json). Não usamos o formato binário
+UBJSON: com árvores tão pequenas, os nomes dos campos repetidos em cada
+árvore deixam o .ubj MAIOR que o JSON.
+
+GUARDRAIL:
+O modelo comprimido é comparado com o original em todo o dataset
+(top-1: mesmo diagnóstico; top-3: mesmas 3 doenças mais prováveis).
+Se a concordância ficar abaixo de settings.COMPRESSION_MIN_AGREEMENT
+(top-1) ou settings.COMPRESSION_MIN_TOP3_AGREEMENT (top-3), o arquivo
+NÃO é gravado. O top-3 é mais sensível: a 3ª e a 4ª doenças costumam
+ter probabilidades quase empatadas.
+
+COMO USAR:
+    python -m app.tools.compress_model
+    python -m app.tools.compress_model --margin-budget 0.1 --leaf-dtype float16
+    MODEL_FILE=modelo_HealthIA.compact.json python -m app.main
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from collections import deque
+from typing import Dict, List
+
+import numpy as np
+import xgboost as xgb
+
+from app.core.config import settings
+
+# A compressão parte sempre do modelo nativo
+settings.INFERENCE_BACKEND = "xgboost"
+
+from app.services.ml_service import ml_service  # noqa: E402
+from app.services.artifacts import update_manifest  # noqa: E402
+from app.services.dataset import iter_dataset  # noqa: E402
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Valor de "sem pai" usado pelo XGBoost na raiz da árvore
+ROOT_PARENT = 2147483647
+
+
+def _compact(value: float, dtype: str) -> float:
+    """
+    Menor número decimal que representa `value` no tipo `dtype`.
+
+    EXPLICAÇÃO:
+    str(np.float16(0.0551213)) == "0.0551": o JSON grava "0.0551"
+    em vez de "0.05512130260467529".
+    """
+    return float(str(np.dtype(dtype).type(value)))
+
+
+class _Node:
+    """Nó de árvore em forma de objeto (mais fácil de podar que os arrays do JSON)."""
+
+    __slots__ = (
+        "left", "right", "feature", "threshold", "default_left",
+        "value", "base_weight", "gain", "cover",
+    )
+
+    def is_leaf(self) -> bool:
+        return self.left is None
+
+
+def _tree_from_json(tree: Dict) -> _Node:
+    """Converte os arrays de uma árvore do JSON do XGBoost em objetos _Node."""
+    nodes = []
+    for i in range(len(tree["left_children"])):
+        node = _Node()
+        node.feature = tree["split_indices"][i]
+        node.threshold = tree["split_conditions"][i]
+        node.default_left = tree["default_left"][i]
+        node.base_weight = tree["base_weights"][i]
+        node.gain = tree["loss_changes"][i]
+        node.cover = tree["sum_hessian"][i]
+        # Nas folhas, split_conditions guarda o valor da folha
+        node.value = tree["split_conditions"][i]
+        nodes.append(node)
+
+    for i, node in enumerate(nodes):
+        left, right = tree["left_children"][i], tree["right_children"][i]
+        node.left = nodes[left] if left != -1 else None
+        node.right = nodes[right] if right != -1 else None
+    return nodes[0]
+
+
+def _tree_to_json(
+    root: _Node,
+    tree_id: int,
+    num_feature: str,
+    leaf_dtype: str,
+    threshold_dtype: str,
+) -> Dict:
+    """
+    Converte a árvore de volta para arrays (ids em ordem de largura, raiz = 0).
+
+    EXPLICAÇÃO:
+    Só o necessário para predizer e explicar é gravado com valor real:
+    estrutura, limiares, folhas e cobertura. Ganho (loss_changes) e
+    pesos dos nós internos (base_weights) só servem no treino e viram 0.
+    """
+    order: List[_Node] = []
+    parents: List[int] = []
+    queue = deque([(root, ROOT_PARENT)])
+    while queue:
+        node, parent = queue.popleft()
+        index = len(order)
+        order.append(node)
+        parents.append(parent)
+        if not node.is_leaf():
+            queue.append((node.left, index))
+            queue.append((node.right, index))
+
+    ids = {id(node): i for i, node in enumerate(order)}
+    tree = {
+        "base_weights": [], "default_left": [], "left_children": [],
+        "loss_changes": [], "right_children": [], "split_conditions": [],
+        "split_indices": [], "split_type": [], "sum_hessian": [],
+    }
+    for node in order:
+        if node.is_leaf():
+            value = _compact(node.value, leaf_dtype)
+            tree["left_children"].append(-1)
+            tree["right_children"].append(-1)
+            tree["split_indices"].append(0)
+            tree["split_conditions"].append(value)
+            tree["default_left"].append(0)
+            tree["base_weights"].append(value)
+        else:
+            tree["left_children"].append(ids[id(node.left)])
+            tree["right_children"].append(ids[id(node.right)])
+            tree["split_indices"].append(node.feature)
+            tree["split_conditions"].append(_compact(node.threshold, threshold_dtype))
+            tree["default_left"].append(node.default_left)
+            tree["base_weights"].append(0.0)
+        tree["loss_changes"].append(0.0)
+        tree["sum_hessian"].append(_compact(node.cover, "float16"))
+        tree["split_type"].append(0)
+
+    tree.update({
+        "id": tree_id,
+        "parents": parents,
+        "categories": [],
+        "categories_nodes": [],
+        "categories_segments": [],
+        "categories_sizes": [],
+        "tree_param": {
+            "num_deleted": "0",
+            "num_feature": num_feature,
+            "num_nodes": str(len(order)),
+            "size_leaf_vector": "1",
+        },
+    })
+    return tree
+
+
+def _leaves(root: _Node) -> List[_Node]:
+    """Todas as folhas da árvore."""
+    leaves, stack = [], [root]
+    while stack:
+        node = stack.pop()
+        if node.is_leaf():
+            leaves.append(node)
+        else:
+            stack.extend((node.left, node.right))
+    return leaves
+
+
+def _merge_splits(node: _Node, tolerance: float) -> int:
+    """
+    Funde, de baixo para cima, nós cujos dois filhos são folhas quase iguais.
+
+    Returns:
+        Quantidade de splits removidos
+    """
+    if node.is_leaf():
+        return 0
+
+    merged = _merge_splits(node.left, tolerance) + _merge_splits(node.right, tolerance)
+    left, right = node.left, node.right
+    if left.is_leaf() and right.is_leaf() and abs(left.value - right.value) <= tolerance:
+        cover = left.cover + right.cover
+        node.value = (left.value * left.cover + right.value * right.cover) / cover
+        node.left = node.right = None
+        merged += 1
+    return merged
+
+
+def compress_booster(
+    booster_json: Dict,
+    margin_budget: float,
+    merge_tolerance: float,
+    leaf_dtype: str = "float32",
+    threshold_dtype: str = "float32",
+) -> Dict:
+    """
+    Aplica poda, fusão e números compactos num modelo em JSON (formato do XGBoost).
+
+    Args:
+        booster_json: Modelo carregado de Booster.save_raw("json")
+        margin_budget: Erro máximo somado na margem de cada doença pela poda
+        merge_tolerance: Diferença máxima entre folhas irmãs para fundi-las
+        leaf_dtype: "float32" ou "float16" (precisão dos valores das folhas)
+        threshold_dtype: "float32" ou "float16" (precisão dos limiares)
+
+    Returns:
+        Novo modelo em JSON (o original não é alterado)
+    """
+    booster_json = json.loads(json.dumps(booster_json))
+    model = booster_json["learner"]["gradient_booster"]["model"]
+    num_feature = booster_json["learner"]["learner_model_param"]["num_feature"]
+
+    trees = [_tree_from_json(tree) for tree in model["trees"]]
+    tree_info = list(model["tree_info"])
+    indptr = model["iteration_indptr"]
+    # Rodada de cada árvore (para reconstruir iteration_indptr depois)
+    iteration = np.searchsorted(indptr, np.arange(len(trees)), side="right") - 1
+
+    # PASSO 1: podar árvores quase constantes, as de menor erro primeiro.
+    # A primeira árvore de cada doença ("âncora") nunca é podada: ela
+    # recebe a constante das árvores removidas.
+    anchors: Dict[int, int] = {}
+    candidates: Dict[int, List] = {}
+    for i, root in enumerate(trees):
+        cls = tree_info[i]
+        if cls not in anchors:
+            anchors[cls] = i
+            continue
+        leaves = _leaves(root)
+        values = np.array([leaf.value for leaf in leaves])
+        constant = float(np.average(values, weights=[leaf.cover for leaf in leaves]))
+        # Pior erro da troca da árvore pela constante (em qualquer folha)
+        error = max(constant - values.min(), values.max() - constant)
+        candidates.setdefault(cls, []).append((error, i, constant))
+
+    pruned = set()
+    for cls, trees_of_class in candidates.items():
+        spent, offset = 0.0, 0.0
+        for error, i, constant in sorted(trees_of_class):
+            if spent + error > margin_budget:
+                break
+            spent += error
+            offset += constant
+            pruned.add(i)
+        for leaf in _leaves(trees[anchors[cls]]):
+            leaf.value += offset
+
+    keep = [i for i in range(len(trees)) if i not in pruned]
+
+    # PASSO 2: fundir splits redundantes
+    merged = sum(_merge_splits(trees[i], merge_tolerance) for i in keep)
+
+    # PASSO 3: gravar com números compactos
+    model["trees"] = [
+        _tree_to_json(trees[i], new_id, num_feature, leaf_dtype, threshold_dtype)
+        for new_id, i in enumerate(keep)
+    ]
+    model["tree_info"] = [tree_info[i] for i in keep]
+    counts = np.bincount(iteration[keep], minlength=len(indptr) - 1)
+    model["iteration_indptr"] = [0] + np.cumsum(counts).tolist()
+    model["gbtree_model_param"]["num_trees"] = str(len(keep))
+
+    logger.info(
+        f"Árvores: {len(trees)} → {len(keep)} "
+        f"({len(pruned)} podadas); splits fundidos: {merged}"
+    )
+    return booster_json
+
+
+def _single_row_latency_ms(model, texts: List[str]) -> float:
+    """Latência mediana (ms) de uma predição por vez, com 1 thread."""
+    X = ml_service.vectorizer.transform(texts)
+    model.set_params(n_jobs=1)
+    for i in range(min(20, X.shape[0])):
+        model.predict_proba(X[i])
+
+    latencies = []
+    for _ in range(3):
+        for i in range(X.shape[0]):
+            start = time.perf_counter()
+            model.predict_proba(X[i])
+            latencies.append((time.perf_counter() - start) * 1000)
+    return float(np.median(latencies))
+
+
+def _agreement(original: np.ndarray, compressed: np.ndarray) -> Dict[str, float]:
+    """Concordância top-1 e top-3 entre duas matrizes de probabilidades."""
+    top1 = np.mean(original.argmax(axis=1) == compressed.argmax(axis=1))
+    top3_original = np.sort(np.argsort(-original, axis=1)[:, :3], axis=1)
+    top3_compressed = np.sort(np.argsort(-compressed, axis=1)[:, :3], axis=1)
+    top3 = np.mean((top3_original == top3_compressed).all(axis=1))
+    return {
+        "top1": float(top1),
+        "top3": float(top3),
+        "max_prob_diff": float(np.abs(original - compressed).max()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Comprime o modelo XGBoost do HealthIA")
+    parser.add_argument(
+        "--output",
+        default=os.path.join(settings.MODEL_PATH, "modelo_HealthIA.compact.json")
+    )
+    parser.add_argument("--margin-budget", type=float, default=0.05)
+    parser.add_argument("--merge-tolerance", type=float, default=0.005)
+    parser.add_argument("--leaf-dtype", choices=["float32", "float16"], default="float16")
+    parser.add_argument("--threshold-dtype", choices=["float32", "float16"], default="float32")
+    parser.add_argument(
+        "--min-agreement",
+        type=float,
+        default=settings.COMPRESSION_MIN_AGREEMENT,
+        help="Concordância mínima top-1 (padrão: COMPRESSION_MIN_AGREEMENT)"
+    )
+    parser.add_argument(
+        "--min-top3-agreement",
+        type=float,
+        default=settings.COMPRESSION_MIN_TOP3_AGREEMENT,
+        help="Concordância mínima top-3 (padrão: COMPRESSION_MIN_TOP3_AGREEMENT)"
+    )
+    args = parser.parse_args()
+
+    original = ml_service.model
+    original_json = json.loads(original.get_booster().save_raw("json"))
+
+    compressed_json = compress_booster(
+        original_json,
+        args.margin_budget,
+        args.merge_tolerance,
+        args.leaf_dtype,
+        args.threshold_dtype,
+    )
+    compressed_raw = json.dumps(compressed_json, separators=(",", ":")).encode("utf-8")
+    compressed = xgb.XGBClassifier()
+    compressed.load_model(bytearray(compressed_raw))
+
+    # Comparar os dois modelos em todo o dataset
+    texts = [ml_service._preprocess_symptoms(text) for text, _ in iter_dataset()]
+    X = ml_service.vectorizer.transform(texts)
+    agreement = _agreement(original.predict_proba(X), compressed.predict_proba(X))
+
+    original_ms = _single_row_latency_ms(original, texts)
+    compressed_ms = _single_row_latency_ms(compressed, texts)
+    original.set_params(n_jobs=ml_service.cpu_plan["booster_threads"])
+
+    logger.info("=" * 70)
+    logger.info(f"{'':<12}{'original':>14}{'comprimido':>14}")
+    logger.info(
+        f"{'tamanho':<12}{os.path.getsize(ml_service.model_path):>14}"
+        f"{len(compressed_raw):>14}  bytes"
+    )
+    logger.info(f"{'latência':<12}{original_ms:>14.3f}{compressed_ms:>14.3f}  ms (p50, 1 linha)")
+    logger.info(
+        f"Concordância em {len(texts)} exemplos: top-1 {agreement['top1']:.2%}, "
+        f"top-3 {agreement['top3']:.2%}, "
+        f"maior diferença de probabilidade {agreement['max_prob_diff']:.4f}"
+    )
+    logger.info("=" * 70)
+
+    if agreement["top1"] < args.min_agreement or agreement["top3"] < args.min_top3_agreement:
+        logger.error(
+            f"✗ Concordância abaixo do mínimo (top-1 {args.min_agreement:.2%}, "
+            f"top-3 {args.min_top3_agreement:.2%}); modelo comprimido NÃO foi salvo."
+        )
+        sys.exit(1)
+
+    with open(args.output, "wb") as f:
+        f.write(compressed_raw)
+    update_manifest(args.output, local=True)
+    logger.info(f"✓ Modelo comprimido salvo em: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Destila o XGBoost num modelo linear para a cascata
+
+EXPLICAÇÃO:
+Gera model/linear_HealthIA.npz, o modelo rápido usado quando
+settings.CASCADE_ENABLED = True (veja app/services/cascade.py).
+
+COMO FUNCIONA:
+1. DADOS: além dos exemplos do dataset, criamos variações
+   deles (removendo palavras ao acaso e juntando dois exemplos).
+   Assim o linear vê também entradas incompletas e ambíguas.
+   As variações do conjunto de calibração são mais leves (mantêm
+   mais palavras), mais parecidas com o que chega em produção.
+2. PROFESSOR: o XGBoost calcula as probabilidades de cada variação.
+3. ALUNO: uma regressão logística multinomial aprende a imitar essas
+   probabilidades ("soft targets"). Como o scikit-learn só aceita um
+   rótulo por linha, cada linha é repetida uma vez por classe provável,
+   com peso = probabilidade dada pelo professor.
+4. CALIBRAÇÃO: num conjunto separado (variações de OUTROS exemplos),
+   escolhemos a menor margem a partir da qual o linear concorda com o
+   XGBoost em pelo menos CASCADE_TARGET_AGREEMENT dos casos.
+
+No fim a ferramenta mostra a taxa de escalação, a concordância e a
+latência de cada camada no conjunto de calibração.
+
+COMO USAR:
+    python -m app.tools.distill_linear
+    CASCADE_ENABLED=true python -m app.main
+"""
+
+import argparse
+import logging
+import os
+import time
+from typing import List, Tuple
+
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+
+from app.core.config import settings
+
+# O professor é sempre o modelo completo
+settings.INFERENCE_BACKEND = "xgboost"
+settings.CASCADE_ENABLED = False
+
+from app.services.ml_service import ml_service  # noqa: E402
+from app.services.cascade import LinearFastPath  # noqa: E402
+from app.services.artifacts import update_manifest  # noqa: E402
+from app.services.dataset import iter_dataset  # noqa: E402
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+
+def augment(
+    texts: List[str],
+    variants: int,
+    rng: np.random.Generator,
+    keep_range: Tuple[float, float] = (0.3, 0.9),
+    mix_rate: float = 0.25,
+) -> List[str]:
+    """
+    Gera variações dos textos.
+
+    Args:
+        texts: Sintomas já pré-processados
+        variants: Variações por texto
+        rng: Gerador de números aleatórios
+        keep_range: Fração de palavras mantidas (sorteada por variação)
+        mix_rate: Fração das variações que misturam dois exemplos
+
+    Returns:
+        Os textos originais seguidos das variações
+    """
+    augmented = list(texts)
+    for text in texts:
+        words = text.split()
+        for _ in range(variants):
+            if rng.random() < mix_rate:
+                # Mistura com outro exemplo: casos ambíguos
+                other = texts[rng.integers(len(texts))].split()
+                words_mixed = words + other
+                keep = rng.random(len(words_mixed)) < 0.5
+                chosen = [w for w, k in zip(words_mixed, keep) if k] or words
+            else:
+                # Sintomas incompletos: remove palavras ao acaso
+                keep = rng.random(len(words)) < rng.uniform(*keep_range)
+                chosen = [w for w, k in zip(words, keep) if k] or words[:1]
+            augmented.append(" ".join(chosen))
+    return augmented
+
+
+def fit_student(X, teacher: np.ndarray, C: float) -> LogisticRegression:
+    """
+    Treina a regressão logística com as probabilidades do professor.
+
+    EXPLICAÇÃO:
+    Linha i com probabilidade p para a classe c vira uma cópia da linha
+    com rótulo c e peso p. Probabilidades muito pequenas são ignoradas.
+    """
+    rows, classes = np.nonzero(teacher >= 1e-3)
+    student = LogisticRegression(C=C, max_iter=2000)
+    student.fit(X[rows], classes, sample_weight=teacher[rows, classes])
+    return student
+
+
+def calibrate_threshold(
+    margins: np.ndarray,
+    agree: np.ndarray,
+    target: float,
+) -> Tuple[float, float]:
+    """
+    Menor margem cuja concordância (entre as respostas aceitas) atinge o alvo.
+
+    Args:
+        margins: Margem do linear em cada exemplo de calibração
+        agree: Se o top-1 do linear é igual ao do professor
+        target: Concordância desejada (ex: 0.99)
+
+    Returns:
+        (limiar, fração de exemplos respondidos pelo linear)
+    """
+    order = np.argsort(-margins)
+    cumulative = np.cumsum(agree[order]) / np.arange(1, len(order) + 1)
+    ok = np.nonzero(cumulative >= target)[0]
+    if len(ok) == 0:
+        return float("inf"), 0.0
+
+    accepted = ok[-1] + 1
+    return float(margins[order][ok[-1]]), accepted / len(order)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Destila o XGBoost num modelo linear")
+    parser.add_argument("--output", default=os.path.join(settings.MODEL_PATH, settings.LINEAR_FILE))
+    parser.add_argument("--variants", type=int, default=30, help="Variações por exemplo")
+    parser.add_argument("--C", type=float, default=10.0, help="Inverso da regularização")
+    parser.add_argument("--target-agreement", type=float, default=settings.CASCADE_TARGET_AGREEMENT)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    texts = [ml_service._preprocess_symptoms(text) for text, _ in iter_dataset()]
+
+    # Separar os exemplos ANTES de gerar variações: a calibração não
+    # pode ver variações dos mesmos exemplos usados no treino
+    order = rng.permutation(len(texts))
+    split = int(len(texts) * 0.8)
+    train_texts = augment([texts[i] for i in order[:split]], args.variants, rng)
+    # Calibração com variações mais leves, próximas do que chega em produção
+    calib_texts = augment(
+        [texts[i] for i in order[split:]], args.variants, rng,
+        keep_range=(0.6, 1.0), mix_rate=0.1
+    )
+
+    # PASSO 1 e 2: professor
+    X_train = ml_service.vectorizer.transform(train_texts)
+    X_calib = ml_service.vectorizer.transform(calib_texts)
+    teacher_train = ml_service.model.predict_proba(X_train)
+    teacher_calib = ml_service.model.predict_proba(X_calib)
+
+    # PASSO 3: aluno
+    start = time.perf_counter()
+    student = fit_student(X_train, teacher_train, args.C)
+    logger.info(f"Regressão logística treinada em {time.perf_counter() - start:.1f}s "
+                f"({X_train.shape[0]} textos)")
+
+    # O aluno só vê as classes que apareceram no treino; completar as ausentes
+    n_classes = teacher_train.shape[1]
+    coef = np.zeros((n_classes, X_train.shape[1]), dtype=np.float32)
+    intercept = np.full(n_classes, -1e4, dtype=np.float32)
+    coef[student.classes_] = student.coef_
+    intercept[student.classes_] = student.intercept_
+
+    # PASSO 4: calibração
+    tmp_path = args.output + ".tmp.npz"
+    np.savez(tmp_path, coef=coef, intercept=intercept, threshold=np.float32(0.0))
+    fast_path = LinearFastPath(tmp_path, ml_service.vectorizer)
+    student_calib = fast_path.predict_proba(X_calib)
+    margins = np.array([fast_path.margin(p) for p in student_calib])
+    agree = student_calib.argmax(axis=1) == teacher_calib.argmax(axis=1)
+    threshold, coverage = calibrate_threshold(margins, agree, args.target_agreement)
+
+    np.savez(tmp_path, coef=coef, intercept=intercept, threshold=np.float32(threshold))
+    os.replace(tmp_path, args.output)
+    update_manifest(args.output, local=True)
+
+    # Relatório: latência de cada camada, uma linha por vez
+    sample = calib_texts[:200]
+    start = time.perf_counter()
+    for text in sample:
+        fast_path.predict_proba_text(text)
+    linear_ms = (time.perf_counter() - start) * 1000 / len(sample)
+    start = time.perf_counter()
+    for text in sample:
+        ml_service.backend.predict_proba([text])
+    full_ms = (time.perf_counter() - start) * 1000 / len(sample)
+
+    accepted = margins >= threshold
+    logger.info("=" * 70)
+    logger.info(f"Calibração em {len(calib_texts)} textos:")
+    logger.info(f"  concordância geral do linear: {agree.mean():.2%}")
+    logger.info(f"  margem mínima: {threshold:.4f}")
+    logger.info(f"  respondidos pelo linear: {coverage:.2%} "
+                f"(escalação: {1 - coverage:.2%})")
+    if accepted.any():
+        logger.info(f"  concordância nas respostas rápidas: {agree[accepted].mean():.2%}")
+    logger.info(f"  latência por texto: linear {linear_ms:.3f} ms, completo {full_ms:.3f} ms")
+    logger.info("=" * 70)
+    logger.info(f"✓ Modelo linear salvo em: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
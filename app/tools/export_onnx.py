@@ -0,0 +1,230 @@
+"""
+Exporta vetorizador + XGBoost para um único grafo ONNX
+
+EXPLICAÇÃO:
+Gera model/modelo_HealthIA.onnx, usado pelo backend "onnx"
+(settings.INFERENCE_BACKEND = "onnx").
+
+O grafo tem 3 partes:
+1. Tokenização + contagem de palavras (convertidas do TfidfVectorizer
+   pelo skl2onnx)
+2. Pesos IDF + normalização L2 em float64, e zeros → NaN
+3. Árvores do XGBoost (convertidas pelo onnxmltools)
+
+POR QUE FLOAT64 NO PASSO 2?
+O scikit-learn calcula o TF-IDF em float64 e o XGBoost converte para
+float32 no fim. Calculando direto em float32, alguns valores mudam na
+última casa e caem do outro lado do limiar de uma árvore, mudando a
+probabilidade final. Fazendo a mesma conta na mesma precisão, as
+features ficam idênticas.
+
+POR QUE ZEROS → NaN?
+O XGBoost recebe a matriz TF-IDF ESPARSA: palavras ausentes não são
+"valor 0", são "valor ausente" (missing), e cada nó da árvore tem um
+caminho padrão para valores ausentes. O grafo ONNX trabalha com matriz
+densa, então trocamos os zeros por NaN para reproduzir exatamente o
+mesmo caminho nas árvores.
+
+Antes de salvar, a ferramenta confere a paridade com o backend nativo
+em todos os exemplos do dataset e recusa salvar se divergir.
+
+COMO USAR:
+    pip install onnxruntime skl2onnx onnxmltools
+    python -m app.tools.export_onnx
+    python -m app.tools.export_onnx --output /tmp/modelo.onnx --tolerance 1e-4
+"""
+
+import argparse
+import copy
+import logging
+import os
+import sys
+
+import numpy as np
+
+from app.core.config import settings
+
+# A exportação parte sempre do modelo nativo
+settings.INFERENCE_BACKEND = "xgboost"
+
+from app.services.ml_service import ml_service  # noqa: E402
+from app.services.backends import OnnxBackend  # noqa: E402
+from app.services.artifacts import update_manifest  # noqa: E402
+from app.services.dataset import iter_dataset  # noqa: E402
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Mesma regra de tokens do TfidfVectorizer ((?u)\b\w\w+\b: 2+ caracteres
+# de palavra), escrita com classes Unicode do RE2, usado pelo onnxruntime.
+# O \w do RE2 só reconhece ASCII e quebraria palavras como "cansaço".
+TOKEN_EXPRESSION = r"[\pL\pN_][\pL\pN_]+"
+
+# Versões dos operadores ONNX (o conversor do XGBoost suporta até 15)
+TARGET_OPSET = 15
+ML_OPSET = 2
+
+
+def build_onnx_model(vectorizer, model):
+    """
+    Monta o grafo ONNX completo.
+
+    Args:
+        vectorizer: TfidfVectorizer treinado
+        model: XGBClassifier treinado
+
+    Returns:
+        onnx.ModelProto com entrada "input" (string n × 1) e saídas
+        "label" e "probabilities"
+    """
+    import onnx
+    from onnx import TensorProto, helper, numpy_helper
+    from onnx.compose import merge_models
+    from onnxmltools import convert_xgboost
+    from onnxmltools.convert.common.data_types import FloatTensorType
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import StringTensorType
+
+    n_features = len(vectorizer.vocabulary_)
+    opsets = {"": TARGET_OPSET, "ai.onnx.ml": ML_OPSET}
+
+    # PARTE 1: contagem de palavras
+    # O texto já chega em minúsculas (MLModelService._preprocess_symptoms),
+    # então desligamos o lowercase: o StringNormalizer do onnxruntime
+    # depende de locales do sistema que nem sempre existem.
+    # IDF e normalização ficam para a parte 2, em float64.
+    counter = copy.deepcopy(vectorizer)
+    counter.lowercase = False
+    counter.use_idf = False
+    counter.norm = None
+    counts = convert_sklearn(
+        counter,
+        "counts",
+        [("input", StringTensorType([None, 1]))],
+        target_opset=opsets,
+        options={id(counter): {"tokenexp": TOKEN_EXPRESSION}},
+    )
+    counts_output = counts.graph.output[0].name
+
+    # PARTE 2: TF-IDF em float64 + zeros → NaN
+    # (sem o vetor todo zerado dividir por zero: norma 0 vira 1, como no sklearn)
+    idf = np.asarray(vectorizer.idf_, dtype=np.float64).reshape(1, -1)
+    weighting = helper.make_model(
+        helper.make_graph(
+            [
+                helper.make_node("Cast", ["counts"], ["counts64"], to=TensorProto.DOUBLE),
+                helper.make_node("Mul", ["counts64", "idf"], ["weighted"]),
+                helper.make_node("Mul", ["weighted", "weighted"], ["squared"]),
+                helper.make_node("ReduceSum", ["squared", "axis"], ["sum_squares"], keepdims=1),
+                helper.make_node("Sqrt", ["sum_squares"], ["norm"]),
+                helper.make_node("Equal", ["norm", "zero64"], ["empty_row"]),
+                helper.make_node("Where", ["empty_row", "one64", "norm"], ["safe_norm"]),
+                helper.make_node("Div", ["weighted", "safe_norm"], ["tfidf64"]),
+                helper.make_node("Cast", ["tfidf64"], ["tfidf"], to=TensorProto.FLOAT),
+                helper.make_node("Equal", ["tfidf", "zero"], ["is_zero"]),
+                helper.make_node("Where", ["is_zero", "nan", "tfidf"], ["features"]),
+            ],
+            "tfidf",
+            [helper.make_tensor_value_info("counts", TensorProto.FLOAT, [None, n_features])],
+            [helper.make_tensor_value_info("features", TensorProto.FLOAT, [None, n_features])],
+            initializer=[
+                numpy_helper.from_array(idf, "idf"),
+                numpy_helper.from_array(np.array([1], dtype=np.int64), "axis"),
+                numpy_helper.from_array(np.array(0.0), "zero64"),
+                numpy_helper.from_array(np.array(1.0), "one64"),
+                numpy_helper.from_array(np.array(0.0, dtype=np.float32), "zero"),
+                numpy_helper.from_array(np.array(np.nan, dtype=np.float32), "nan"),
+            ],
+        ),
+        # O Tokenizer da parte 1 é um operador do domínio com.microsoft
+        opset_imports=[
+            helper.make_opsetid(domain, version)
+            for domain, version in {**opsets, "com.microsoft": 1}.items()
+        ],
+        ir_version=counts.ir_version,
+    )
+
+    # PARTE 3: árvores
+    trees = convert_xgboost(
+        model,
+        initial_types=[("features", FloatTensorType([None, n_features]))],
+        target_opset=TARGET_OPSET,
+    )
+
+    # merge_models exige as mesmas versões de opset nas três partes
+    for part in (counts, trees):
+        part.ir_version = weighting.ir_version
+        del part.opset_import[:]
+        part.opset_import.extend(weighting.opset_import)
+
+    combined = merge_models(counts, weighting, io_map=[(counts_output, "counts")])
+    combined = merge_models(combined, trees, io_map=[("features", "features")])
+    onnx.checker.check_model(combined)
+    return combined
+
+
+def check_parity(onnx_path: str, tolerance: float) -> float:
+    """
+    Compara o backend ONNX com o nativo em todo o dataset.
+
+    Args:
+        onnx_path: Arquivo .onnx a testar
+        tolerance: Maior diferença absoluta aceita em qualquer probabilidade
+
+    Returns:
+        A maior diferença encontrada
+
+    Raises:
+        ValueError: Se alguma probabilidade divergir além da tolerância
+            ou se o diagnóstico (top-1) mudar em algum exemplo
+    """
+    texts = [ml_service._preprocess_symptoms(text) for text, _ in iter_dataset()]
+
+    expected = ml_service.backend.predict_proba(texts)
+    actual = OnnxBackend(onnx_path).predict_proba(texts)
+
+    max_diff = float(np.abs(actual - expected).max())
+    top1_agreement = float(np.mean(actual.argmax(axis=1) == expected.argmax(axis=1)))
+    logger.info(
+        f"Paridade em {len(texts)} exemplos: diferença máxima {max_diff:.2e}, "
+        f"top-1 igual em {top1_agreement:.2%}"
+    )
+
+    if max_diff > tolerance or top1_agreement < 1.0:
+        raise ValueError(
+            f"ONNX diverge do modelo nativo (diferença {max_diff:.2e}, "
+            f"top-1 {top1_agreement:.2%}, tolerância {tolerance:.0e})"
+        )
+    return max_diff
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exporta o modelo HealthIA para ONNX")
+    parser.add_argument(
+        "--output",
+        default=os.path.join(settings.MODEL_PATH, settings.ONNX_FILE)
+    )
+    parser.add_argument("--tolerance", type=float, default=1e-5)
+    args = parser.parse_args()
+
+    onnx_model = build_onnx_model(ml_service.vectorizer, ml_service.model)
+
+    # Grava num arquivo temporário e só substitui o definitivo se passar na paridade
+    tmp_path = args.output + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(onnx_model.SerializeToString())
+
+    try:
+        check_parity(tmp_path, args.tolerance)
+    except ValueError as e:
+        os.remove(tmp_path)
+        logger.error(f"✗ {str(e)}")
+        sys.exit(1)
+
+    os.replace(tmp_path, args.output)
+    update_manifest(args.output, local=True)
+    logger.info(f"✓ Modelo ONNX salvo em: {args.output} ({os.path.getsize(args.output)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+"""
+Treino do modelo HealthIA
+
+EXPLICAÇÃO:
+Código offline que gera os 3 artefatos usados pela API
+(modelo XGBoost, vetorizador TF-IDF e encoder) a partir do
+dataset (data/dataset_HealthIA.jsonl.gz, lido por
+app/services/dataset.py). Não é importado pela API.
+
+COMO USAR:
+    python -m app.training.train
+"""
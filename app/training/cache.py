@@ -0,0 +1,197 @@
+"""
+Caches do treino - Divisões vetorizadas e matriz TF-IDF do dataset
+
+EXPLICAÇÃO:
+- FoldCache: divisões da validação cruzada já vetorizadas (treino completo).
+- VectorCache: a matriz TF-IDF de TODAS as linhas do dataset, junto com
+  a "impressão digital" (hash) de cada linha. O treino incremental usa
+  esse cache para vetorizar só as linhas novas.
+"""
+
+import hashlib
+import json
+import os
+from collections import Counter
+from typing import List, Optional, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.model_selection import StratifiedKFold
+
+# Parâmetros do vetorizador (os mesmos do vetorizador atual)
+VECTORIZER_PARAMS = {"lowercase": True, "ngram_range": (1, 1)}
+
+
+def dataset_fingerprint(texts: List[str], labels: List[str]) -> str:
+    """
+    Hash do conteúdo do dataset.
+
+    EXPLICAÇÃO:
+    Se uma linha mudar, o hash muda e o cache de divisões vetorizadas
+    deixa de valer automaticamente.
+    """
+    digest = hashlib.sha256()
+    for text, label in zip(texts, labels):
+        digest.update(text.encode("utf-8"))
+        digest.update(b"\t")
+        digest.update(label.encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+class FoldCache:
+    """
+    Divisões da validação cruzada já vetorizadas, guardadas em disco.
+
+    EXPLICAÇÃO:
+    Cada divisão vira um .npz com X_train, X_valid (esparsas),
+    y_train, y_valid. Os processos do pool recebem só o CAMINHO do
+    arquivo (barato de enviar) e carregam as matrizes sozinhos.
+    O nome da pasta inclui um hash do dataset, do número de divisões,
+    da semente e dos parâmetros do vetorizador.
+    """
+
+    def __init__(self, cache_dir: str, fingerprint: str, folds: int, seed: int):
+        key = json.dumps(
+            [fingerprint, folds, seed, sorted(VECTORIZER_PARAMS.items())],
+            default=str
+        )
+        self.path = os.path.join(
+            cache_dir, hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+        )
+        self.folds = folds
+        self.seed = seed
+
+    def fold_path(self, k: int) -> str:
+        return os.path.join(self.path, f"fold_{k}.npz")
+
+    def build(self, texts: List[str], y: np.ndarray) -> int:
+        """
+        Vetoriza as divisões que ainda não estão no cache.
+
+        Returns:
+            Quantas divisões foram vetorizadas agora (0 = tudo do cache)
+        """
+        os.makedirs(self.path, exist_ok=True)
+        splitter = StratifiedKFold(n_splits=self.folds, shuffle=True, random_state=self.seed)
+        texts = np.array(texts, dtype=object)
+        built = 0
+
+        for k, (train_idx, valid_idx) in enumerate(splitter.split(texts, y)):
+            if os.path.exists(self.fold_path(k)):
+                continue
+            vectorizer = TfidfVectorizer(**VECTORIZER_PARAMS)
+            X_train = vectorizer.fit_transform(texts[train_idx]).tocsr()
+            X_valid = vectorizer.transform(texts[valid_idx]).tocsr()
+            tmp_path = self.fold_path(k) + ".tmp.npz"
+            np.savez(
+                tmp_path,
+                train_data=X_train.data, train_indices=X_train.indices,
+                train_indptr=X_train.indptr, train_shape=X_train.shape,
+                valid_data=X_valid.data, valid_indices=X_valid.indices,
+                valid_indptr=X_valid.indptr, valid_shape=X_valid.shape,
+                y_train=y[train_idx], y_valid=y[valid_idx],
+            )
+            os.replace(tmp_path, self.fold_path(k))
+            built += 1
+        return built
+
+
+def load_fold(path: str) -> Tuple[sp.csr_matrix, sp.csr_matrix, np.ndarray, np.ndarray]:
+    """Lê uma divisão gravada por FoldCache.build()."""
+    data = np.load(path)
+    X_train = sp.csr_matrix(
+        (data["train_data"], data["train_indices"], data["train_indptr"]),
+        shape=tuple(data["train_shape"])
+    )
+    X_valid = sp.csr_matrix(
+        (data["valid_data"], data["valid_indices"], data["valid_indptr"]),
+        shape=tuple(data["valid_shape"])
+    )
+    return X_train, X_valid, data["y_train"], data["y_valid"]
+
+
+def row_fingerprints(texts: List[str], labels: List[str]) -> List[str]:
+    """
+    Hash de cada linha do dataset.
+
+    EXPLICAÇÃO:
+    O hash inclui quantas vezes a mesma linha já apareceu antes, para
+    que exemplos repetidos (o dataset tem alguns) continuem sendo
+    linhas diferentes.
+    """
+    seen: Counter = Counter()
+    fingerprints = []
+    for text, label in zip(texts, labels):
+        key = f"{text}\t{label}"
+        seen[key] += 1
+        fingerprints.append(
+            hashlib.sha256(f"{key}\t{seen[key]}".encode("utf-8")).hexdigest()
+        )
+    return fingerprints
+
+
+def vectorizer_fingerprint(vectorizer: TfidfVectorizer) -> str:
+    """Hash do vocabulário e dos pesos IDF de um vetorizador treinado."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps(sorted(vectorizer.vocabulary_.items())).encode("utf-8"))
+    digest.update(np.ascontiguousarray(vectorizer.idf_).tobytes())
+    return digest.hexdigest()
+
+
+class VectorCache:
+    """
+    Matriz TF-IDF do dataset inteiro, gravada em disco.
+
+    EXPLICAÇÃO:
+    O arquivo .npz guarda:
+    - a matriz esparsa (uma linha por exemplo)
+    - o rótulo (número do encoder) de cada linha
+    - o hash de cada linha (row_fingerprints)
+    - o hash do vetorizador que gerou a matriz
+
+    Se o vetorizador mudar, o cache não vale mais (load() devolve None).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self, vectorizer: TfidfVectorizer) -> Optional[Tuple[sp.csr_matrix, np.ndarray, List[str]]]:
+        """
+        Lê o cache, se ele existir e for do mesmo vetorizador.
+
+        Returns:
+            (matriz, rótulos, hashes das linhas) ou None
+        """
+        if not os.path.exists(self.path):
+            return None
+
+        data = np.load(self.path)
+        if str(data["vectorizer"]) != vectorizer_fingerprint(vectorizer):
+            return None
+
+        X = sp.csr_matrix(
+            (data["data"], data["indices"], data["indptr"]),
+            shape=tuple(data["shape"])
+        )
+        return X, data["y"], data["rows"].tolist()
+
+    def save(
+        self,
+        vectorizer: TfidfVectorizer,
+        X: sp.csr_matrix,
+        y: np.ndarray,
+        rows: List[str],
+    ):
+        """Grava o cache (num temporário + rename, para nunca ficar pela metade)."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        X = X.tocsr()
+        tmp_path = self.path + ".tmp.npz"
+        np.savez(
+            tmp_path,
+            data=X.data, indices=X.indices, indptr=X.indptr, shape=X.shape,
+            y=y, rows=np.array(rows),
+            vectorizer=vectorizer_fingerprint(vectorizer),
+        )
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,398 @@
+"""
+Deduplicação do dataset - Duplicatas exatas e quase-duplicatas
+
+EXPLICAÇÃO:
+O dataset tem exemplos repetidos (ex: "dor nas juntas inchaço articular
+rigidez ao acordar" aparece duas vezes para Artrite Reumatoide) e
+exemplos quase iguais, que só diferem por um final como "com tontura"
+ou "mal estar geral". Eles deixam o treino mais lento e enviesam a
+validação cruzada: a mesma frase cai no treino E no teste.
+
+PASSOS:
+1. NORMALIZAÇÃO: o mesmo tratamento da API (minúsculas, sem vírgulas,
+   espaços simples), para que "Febre, tosse" e "febre tosse" sejam iguais.
+2. DUPLICATAS EXATAS: um dicionário de (texto normalizado, doença) →
+   primeira ocorrência. O mesmo texto com doenças DIFERENTES não é
+   removido, só aparece no relatório como conflito.
+3. QUASE-DUPLICATAS (MinHash + LSH), só entre os textos únicos:
+   - cada texto vira um conjunto de palavras;
+   - MinHash: para cada função de hash h, o menor h(palavra) do conjunto.
+     A chance de dois textos terem o mesmo mínimo é a similaridade de
+     Jaccard entre os conjuntos (palavras em comum / palavras no total);
+   - LSH: as assinaturas são divididas em BANDAS de algumas linhas; textos
+     com uma banda inteira igual caem no mesmo "balde" e viram candidatos.
+     Assim não comparamos todos os pares (n²), só os candidatos;
+   - cada candidato é conferido com o Jaccard EXATO (matriz esparsa de
+     palavras), e os pares acima do limiar são agrupados (componentes
+     conexas). Pares de doenças diferentes também vão para o relatório.
+
+Tudo é feito com numpy/scipy em vetores: o custo cresce ~linearmente com
+o número de linhas (veja benchmarks/bench_dedupe.py, com 1 milhão).
+
+COMO USAR:
+    python -m app.training.dedupe                       # só o relatório
+    python -m app.training.dedupe --output build/dataset_dedup.jsonl.gz
+    python -m app.training.dedupe --output build/dataset_dedup.jsonl.gz --drop near
+    python -m app.training.train --dataset build/dataset_dedup.jsonl.gz
+"""
+
+import argparse
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components
+
+from app.services.dataset import load_dataset, write_dataset
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Primo de Mersenne 2^31 - 1: com a, x < 2^31, a·x + b cabe em uint64
+_PRIME = np.uint64((1 << 31) - 1)
+
+# Quantos exemplos de cada tipo vão para o relatório
+REPORT_EXAMPLES = 20
+
+# Pares candidatos conferidos por vez (limita a memória do Jaccard exato)
+VERIFY_CHUNK = 500_000
+
+
+def normalize(text: str) -> str:
+    """
+    Mesmo tratamento de MLModelService._preprocess_symptoms.
+
+    (Não importamos o ml_service aqui: ele carrega o modelo do disco.)
+    """
+    return " ".join(text.lower().replace(",", " ").split())
+
+
+def exact_duplicates(texts: List[str], labels: List[str]) -> Tuple[np.ndarray, Dict]:
+    """
+    Encontra duplicatas exatas de (texto normalizado, doença).
+
+    Args:
+        texts: Textos já normalizados
+        labels: Doença de cada texto
+
+    Returns:
+        (índice da primeira ocorrência de cada linha,
+         {texto: [doenças]} dos textos que aparecem com mais de uma doença)
+    """
+    first_seen: Dict[Tuple[str, str], int] = {}
+    labels_by_text: Dict[str, set] = {}
+    canonical = np.empty(len(texts), dtype=np.int64)
+
+    for i, (text, label) in enumerate(zip(texts, labels)):
+        canonical[i] = first_seen.setdefault((text, label), i)
+        labels_by_text.setdefault(text, set()).add(label)
+
+    conflicts = {
+        text: sorted(found) for text, found in labels_by_text.items() if len(found) > 1
+    }
+    return canonical, conflicts
+
+
+def token_matrix(texts: List[str]) -> sp.csr_matrix:
+    """
+    Matriz binária esparsa (texto × palavra): o conjunto de palavras de cada texto.
+    """
+    vocabulary: Dict[str, int] = {}
+    indptr = [0]
+    indices: List[int] = []
+    for text in texts:
+        ids = {vocabulary.setdefault(word, len(vocabulary)) for word in text.split()}
+        indices.extend(ids)
+        indptr.append(len(indices))
+
+    data = np.ones(len(indices), dtype=np.float32)
+    return sp.csr_matrix(
+        (data, np.asarray(indices, dtype=np.int64), np.asarray(indptr, dtype=np.int64)),
+        shape=(len(texts), max(1, len(vocabulary))),
+    )
+
+
+def band_keys(tokens: sp.csr_matrix, rows: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Chave de UMA banda do LSH para cada texto.
+
+    EXPLICAÇÃO:
+    Calcula `rows` assinaturas MinHash (uma por função de hash
+    h(x) = (a·x + b) mod p) e combina as `rows` numa chave de 64 bits.
+    Só uma banda fica na memória por vez: n × rows valores.
+
+    Args:
+        tokens: Matriz de token_matrix() (sem linhas vazias)
+        rows: Funções de hash por banda
+        rng: Gerador dos coeficientes a e b
+
+    Returns:
+        Vetor uint64 (n_textos)
+    """
+    ids = tokens.indices.astype(np.uint64)
+    starts = tokens.indptr[:-1]
+    key = np.zeros(tokens.shape[0], dtype=np.uint64)
+    for _ in range(rows):
+        a, b = rng.integers(1, int(_PRIME), size=2, dtype=np.uint64)
+        hashed = (a * ids + b) % _PRIME
+        signature = np.minimum.reduceat(hashed, starts)
+        # Mistura (multiplicação com overflow em 64 bits, como um FNV)
+        key = (key ^ signature) * np.uint64(0x100000001B3)
+    return key
+
+
+def candidate_pairs(keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pares de textos que caíram no mesmo balde.
+
+    EXPLICAÇÃO:
+    Ordena as chaves; cada sequência de chaves iguais é um balde. Em vez
+    de todos os pares do balde (que explodem em baldes grandes), cada
+    texto é ligado ao PRIMEIRO do balde e ao vizinho anterior. Como os
+    grupos finais são componentes conexas, isso basta para juntar os
+    textos parecidos; as outras bandas dão mais chances de ligação.
+
+    Returns:
+        (índices i, índices j) dos pares candidatos
+    """
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    same = sorted_keys[1:] == sorted_keys[:-1]  # posição p+1 no mesmo balde que p
+
+    positions = np.arange(len(keys))
+    bucket_start = np.where(np.concatenate([[True], ~same]), positions, 0)
+    bucket_start = np.maximum.accumulate(bucket_start)
+
+    members = positions[1:][same]
+    first = order[bucket_start[members]]
+    previous = order[members - 1]
+    current = order[members]
+    return np.concatenate([first, previous]), np.concatenate([current, current])
+
+
+def jaccard(tokens: sp.csr_matrix, i: np.ndarray, j: np.ndarray) -> np.ndarray:
+    """
+    Similaridade de Jaccard exata entre os conjuntos das linhas i[k] e j[k].
+
+    Os pares são conferidos em blocos de VERIFY_CHUNK para a memória não
+    crescer com o número de candidatos.
+    """
+    sizes = np.diff(tokens.indptr)
+    similarity = np.empty(len(i))
+    for start in range(0, len(i), VERIFY_CHUNK):
+        a, b = i[start:start + VERIFY_CHUNK], j[start:start + VERIFY_CHUNK]
+        common = np.asarray(tokens[a].multiply(tokens[b]).sum(axis=1)).ravel()
+        similarity[start:start + VERIFY_CHUNK] = common / (sizes[a] + sizes[b] - common)
+    return similarity
+
+
+def near_duplicates(
+    texts: List[str],
+    threshold: float,
+    bands: int,
+    rows: int,
+    seed: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Pares de textos com Jaccard ≥ threshold, via MinHash + LSH.
+
+    EXPLICAÇÃO:
+    Dois textos com Jaccard s viram candidatos com probabilidade
+    1 - (1 - s^rows)^bands. Com 16 bandas × 4 linhas: s = 0.8 → 99.9%,
+    s = 0.5 → 65%, s = 0.3 → 12%. Os candidatos são conferidos com o
+    Jaccard exato, então falsos positivos não passam.
+
+    Cada banda é conferida assim que é calculada, e só os pares ainda
+    não conferidos (o mesmo par costuma cair junto em várias bandas).
+    Na memória ficam só os códigos dos pares já vistos e os confirmados.
+
+    Returns:
+        (i, j, jaccard) dos pares confirmados, com i < j
+    """
+    n = len(texts)
+    tokens = token_matrix(texts)
+    # Textos sem palavras não participam (reduceat não aceita linhas vazias)
+    non_empty = np.flatnonzero(np.diff(tokens.indptr) > 0)
+    tokens_non_empty = tokens[non_empty]
+
+    rng = np.random.default_rng(seed)
+    checked = np.empty(0, dtype=np.int64)
+    found_codes, found_similarity = [], []
+    for _ in range(bands):
+        i, j = candidate_pairs(band_keys(tokens_non_empty, rows, rng))
+        i, j = non_empty[i], non_empty[j]
+        # Par (i, j) com i < j vira um código único i·n + j
+        codes = np.unique(np.minimum(i, j) * n + np.maximum(i, j))
+        codes = np.setdiff1d(codes, checked, assume_unique=True)
+        checked = np.union1d(checked, codes)
+
+        similarity = jaccard(tokens, codes // n, codes % n)
+        keep = similarity >= threshold
+        found_codes.append(codes[keep])
+        found_similarity.append(similarity[keep])
+
+    codes = np.concatenate(found_codes) if found_codes else np.empty(0, dtype=np.int64)
+    similarity = np.concatenate(found_similarity) if found_similarity else np.empty(0)
+    order = np.argsort(codes)
+    codes, similarity = codes[order], similarity[order]
+    return codes // n, codes % n, similarity
+
+
+def clusters(n: int, i: np.ndarray, j: np.ndarray) -> np.ndarray:
+    """
+    Agrupa os textos ligados pelos pares (componentes conexas).
+
+    Returns:
+        Número do grupo de cada texto
+    """
+    graph = sp.coo_matrix((np.ones(len(i), dtype=np.int8), (i, j)), shape=(n, n))
+    _, component = connected_components(graph, directed=False)
+    return component
+
+
+def deduplicate(
+    rows: List[Tuple[str, str]],
+    threshold: float = 0.8,
+    bands: int = 16,
+    band_rows: int = 4,
+    seed: int = 42,
+    drop_near: bool = False,
+) -> Tuple[np.ndarray, Dict]:
+    """
+    Roda as duas etapas e monta o relatório.
+
+    Args:
+        rows: (sintomas, doença) do dataset
+        threshold: Jaccard mínimo para quase-duplicatas
+        bands: Bandas do LSH
+        band_rows: Funções de hash por banda
+        seed: Semente dos hashes
+        drop_near: Remover também as quase-duplicatas (mesma doença),
+                   mantendo o primeiro exemplo de cada grupo
+
+    Returns:
+        (máscara das linhas mantidas, relatório)
+    """
+    timings = {}
+    raw_labels = [label for _, label in rows]
+
+    start = time.perf_counter()
+    texts = [normalize(text) for text, _ in rows]
+    timings["normalize"] = time.perf_counter() - start
+
+    # PASSO 2: duplicatas exatas
+    start = time.perf_counter()
+    canonical, conflicts = exact_duplicates(texts, raw_labels)
+    keep = canonical == np.arange(len(rows))
+    unique_rows = np.flatnonzero(keep)
+    timings["exact"] = time.perf_counter() - start
+
+    # PASSO 3: quase-duplicatas entre os textos únicos
+    start = time.perf_counter()
+    unique_texts = [texts[k] for k in unique_rows]
+    i, j, similarity = near_duplicates(unique_texts, threshold, bands, band_rows, seed)
+    i, j = unique_rows[i], unique_rows[j]
+    labels = np.array(raw_labels, dtype=object)
+    same_label = labels[i] == labels[j]
+    timings["near"] = time.perf_counter() - start
+
+    # Grupos de quase-duplicatas da mesma doença; fica o primeiro de cada grupo
+    start = time.perf_counter()
+    component = clusters(len(rows), i[same_label], j[same_label])
+    first_in_group = np.full(component.max() + 1 if len(rows) else 0, len(rows))
+    np.minimum.at(first_in_group, component[unique_rows], unique_rows)
+    near_removed = keep & (first_in_group[component] != np.arange(len(rows)))
+    if drop_near:
+        keep &= ~near_removed
+    timings["cluster"] = time.perf_counter() - start
+
+    def example(a: int, b: int, score: float) -> Dict:
+        return {
+            "row": int(a), "text": rows[a][0], "label": rows[a][1],
+            "similar_row": int(b), "similar_text": rows[b][0], "similar_label": rows[b][1],
+            "jaccard": round(float(score), 3),
+        }
+
+    exact_rows = np.flatnonzero(canonical != np.arange(len(rows)))
+    cross = np.flatnonzero(~same_label)
+    report = {
+        "rows": len(rows),
+        "exact_duplicates": int(len(exact_rows)),
+        "exact_label_conflicts": len(conflicts),
+        "near_duplicate_pairs": int(same_label.sum()),
+        "near_duplicate_rows": int(near_removed.sum()),
+        "near_cross_label_pairs": int(len(cross)),
+        "kept": int(keep.sum()),
+        "drop_near": drop_near,
+        "params": {"threshold": threshold, "bands": bands, "band_rows": band_rows, "seed": seed},
+        "examples": {
+            "exact": [
+                {"text": rows[k][0], "label": rows[k][1], "first_row": int(canonical[k]), "row": int(k)}
+                for k in exact_rows[:REPORT_EXAMPLES]
+            ],
+            "exact_label_conflicts": [
+                {"text": text, "labels": found}
+                for text, found in list(conflicts.items())[:REPORT_EXAMPLES]
+            ],
+            "near": [
+                example(a, b, s) for a, b, s in
+                list(zip(i[same_label], j[same_label], similarity[same_label]))[:REPORT_EXAMPLES]
+            ],
+            "near_cross_label": [
+                example(i[k], j[k], similarity[k]) for k in cross[:REPORT_EXAMPLES]
+            ],
+        },
+        "timings_seconds": {name: round(value, 3) for name, value in timings.items()},
+    }
+    return keep, report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Encontra duplicatas no dataset do HealthIA")
+    parser.add_argument("--dataset", default=None,
+                        help="Arquivo .jsonl.gz do dataset (padrão: settings.DATASET_FILE)")
+    parser.add_argument("--report", default="build/dedupe/report.json")
+    parser.add_argument("--output", default=None,
+                        help="Grava o dataset sem duplicatas neste arquivo")
+    parser.add_argument("--drop", choices=["exact", "near"], default="exact",
+                        help="exact: só duplicatas exatas; near: também quase-duplicatas")
+    parser.add_argument("--threshold", type=float, default=0.8,
+                        help="Jaccard mínimo entre as palavras para quase-duplicata")
+    parser.add_argument("--bands", type=int, default=16)
+    parser.add_argument("--band-rows", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rows = load_dataset(args.dataset)
+    keep, report = deduplicate(
+        rows, args.threshold, args.bands, args.band_rows, args.seed, args.drop == "near"
+    )
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.report)), exist_ok=True)
+    with open(args.report, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    logger.info("=" * 70)
+    logger.info(f"Linhas: {report['rows']}")
+    logger.info(f"  duplicatas exatas: {report['exact_duplicates']} "
+                f"(textos com mais de uma doença: {report['exact_label_conflicts']})")
+    logger.info(f"  quase-duplicatas (Jaccard ≥ {args.threshold}): "
+                f"{report['near_duplicate_rows']} linhas em {report['near_duplicate_pairs']} pares "
+                f"(+ {report['near_cross_label_pairs']} pares com doenças diferentes)")
+    logger.info(f"  mantidas: {report['kept']} (--drop {args.drop})")
+    logger.info(f"  tempos: {report['timings_seconds']}")
+    logger.info("=" * 70)
+    logger.info(f"✓ Relatório salvo em: {args.report}")
+
+    if args.output:
+        written = write_dataset((row for row, k in zip(rows, keep) if k), args.output)
+        logger.info(f"✓ Dataset sem duplicatas ({written} linhas) salvo em: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
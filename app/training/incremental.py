@@ -0,0 +1,206 @@
+"""
+Treino incremental - Só vetoriza as linhas novas e continua o modelo
+
+EXPLICAÇÃO:
+Quando alguns exemplos são ACRESCENTADOS ao dataset, refazer tudo
+(vetorizar o dataset inteiro, validação cruzada, busca e treino do
+zero) é desperdício. O modo incremental:
+
+1. Calcula o hash de cada linha do dataset e compara com os hashes
+   guardados no VectorCache (gravado pelo último treino).
+2. Se só há linhas NOVAS, com palavras que o vetorizador já conhece e
+   doenças que o encoder já conhece, vetoriza apenas essas linhas
+   (vocabulário congelado) e junta com a matriz do cache.
+3. Continua o treino do modelo existente ("warm start"): adiciona
+   --extra-rounds rodadas de boosting sobre o dataset completo.
+
+Quando isso NÃO é possível, volta para o treino completo:
+- não há artefatos ou cache anteriores (ou o cache é de outro vetorizador)
+- alguma linha foi removida ou alterada (o modelo não "desaprende")
+- as linhas novas trazem palavras fora do vocabulário
+- as linhas novas trazem uma doença nova
+
+OBSERVAÇÃO:
+Com o vocabulário congelado, os pesos IDF também ficam congelados:
+as linhas novas não mudam a importância das palavras. De tempos em
+tempos vale rodar um treino completo.
+"""
+
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+import joblib
+import numpy as np
+import scipy.sparse as sp
+import xgboost as xgb
+
+from app.core.config import settings
+from app.training.cache import VectorCache, dataset_fingerprint, row_fingerprints
+from app.training.train import save_artifacts, save_report
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Parâmetros de treino copiados do modelo existente para as rodadas extras
+TRAIN_PARAMS = {
+    "learning_rate": float,
+    "max_depth": int,
+    "min_child_weight": float,
+    "subsample": float,
+    "colsample_bytree": float,
+    "reg_lambda": float,
+    "reg_alpha": float,
+    "gamma": float,
+}
+
+
+def load_base(output_dir: str) -> Optional[Tuple]:
+    """
+    Carrega os artefatos do último treino.
+
+    Returns:
+        (vetorizador, encoder, modelo) ou None se algum não existir
+    """
+    paths = [
+        os.path.join(output_dir, name)
+        for name in (settings.VECTORIZER_FILE, settings.ENCODER_FILE, settings.MODEL_FILE)
+    ]
+    if not all(os.path.exists(path) for path in paths):
+        return None
+
+    model = xgb.XGBClassifier()
+    model.load_model(paths[2])
+    return joblib.load(paths[0]), joblib.load(paths[1]), model
+
+
+def training_params(model: xgb.XGBClassifier) -> Dict:
+    """
+    Hiperparâmetros com que o modelo foi treinado.
+
+    EXPLICAÇÃO:
+    O XGBClassifier carregado de um .json não recupera os parâmetros do
+    scikit-learn (vêm como None), mas a configuração do booster guarda
+    os valores usados no treino.
+    """
+    config = json.loads(model.get_booster().save_config())
+    tree_params = config["learner"]["gradient_booster"]["tree_train_param"]
+    # No JSON do XGBoost, gamma se chama min_split_loss
+    tree_params.setdefault("gamma", tree_params.get("min_split_loss", "0"))
+    return {
+        name: cast(tree_params[name])
+        for name, cast in TRAIN_PARAMS.items()
+        if name in tree_params
+    }
+
+
+def run_incremental(args, texts: List[str], labels: List[str]) -> bool:
+    """
+    Tenta o treino incremental.
+
+    Args:
+        args: Argumentos da linha de comando (veja train.main)
+        texts: Sintomas de todas as linhas do dataset
+        labels: Doença de cada linha
+
+    Returns:
+        True se o treino incremental foi feito (ou não havia nada novo);
+        False se é preciso um treino completo
+    """
+    timings = {}
+    total_start = time.perf_counter()
+
+    base = load_base(args.output_dir)
+    if base is None:
+        logger.info(f"Sem artefatos anteriores em {args.output_dir}: treino completo.")
+        return False
+    vectorizer, encoder, model = base
+
+    cached = VectorCache(args.vector_cache).load(vectorizer)
+    if cached is None:
+        logger.info("Cache de vetores ausente ou de outro vetorizador: treino completo.")
+        return False
+    X_cached, y_cached, rows_cached = cached
+
+    # PASSO 1: quais linhas são novas?
+    start = time.perf_counter()
+    rows = row_fingerprints(texts, labels)
+    known = set(rows_cached)
+    removed = known - set(rows)
+    new_indices = [i for i, row in enumerate(rows) if row not in known]
+    timings["fingerprint"] = time.perf_counter() - start
+
+    if removed:
+        logger.info(f"{len(removed)} exemplos removidos ou alterados: treino completo.")
+        return False
+    if not new_indices:
+        logger.info("✓ Nenhum exemplo novo; artefatos mantidos.")
+        return True
+
+    new_texts = [texts[i] for i in new_indices]
+    new_labels = [labels[i] for i in new_indices]
+
+    unknown_labels = sorted(set(new_labels) - set(encoder.classes_))
+    if unknown_labels:
+        logger.info(f"Doenças novas {unknown_labels}: treino completo.")
+        return False
+
+    analyzer = vectorizer.build_analyzer()
+    oov = sorted({
+        term for text in new_texts for term in analyzer(text)
+        if term not in vectorizer.vocabulary_
+    })
+    if oov:
+        logger.info(f"Palavras fora do vocabulário {oov[:10]}: treino completo.")
+        return False
+
+    # PASSO 2: vetorizar só as linhas novas
+    start = time.perf_counter()
+    X = sp.vstack([X_cached, vectorizer.transform(new_texts)]).tocsr()
+    y = np.concatenate([y_cached, encoder.transform(new_labels)])
+    timings["vectorize_new"] = time.perf_counter() - start
+    logger.info(f"✓ {len(new_indices)} exemplos novos vetorizados "
+                f"({X_cached.shape[0]} vieram do cache)")
+
+    # PASSO 3: rodadas extras a partir do modelo existente
+    params = training_params(model)
+    rounds_before = model.get_booster().num_boosted_rounds()
+    start = time.perf_counter()
+    updated = xgb.XGBClassifier(
+        objective="multi:softprob",
+        num_class=len(encoder.classes_),
+        n_estimators=args.extra_rounds,
+        n_jobs=args.workers,
+        random_state=args.seed,
+        **params
+    )
+    updated.fit(X, y, xgb_model=model.get_booster())
+    timings["warm_start_fit"] = time.perf_counter() - start
+    rounds_after = updated.get_booster().num_boosted_rounds()
+    logger.info(f"✓ Modelo continuado: {rounds_before} → {rounds_after} rodadas "
+                f"em {timings['warm_start_fit']:.2f}s")
+
+    save_artifacts(args.output_dir, vectorizer, encoder, updated)
+    VectorCache(args.vector_cache).save(
+        vectorizer, X, y, rows_cached + [rows[i] for i in new_indices]
+    )
+    timings["total"] = time.perf_counter() - total_start
+
+    save_report(args.output_dir, {
+        "mode": "incremental",
+        "dataset": {
+            "samples": len(texts),
+            "classes": len(encoder.classes_),
+            "fingerprint": dataset_fingerprint(texts, labels),
+        },
+        "new_samples": len(new_indices),
+        "cached_samples": int(X_cached.shape[0]),
+        "params": params,
+        "rounds": {"before": rounds_before, "after": rounds_after},
+        "timings_seconds": {name: round(value, 3) for name, value in timings.items()},
+    })
+    logger.info(f"✓ Artefatos e relatório salvos em: {args.output_dir} "
+                f"(total {timings['total']:.2f}s)")
+    return True
@@ -0,0 +1,309 @@
+"""
+Pipeline de treino - Gera modelo, vetorizador e encoder do zero
+
+EXPLICAÇÃO:
+Reconstrói os 3 artefatos da pasta model/ a partir do dataset
+(data/dataset_HealthIA.jsonl.gz, veja app/services/dataset.py):
+- modelo_HealthIA.json      (XGBoost)
+- vetorizador_HealthIA.pkl  (TF-IDF)
+- encoder_HealthIA.pkl      (LabelEncoder: número ↔ nome da doença)
+
+PASSOS:
+1. Divide o dataset em K partes (validação cruzada estratificada).
+2. Vetoriza cada divisão (TF-IDF treinado só na parte de treino, para
+   a validação não "ver" as palavras do próprio teste) e guarda as
+   matrizes num cache em disco. Rodar de novo com o mesmo dataset
+   reaproveita o cache.
+3. Busca de hiperparâmetros: cada combinação × cada divisão é uma
+   tarefa independente, executada num pool de PROCESSOS (um XGBoost
+   com 1 thread por processo). Com N núcleos, ~N tarefas rodam juntas.
+4. Treina o modelo final com a melhor combinação em todo o dataset.
+5. Grava os artefatos e um relatório (report.json) com as métricas
+   de cada combinação e os tempos de cada passo.
+
+MODO INCREMENTAL (--incremental):
+Quando só foram ACRESCENTADOS exemplos ao dataset, vetoriza apenas as
+linhas novas (com o vocabulário congelado) e continua o treino do
+modelo existente com algumas rodadas extras. Veja incremental.py.
+
+Por padrão os artefatos vão para build/model/ e NÃO substituem os da
+pasta model/ (copie-os depois de conferir o relatório).
+
+COMO USAR:
+    python -m app.training.train
+    python -m app.training.train --workers 8 --folds 5
+    python -m app.training.train --grid '{"max_depth": [4, 6], "n_estimators": [100, 150]}'
+    python -m app.training.train --incremental --extra-rounds 20
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+import joblib
+import numpy as np
+import xgboost as xgb
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics import accuracy_score, log_loss
+from sklearn.preprocessing import LabelEncoder
+
+from app.core.config import _available_cores, settings
+from app.services.dataset import load_dataset
+from app.training.cache import (
+    VECTORIZER_PARAMS,
+    FoldCache,
+    VectorCache,
+    dataset_fingerprint,
+    load_fold,
+    row_fingerprints,
+)
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Grade padrão de hiperparâmetros. Inclui a configuração do modelo
+# atual (150 árvores por doença, learning_rate 0.3, profundidade 6).
+DEFAULT_GRID = {
+    "n_estimators": [100, 150],
+    "learning_rate": [0.1, 0.3],
+    "max_depth": [3, 6],
+}
+
+
+def evaluate(task: Tuple[Dict, str, int, int]) -> Dict:
+    """
+    Treina e avalia UMA combinação de hiperparâmetros em UMA divisão.
+
+    EXPLICAÇÃO:
+    Roda dentro de um processo do pool. O XGBoost usa 1 thread:
+    o paralelismo vem de vários processos rodando ao mesmo tempo.
+
+    Args:
+        task: (parâmetros, caminho da divisão, nº de classes, semente)
+
+    Returns:
+        Dict com parâmetros, acurácia, log loss e tempo de treino
+    """
+    params, fold_path, num_class, seed = task
+    X_train, X_valid, y_train, y_valid = load_fold(fold_path)
+
+    start = time.perf_counter()
+    model = xgb.XGBClassifier(
+        objective="multi:softprob",
+        num_class=num_class,
+        n_jobs=1,
+        random_state=seed,
+        **params
+    )
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+
+    proba = model.predict_proba(X_valid)
+    return {
+        "params": params,
+        "accuracy": float(accuracy_score(y_valid, proba.argmax(axis=1))),
+        "log_loss": float(log_loss(y_valid, proba, labels=np.arange(num_class))),
+        "fit_seconds": fit_seconds,
+    }
+
+
+def expand_grid(grid: Dict[str, List]) -> List[Dict]:
+    """{"a": [1, 2], "b": [3]} → [{"a": 1, "b": 3}, {"a": 2, "b": 3}]"""
+    names = sorted(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+
+
+def search(
+    cache: FoldCache,
+    grid: List[Dict],
+    num_class: int,
+    workers: int,
+) -> List[Dict]:
+    """
+    Avalia todas as combinações em todas as divisões no pool de processos.
+
+    Returns:
+        Uma entrada por combinação, com média/desvio das métricas,
+        ordenadas da melhor para a pior (menor log loss)
+    """
+    tasks = [
+        (params, cache.fold_path(k), num_class, cache.seed)
+        for params in grid
+        for k in range(cache.folds)
+    ]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(evaluate, tasks))
+
+    summary = []
+    for i, params in enumerate(grid):
+        runs = results[i * cache.folds:(i + 1) * cache.folds]
+        accuracy = np.array([r["accuracy"] for r in runs])
+        loss = np.array([r["log_loss"] for r in runs])
+        summary.append({
+            "params": params,
+            "accuracy_mean": round(float(accuracy.mean()), 4),
+            "accuracy_std": round(float(accuracy.std()), 4),
+            "log_loss_mean": round(float(loss.mean()), 4),
+            "log_loss_std": round(float(loss.std()), 4),
+            "fit_seconds_total": round(sum(r["fit_seconds"] for r in runs), 3),
+        })
+    return sorted(summary, key=lambda entry: entry["log_loss_mean"])
+
+
+def train_final(
+    texts: List[str],
+    labels: List[str],
+    params: Dict,
+    threads: int,
+    seed: int,
+):
+    """
+    Treina os 3 artefatos finais com todo o dataset.
+
+    Returns:
+        (vetorizador, encoder, modelo, matriz TF-IDF do dataset)
+    """
+    encoder = LabelEncoder()
+    y = encoder.fit_transform(labels)
+
+    vectorizer = TfidfVectorizer(**VECTORIZER_PARAMS)
+    X = vectorizer.fit_transform(texts)
+
+    model = xgb.XGBClassifier(
+        objective="multi:softprob",
+        num_class=len(encoder.classes_),
+        n_jobs=threads,
+        random_state=seed,
+        **params
+    )
+    model.fit(X, y)
+    return vectorizer, encoder, model, X
+
+
+def save_artifacts(output_dir: str, vectorizer, encoder, model):
+    """Grava os artefatos com os mesmos nomes de arquivo usados pela API."""
+    os.makedirs(output_dir, exist_ok=True)
+    model.save_model(os.path.join(output_dir, settings.MODEL_FILE))
+    joblib.dump(vectorizer, os.path.join(output_dir, settings.VECTORIZER_FILE))
+    joblib.dump(encoder, os.path.join(output_dir, settings.ENCODER_FILE))
+
+
+def save_report(output_dir: str, report: Dict):
+    """Grava o relatório do treino (report.json) junto dos artefatos."""
+    with open(os.path.join(output_dir, "report.json"), "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+def run_full(args, texts: List[str], labels: List[str]):
+    """
+    Treino completo: validação cruzada, busca, modelo final e artefatos.
+
+    EXPLICAÇÃO:
+    No fim também grava o VectorCache (matriz TF-IDF de todas as
+    linhas), que é o ponto de partida do treino incremental.
+    """
+    timings = {}
+    total_start = time.perf_counter()
+
+    classes = sorted(set(labels))
+    y = np.searchsorted(classes, labels)
+    fingerprint = dataset_fingerprint(texts, labels)
+    logger.info(f"Dataset: {len(texts)} exemplos, {len(classes)} doenças ({fingerprint[:12]})")
+
+    # PASSOS 1 e 2: divisões vetorizadas (cache)
+    start = time.perf_counter()
+    cache = FoldCache(args.cache_dir, fingerprint, args.folds, args.seed)
+    built = cache.build(texts, y)
+    timings["vectorize_folds"] = time.perf_counter() - start
+    logger.info(f"✓ {args.folds} divisões prontas ({built} vetorizadas agora, "
+                f"{args.folds - built} do cache) em {timings['vectorize_folds']:.2f}s")
+
+    # PASSO 3: busca de hiperparâmetros
+    grid = expand_grid(args.grid)
+    start = time.perf_counter()
+    summary = search(cache, grid, len(classes), args.workers)
+    timings["search"] = time.perf_counter() - start
+    task_seconds = sum(entry["fit_seconds_total"] for entry in summary)
+    logger.info(
+        f"✓ Busca: {len(grid)} combinações × {args.folds} divisões em "
+        f"{timings['search']:.2f}s com {args.workers} processos "
+        f"(soma dos treinos: {task_seconds:.2f}s, "
+        f"paralelismo efetivo: {task_seconds / timings['search']:.2f}x)"
+    )
+    for entry in summary:
+        logger.info(
+            f"  {entry['params']}: acurácia {entry['accuracy_mean']:.3f} "
+            f"± {entry['accuracy_std']:.3f}, log loss {entry['log_loss_mean']:.3f}"
+        )
+
+    # PASSO 4: modelo final
+    best = summary[0]["params"]
+    start = time.perf_counter()
+    vectorizer, encoder, model, X = train_final(texts, labels, best, args.workers, args.seed)
+    timings["final_fit"] = time.perf_counter() - start
+    logger.info(f"✓ Modelo final {best} treinado em {timings['final_fit']:.2f}s")
+
+    # PASSO 5: artefatos, cache de vetores e relatório
+    save_artifacts(args.output_dir, vectorizer, encoder, model)
+    VectorCache(args.vector_cache).save(
+        vectorizer, X, encoder.transform(labels), row_fingerprints(texts, labels)
+    )
+    timings["total"] = time.perf_counter() - total_start
+
+    save_report(args.output_dir, {
+        "mode": "full",
+        "dataset": {
+            "samples": len(texts),
+            "classes": len(classes),
+            "fingerprint": fingerprint,
+        },
+        "folds": args.folds,
+        "seed": args.seed,
+        "workers": args.workers,
+        "best_params": best,
+        "search": summary,
+        "timings_seconds": {name: round(value, 3) for name, value in timings.items()},
+        "search_task_seconds": round(task_seconds, 3),
+    })
+    logger.info(f"✓ Artefatos e relatório salvos em: {args.output_dir} "
+                f"(total {timings['total']:.2f}s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Treina o modelo HealthIA")
+    parser.add_argument("--dataset", default=None,
+                        help="Arquivo .jsonl.gz do dataset (padrão: settings.DATASET_FILE)")
+    parser.add_argument("--output-dir", default="build/model")
+    parser.add_argument("--cache-dir", default="build/cache/folds")
+    parser.add_argument("--vector-cache", default="build/cache/vectors.npz")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=_available_cores())
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--grid", type=json.loads, default=DEFAULT_GRID,
+                        help="Grade em JSON (padrão: DEFAULT_GRID)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Aproveita os artefatos de --output-dir e treina só rodadas extras")
+    parser.add_argument("--extra-rounds", type=int, default=20,
+                        help="Rodadas de boosting adicionadas no modo incremental")
+    args = parser.parse_args()
+
+    rows = load_dataset(args.dataset)
+    texts = [text for text, _ in rows]
+    labels = [label for _, label in rows]
+
+    if args.incremental:
+        from app.training.incremental import run_incremental
+        if run_incremental(args, texts, labels):
+            return
+
+    run_full(args, texts, labels)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""
+Benchmarks de desempenho do HealthIA
+
+EXPLICAÇÃO:
+Scripts para medir vazão e latência. Não fazem parte da API.
+Execute cada um com: python -m benchmarks.<nome_do_script>
+"""
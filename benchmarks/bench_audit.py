@@ -0,0 +1,92 @@
+"""
+Benchmark da auditoria - Custo por requisição e vazão das gravações em lote
+
+EXPLICAÇÃO:
+Mede as duas coisas que importam no AuditSink (app/services/audit.py):
+
+1. Custo no caminho da requisição: quanto tempo offer() leva para pôr
+   um registro no buffer (é o que o /predict paga).
+2. Vazão da gravação: registros/s que a thread de fundo grava no SQLite,
+   para cada tamanho de lote. Lote 1 = um commit por registro, que é o
+   custo de gravar de forma síncrona dentro da requisição.
+
+Os registros são gerados a partir de uma predição real, com textos
+variados. O banco é criado num diretório temporário.
+
+COMO USAR:
+    python -m benchmarks.bench_audit
+    python -m benchmarks.bench_audit --records 200000 --batch-sizes 100 1000
+"""
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+from app.services.audit import AuditSink, audit_record
+
+RESULT = {
+    "diagnosis": "Febre Maculosa",
+    "confidence": 88.47,
+    "symptoms_processed": ["febre", "alta", "dor", "no", "corpo"],
+    "all_probabilities": [
+        {"disease": "Febre Maculosa", "probability": 88.47},
+        {"disease": "Doença de Lyme", "probability": 3.1},
+        {"disease": "Dengue", "probability": 1.2},
+    ],
+}
+
+
+def run(records: int, batch_size: int, directory: str) -> dict:
+    """Grava `records` registros com um AuditSink e mede o tempo."""
+    path = os.path.join(directory, f"audit_batch{batch_size}.db")
+    sink = AuditSink(path, capacity=records, batch_size=batch_size, flush_interval=0.05)
+    rows = [
+        audit_record(f"febre alta dor no corpo caso {i}", RESULT, "bench", 1.5)
+        for i in range(records)
+    ]
+
+    sink.start()
+    start = time.perf_counter()
+    for row in rows:
+        sink.offer(row)
+    offer_seconds = time.perf_counter() - start
+    sink.stop(timeout=600)
+    total_seconds = time.perf_counter() - start
+
+    with sqlite3.connect(path) as connection:
+        stored = connection.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+
+    stats = sink.stats()
+    return {
+        "batch_size": batch_size,
+        "stored": stored,
+        "offer_us": offer_seconds / records * 1e6,
+        "flush_per_second": stats["flush_records_per_second"],
+        "end_to_end_per_second": records / total_seconds,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do registro de auditoria")
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 50, 500, 2000])
+    parser.add_argument("--sync-records", type=int, default=2000,
+                        help="Registros gravados com lote 1 (um commit cada, lento)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        print("=" * 70)
+        print(f"{'lote':>6} {'registros':>10} {'offer (µs)':>11} {'flush (reg/s)':>14} {'total (reg/s)':>14}")
+        for batch_size in args.batch_sizes:
+            records = args.sync_records if batch_size == 1 else args.records
+            result = run(records, batch_size, directory)
+            assert result["stored"] == records
+            print(f"{batch_size:>6} {records:>10} {result['offer_us']:>11.2f} "
+                  f"{result['flush_per_second']:>14,.0f} {result['end_to_end_per_second']:>14,.0f}")
+        print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
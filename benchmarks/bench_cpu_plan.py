@@ -0,0 +1,124 @@
+"""
+Benchmark do plano de CPU - Vazão por configuração de threads
+
+EXPLICAÇÃO:
+Compara a vazão (predições/s) e a latência (p50/p99) do modelo para
+diferentes divisões de núcleos entre:
+- workers (processos)
+- threads do executor de inferência (por worker)
+- threads OpenMP do XGBoost (por predição)
+
+A primeira configuração testada é sempre a do settings.cpu_plan().
+
+COMO USAR:
+    python -m benchmarks.bench_cpu_plan
+    python -m benchmarks.bench_cpu_plan --seconds 5 --configs 1x4x1,4x1x1,4x4x4
+
+Cada configuração é escrita como WORKERSxTHREADSxBOOSTER.
+"""
+
+import argparse
+import multiprocessing as mp
+import threading
+import time
+from typing import List, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.ml_service import ml_service
+
+SYMPTOMS = [
+    "febre alta dor no corpo cansaço extremo",
+    "sede constante urinar muito emagrecimento rápido",
+    "tremores nas mãos rigidez muscular movimentos lentos",
+    "dor nas juntas inchaço articular rigidez ao acordar",
+]
+
+
+def _worker(threads: int, booster_threads: int, seconds: float, results):
+    """Processo worker: roda `threads` threads chamando o modelo até o prazo."""
+    ml_service.model.set_params(n_jobs=booster_threads)
+    deadline = time.perf_counter() + seconds
+    latencies: List[float] = []
+    lock = threading.Lock()
+
+    def loop(offset: int):
+        local = []
+        i = offset
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            ml_service.self_test(SYMPTOMS[i % len(SYMPTOMS)])
+            local.append(time.perf_counter() - start)
+            i += 1
+        with lock:
+            latencies.extend(local)
+
+    pool = [threading.Thread(target=loop, args=(t,)) for t in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    results.put(latencies)
+
+
+def run_config(workers: int, threads: int, booster_threads: int, seconds: float) -> Tuple[float, float, float]:
+    """
+    Mede uma configuração.
+
+    Returns:
+        (predições por segundo, latência p50 em ms, latência p99 em ms)
+    """
+    ctx = mp.get_context("fork")
+    results = ctx.Queue()
+    procs = [
+        ctx.Process(target=_worker, args=(threads, booster_threads, seconds, results))
+        for _ in range(workers)
+    ]
+    for proc in procs:
+        proc.start()
+    latencies = []
+    for _ in procs:
+        latencies.extend(results.get())
+    for proc in procs:
+        proc.join()
+
+    latencies_ms = np.array(latencies) * 1000
+    return (
+        len(latencies) / seconds,
+        float(np.percentile(latencies_ms, 50)),
+        float(np.percentile(latencies_ms, 99)),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de vazão por plano de CPU")
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument(
+        "--configs",
+        default="",
+        help="Lista WORKERSxTHREADSxBOOSTER separada por vírgula"
+    )
+    args = parser.parse_args()
+
+    plan = settings.cpu_plan()
+    cores = plan["cores"]
+    configs = [(plan["web_workers"], plan["inference_threads"], plan["booster_threads"])]
+    if args.configs:
+        configs += [tuple(int(x) for x in c.split("x")) for c in args.configs.split(",")]
+    else:
+        # Alternativas comuns: tudo no booster, e o padrão sem plano
+        # (threads do executor fixas em 4, XGBoost usando todos os núcleos)
+        configs += [(1, 1, cores), (plan["web_workers"], 4, cores)]
+
+    print(f"Plano de CPU: {plan}")
+    print(f"{'config (WxTxB)':>16} {'oversub':>8} {'pred/s':>10} {'p50 ms':>8} {'p99 ms':>8}")
+    for workers, threads, booster_threads in configs:
+        throughput, p50, p99 = run_config(workers, threads, booster_threads, args.seconds)
+        oversub = workers * threads * booster_threads / cores
+        label = f"{workers}x{threads}x{booster_threads}"
+        print(f"{label:>16} {oversub:>8.2f} {throughput:>10.1f} {p50:>8.2f} {p99:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark da deduplicação - Tempo de cada etapa com milhões de linhas
+
+EXPLICAÇÃO:
+Gera um dataset sintético a partir do dataset real: cada linha é um
+exemplo sorteado com algumas palavras removidas, palavras de outros
+exemplos acrescentadas e às vezes um final como "com tontura". Assim há
+duplicatas exatas, quase-duplicatas e textos diferentes, como num
+dataset grande de verdade. Depois roda app.training.dedupe.deduplicate
+e mostra o tempo de cada etapa e as linhas por segundo.
+
+COMO USAR:
+    python -m benchmarks.bench_dedupe
+    python -m benchmarks.bench_dedupe --rows 100000 --drop-near
+"""
+
+import argparse
+import time
+from typing import List, Tuple
+
+import numpy as np
+
+from app.services.dataset import load_dataset
+from app.training.dedupe import deduplicate
+
+SUFFIXES = ["com tontura", "mal estar geral", "com fraqueza", "perda de apetite", "dor de cabeça"]
+
+
+def synthetic_rows(n: int, seed: int) -> List[Tuple[str, str]]:
+    """Gera n linhas (sintomas, doença) a partir do dataset real."""
+    rng = np.random.default_rng(seed)
+    base = load_dataset()
+    words = sorted({word for text, _ in base for word in text.split()})
+
+    rows = []
+    for k in rng.integers(len(base), size=n):
+        text, label = base[k]
+        tokens = [w for w in text.split() if rng.random() < 0.85] or text.split()[:1]
+        tokens += [words[w] for w in rng.integers(len(words), size=rng.integers(0, 3))]
+        if rng.random() < 0.3:
+            tokens.append(SUFFIXES[rng.integers(len(SUFFIXES))])
+        rows.append((" ".join(tokens), label))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da deduplicação do dataset")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--threshold", type=float, default=0.8)
+    parser.add_argument("--drop-near", action="store_true")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    rows = synthetic_rows(args.rows, args.seed)
+    print(f"Dataset sintético: {len(rows)} linhas em {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    keep, report = deduplicate(rows, threshold=args.threshold, drop_near=args.drop_near)
+    total = time.perf_counter() - start
+
+    print("=" * 70)
+    print(f"duplicatas exatas:  {report['exact_duplicates']}")
+    print(f"quase-duplicatas:   {report['near_duplicate_rows']} linhas "
+          f"({report['near_duplicate_pairs']} pares, "
+          f"{report['near_cross_label_pairs']} entre doenças diferentes)")
+    print(f"mantidas:           {report['kept']}")
+    for name, seconds in report["timings_seconds"].items():
+        print(f"  {name:<10} {seconds:8.2f}s")
+    print(f"  {'total':<10} {total:8.2f}s  ({len(rows) / total:,.0f} linhas/s)")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark dos backends de inferência - XGBoost nativo x ONNX Runtime
+
+EXPLICAÇÃO:
+Mede, para cada backend, com o mesmo número de threads:
+- latência de UMA predição (p50/p99), o caso de /predict
+- vazão com lotes de vários textos (textos/s)
+
+O modelo ONNX precisa existir (python -m app.tools.export_onnx).
+
+COMO USAR:
+    python -m benchmarks.bench_onnx
+    python -m benchmarks.bench_onnx --threads 2 --batch 256 --repeat 500
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from app.core.config import settings
+
+# O backend nativo serve de referência; o ONNX é criado aqui mesmo
+settings.INFERENCE_BACKEND = "xgboost"
+
+from app.services.ml_service import ml_service  # noqa: E402
+from app.services.backends import OnnxBackend  # noqa: E402
+from app.services.dataset import iter_dataset  # noqa: E402
+
+
+def bench_backend(backend, texts, repeat: int, batch: int):
+    """
+    Roda o backend e devolve (p50_ms, p99_ms, textos_por_segundo).
+    """
+    # Aquecimento
+    for text in texts[:20]:
+        backend.predict_proba([text])
+
+    latencies = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        backend.predict_proba([texts[i % len(texts)]])
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    batch_texts = [texts[i % len(texts)] for i in range(batch)]
+    start = time.perf_counter()
+    rounds = 0
+    while time.perf_counter() - start < 2.0:
+        backend.predict_proba(batch_texts)
+        rounds += 1
+    throughput = rounds * batch / (time.perf_counter() - start)
+
+    return np.percentile(latencies, 50), np.percentile(latencies, 99), throughput
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark XGBoost x ONNX Runtime")
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=1000)
+    parser.add_argument("--batch", type=int, default=128)
+    args = parser.parse_args()
+
+    texts = [ml_service._preprocess_symptoms(text) for text, _ in iter_dataset()]
+
+    ml_service.model.set_params(n_jobs=args.threads)
+    backends = [ml_service.backend]
+    onnx_path = os.path.join(settings.MODEL_PATH, settings.ONNX_FILE)
+    if os.path.exists(onnx_path):
+        backends.append(OnnxBackend(onnx_path, threads=args.threads))
+    else:
+        print(f"{onnx_path} não encontrado: rode python -m app.tools.export_onnx")
+
+    print(f"threads={args.threads} repeat={args.repeat} batch={args.batch}")
+    print(f"{'backend':<10} {'p50 (ms)':>10} {'p99 (ms)':>10} {'textos/s':>12}")
+    for backend in backends:
+        p50, p99, throughput = bench_backend(backend, texts, args.repeat, args.batch)
+        print(f"{backend.name:<10} {p50:>10.3f} {p99:>10.3f} {throughput:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
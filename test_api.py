@@ -46,6 +46,24 @@ def test_health():
     print("✅ Teste passou!")
 
 
+def test_probes():
+    """Testa liveness e readiness"""
+    print("\n" + "="*50)
+    print("🧪 Testando GET /livez e /readyz")
+    print("="*50)
+    
+    response = requests.get(f"{BASE_URL}/livez")
+    print(f"Liveness: {response.status_code} {response.json()}")
+    assert response.status_code == 200, "Liveness falhou!"
+    
+    response = requests.get(f"{BASE_URL}/readyz")
+    print(f"Readiness: {response.status_code}")
+    print(f"Resposta: {json.dumps(response.json(), indent=2, ensure_ascii=False)}")
+    assert response.status_code == 200, "Worker não está pronto!"
+    assert response.json()["ready"], "Worker não está pronto!"
+    print("✅ Teste passou!")
+
+
 def test_diseases():
     """Testa listagem de doenças"""
     print("\n" + "="*50)
@@ -63,6 +81,25 @@ def test_diseases():
     print("✅ Teste passou!")
 
 
+def test_etag():
+    """Testa respostas condicionais (ETag / 304)"""
+    print("\n" + "="*50)
+    print("🧪 Testando ETag em GET /diseases")
+    print("="*50)
+    
+    response = requests.get(f"{BASE_URL}/diseases")
+    etag = response.headers.get("ETag")
+    print(f"ETag: {etag}")
+    
+    assert etag, "ETag não retornado!"
+    
+    response = requests.get(f"{BASE_URL}/diseases", headers={"If-None-Match": etag})
+    print(f"Status com If-None-Match: {response.status_code}")
+    
+    assert response.status_code == 304, "Deveria retornar 304 Not Modified!"
+    print("✅ Teste passou!")
+
+
 def test_predict():
     """Testa predição de diagnóstico"""
     print("\n" + "="*50)
@@ -141,7 +178,9 @@ def main():
         # Testes básicos
         test_root()
         test_health()
+        test_probes()
         test_diseases()
+        test_etag()
         
         # Testes de predição
         test_predict()
@@ -0,0 +1,130 @@
+"""
+Testes da conferência de artefatos (app/services/artifacts.py)
+
+EXPLICAÇÃO:
+Cada teste monta um model/ de mentira num diretório temporário, com
+arquivos pequenos e os manifestos (versionado e local), e confere as
+regras da carga: hash diferente falha, ARTIFACT_REQUIRE_MANIFEST recusa
+arquivos fora do manifesto e, para um nome nos dois manifestos, vale o
+versionado.
+
+COMO USAR:
+    python -m pytest test_artifacts.py
+"""
+
+import os
+
+import pytest
+
+from app.core.config import settings
+from app.services.artifacts import (
+    ArtifactIntegrityError,
+    ArtifactStore,
+    file_sha256,
+    read_manifest,
+    update_manifest,
+    write_manifest,
+)
+
+
+def write_file(directory, name, content):
+    path = os.path.join(directory, name)
+    with open(path, "wb") as f:
+        f.write(content)
+    return path
+
+
+def entry(path):
+    """Entrada do manifesto para um arquivo."""
+    return {"sha256": file_sha256(path), "bytes": os.path.getsize(path)}
+
+
+@pytest.fixture
+def model_dir(tmp_path):
+    """model/ com um artefato listado no manifesto versionado."""
+    directory = str(tmp_path)
+    path = write_file(directory, "modelo.json", b'{"arvores": 1}')
+    write_manifest(os.path.join(directory, settings.ARTIFACT_MANIFEST_FILE), {"modelo.json": entry(path)})
+    return directory
+
+
+def make_store(directory, require_manifest=False):
+    return ArtifactStore(directory, cache_dir="", require_manifest=require_manifest)
+
+
+def test_matching_hash_is_accepted(model_dir):
+    store = make_store(model_dir)
+
+    path = store.verify("modelo.json")
+
+    assert path == os.path.join(model_dir, "modelo.json")
+    assert store.hashes["modelo.json"] == file_sha256(path)
+
+
+def test_hash_mismatch_raises(model_dir):
+    write_file(model_dir, "modelo.json", b'{"arvores": 2}')  # trocado sem atualizar o manifesto
+    store = make_store(model_dir)
+
+    with pytest.raises(ArtifactIntegrityError):
+        store.verify("modelo.json")
+    assert "modelo.json" not in store.hashes
+
+
+def test_unlisted_file_is_only_a_warning_by_default(model_dir):
+    write_file(model_dir, "extra.bin", b"extra")
+
+    assert make_store(model_dir).verify("extra.bin").endswith("extra.bin")
+
+
+def test_require_manifest_rejects_unlisted_file(model_dir):
+    write_file(model_dir, "extra.bin", b"extra")
+    store = make_store(model_dir, require_manifest=True)
+
+    with pytest.raises(ArtifactIntegrityError):
+        store.verify("extra.bin")
+
+
+def test_require_manifest_rejects_missing_manifest(tmp_path):
+    with pytest.raises(ArtifactIntegrityError):
+        make_store(str(tmp_path), require_manifest=True)
+
+
+def test_local_manifest_adds_names(model_dir):
+    path = write_file(model_dir, "modelo.onnx", b"onnx")
+    write_manifest(os.path.join(model_dir, settings.ARTIFACT_LOCAL_MANIFEST_FILE), {"modelo.onnx": entry(path)})
+    store = make_store(model_dir, require_manifest=True)
+
+    assert store.verify("modelo.onnx") == path
+
+
+def test_committed_manifest_wins_over_local(model_dir):
+    # O manifesto local descreve OUTRO conteúdo para o mesmo nome
+    other = write_file(model_dir, "outro.json", b'{"arvores": 2}')
+    write_manifest(os.path.join(model_dir, settings.ARTIFACT_LOCAL_MANIFEST_FILE), {"modelo.json": entry(other)})
+
+    make_store(model_dir).verify("modelo.json")  # o arquivo bate com o versionado
+
+    write_file(model_dir, "modelo.json", b'{"arvores": 2}')  # agora só bate com o local
+    with pytest.raises(ArtifactIntegrityError):
+        make_store(model_dir).verify("modelo.json")
+
+
+def test_local_update_leaves_committed_manifest_untouched(model_dir):
+    main_path = os.path.join(model_dir, settings.ARTIFACT_MANIFEST_FILE)
+    with open(main_path, "rb") as f:
+        committed = f.read()
+    path = write_file(model_dir, "modelo.onnx", b"onnx")
+
+    assert update_manifest(path, local=True)
+
+    with open(main_path, "rb") as f:
+        assert f.read() == committed
+    local = read_manifest(os.path.join(model_dir, settings.ARTIFACT_LOCAL_MANIFEST_FILE))
+    assert local == {"modelo.onnx": entry(path)}
+
+
+def test_update_without_manifest_does_nothing(tmp_path):
+    path = write_file(str(tmp_path), "modelo.onnx", b"onnx")
+
+    assert not update_manifest(path, local=True)
+    assert not os.path.exists(os.path.join(str(tmp_path), settings.ARTIFACT_LOCAL_MANIFEST_FILE))
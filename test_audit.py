@@ -0,0 +1,144 @@
+"""
+Testes do registro de auditoria (app/services/audit.py)
+
+EXPLICAÇÃO:
+O AuditSink grava numa thread de fundo; aqui conferimos as regras que
+não aparecem num teste de ponta a ponta da API: o que acontece com o
+buffer cheio ("drop" x "block"), com um lote que falha, com o banco
+indisponível e no shutdown.
+
+COMO USAR:
+    python -m pytest test_audit.py
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+
+from app.services.audit import AuditSink
+
+
+def make_record(i):
+    """Linha de auditoria mínima (mesma ordem de COLUMNS)."""
+    return (time.time(), f"sintoma {i}", f"sintoma {i}", "Dengue", 90.0, "{}", "teste", 1.0, 1)
+
+
+def count_rows(path):
+    with sqlite3.connect(path) as connection:
+        return connection.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+
+
+def test_drop_when_full(tmp_path):
+    """Com "drop", o registro além da capacidade é descartado na hora"""
+    sink = AuditSink(str(tmp_path / "audit.db"), capacity=2, batch_size=10, flush_interval=60)
+    assert sink.offer(make_record(1))
+    assert sink.offer(make_record(2))
+
+    start = time.perf_counter()
+    asyncio.run(sink.record(make_record(3)))
+    assert time.perf_counter() - start < 0.05
+    assert sink.stats()["buffered"] == 2
+    assert sink.dropped == 1
+
+
+def test_block_waits_for_room(tmp_path):
+    """Com "block", a requisição espera vaga e entra quando o buffer esvazia"""
+    sink = AuditSink(str(tmp_path / "audit.db"), capacity=2, batch_size=1, flush_interval=60,
+                     backpressure="block", block_timeout=5.0)
+    sink.offer(make_record(1))
+    sink.offer(make_record(2))
+
+    # Simula a thread de gravação tirando um lote do buffer
+    threading.Timer(0.1, sink._take_batch).start()
+    start = time.perf_counter()
+    asyncio.run(sink.record(make_record(3)))
+    assert time.perf_counter() - start >= 0.09
+    assert sink.dropped == 0
+    assert sink.accepted == 3
+
+
+def test_block_gives_up_after_timeout(tmp_path):
+    """Com "block" e sem vaga, o registro é descartado depois do timeout"""
+    sink = AuditSink(str(tmp_path / "audit.db"), capacity=1, batch_size=10, flush_interval=60,
+                     backpressure="block", block_timeout=0.1)
+    sink.offer(make_record(1))
+
+    start = time.perf_counter()
+    asyncio.run(sink.record(make_record(2)))
+    assert time.perf_counter() - start >= 0.09
+    assert sink.dropped == 1
+
+
+def test_failed_batch_is_requeued_in_order(tmp_path):
+    """Um lote que falha volta para o começo do buffer, na ordem original"""
+    sink = AuditSink(str(tmp_path / "audit.db"), capacity=10, batch_size=3, flush_interval=60)
+    for i in range(5):
+        sink.offer(make_record(i))
+    batch = sink._take_batch()
+
+    broken = sqlite3.connect(":memory:")
+    broken.close()
+    assert not sink._write(broken, batch)
+
+    assert sink.write_errors == 1
+    assert [record[1] for record in sink._buffer] == [f"sintoma {i}" for i in range(5)]
+
+
+def test_requeue_never_exceeds_capacity(tmp_path):
+    """Se o buffer encheu durante a gravação, só volta o que cabe"""
+    sink = AuditSink(str(tmp_path / "audit.db"), capacity=4, batch_size=3, flush_interval=60)
+    for i in range(4):
+        sink.offer(make_record(i))
+    batch = sink._take_batch()
+    for i in range(4, 6):
+        sink.offer(make_record(i))
+
+    broken = sqlite3.connect(":memory:")
+    broken.close()
+    sink._write(broken, batch)
+
+    assert len(sink._buffer) == sink.capacity
+    assert sink._buffer[0][1] == "sintoma 0"
+    assert sink.dropped == 2
+
+
+def test_stop_flushes_buffer(tmp_path):
+    """stop() grava tudo que está no buffer, mesmo sem completar um lote"""
+    path = str(tmp_path / "audit.db")
+    sink = AuditSink(path, capacity=100, batch_size=50, flush_interval=60)
+    sink.start()
+    for i in range(5):
+        sink.offer(make_record(i))
+    sink.stop()
+
+    assert count_rows(path) == 5
+    assert sink.stats()["written"] == 5
+    assert not sink.stats()["writer_alive"]
+
+
+def test_writer_survives_unavailable_database(tmp_path):
+    """Sem conseguir abrir o banco, a thread continua viva e reconecta depois"""
+    blocker = tmp_path / "audit"
+    blocker.write_text("um arquivo onde deveria estar o diretório")
+    path = str(blocker / "audit.db")
+
+    sink = AuditSink(path, capacity=100, batch_size=1, flush_interval=0.05)
+    sink.start()
+    sink.offer(make_record(1))
+    time.sleep(0.2)
+
+    stats = sink.stats()
+    assert stats["writer_alive"]
+    assert not stats["connected"]
+    assert stats["connect_errors"] >= 1
+    assert stats["buffered"] == 1
+
+    # O diretório aparece: a próxima tentativa conecta e grava o que esperou
+    blocker.unlink()
+    deadline = time.monotonic() + 5.0
+    while sink.written < 1 and time.monotonic() < deadline:
+        time.sleep(0.05)
+    sink.stop()
+
+    assert count_rows(path) == 1
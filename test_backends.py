@@ -0,0 +1,48 @@
+"""
+Teste de paridade entre os backends de inferência
+
+EXPLICAÇÃO:
+O backend "onnx" tem que dar as MESMAS probabilidades do backend nativo
+(vetorizador + XGBoost). Este teste roda os dois em todos os exemplos do
+dataset, com o texto pré-processado como na API, e compara as matrizes.
+
+Precisa do onnxruntime e de model/modelo_HealthIA.onnx (gerado por
+python -m app.tools.export_onnx); sem eles, o teste é pulado.
+
+COMO USAR:
+    python -m pytest test_backends.py
+    python test_backends.py
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.services.backends import OnnxBackend, XGBoostBackend
+from app.services.dataset import iter_dataset
+from app.services.ml_service import ml_service
+
+ONNX_PATH = os.path.join(settings.MODEL_PATH, settings.ONNX_FILE)
+
+
+def test_onnx_matches_xgboost():
+    """ONNX e XGBoost devolvem as mesmas probabilidades em todo o dataset"""
+    pytest.importorskip("onnxruntime")
+    if not os.path.exists(ONNX_PATH):
+        pytest.skip(f"{ONNX_PATH} não existe (python -m app.tools.export_onnx)")
+
+    texts = [ml_service._preprocess_symptoms(text) for text, _ in iter_dataset()]
+
+    expected = XGBoostBackend(ml_service.vectorizer, ml_service.model).predict_proba(texts)
+    actual = OnnxBackend(ONNX_PATH).predict_proba(texts)
+
+    assert actual.shape == expected.shape
+    np.testing.assert_allclose(actual, expected, rtol=0, atol=1e-5)
+    assert (actual.argmax(axis=1) == expected.argmax(axis=1)).all()
+    print(f"✅ {len(texts)} exemplos, diferença máxima {np.abs(actual - expected).max():.2e}")
+
+
+if __name__ == "__main__":
+    test_onnx_matches_xgboost()
@@ -0,0 +1,107 @@
+"""
+Testes do monitor de drift (app/services/drift.py)
+
+EXPLICAÇÃO:
+O relatório depende do relógio (fatias da janela deslizante), então os
+testes passam o instante `now` explicitamente em vez de esperar.
+
+COMO USAR:
+    python -m pytest test_drift.py
+"""
+
+import random
+from collections import Counter
+
+import numpy as np
+
+from app.services.drift import DriftMonitor, _cells
+
+CLASSES = ["Dengue", "Gripe", "Sarampo"]
+
+# Janela de 60 s em 6 fatias de 10 s
+WINDOW = 60.0
+BUCKETS = 6
+T0 = 1_000_000.0  # Início de uma fatia (múltiplo de 10)
+
+
+def make_monitor(**kwargs):
+    return DriftMonitor(CLASSES, window_seconds=WINDOW, buckets=BUCKETS, **kwargs)
+
+
+def test_report_sums_live_buckets():
+    """Predições em fatias diferentes da janela são somadas no relatório"""
+    monitor = make_monitor()
+    monitor.record(["febre", "xyz"], ["xyz"], prediction=0, confidence=95.0, now=T0)
+    monitor.record(["tosse"], [], prediction=1, confidence=55.0, now=T0 + 15)
+    monitor.record(["xyz"], ["xyz"], prediction=0, confidence=75.0, now=T0 + 35)
+
+    report = monitor.report(now=T0 + 40)
+    assert report["requests"] == 3
+    assert report["tokens"] == 4
+    assert report["oov_tokens"] == 2
+    assert report["requests_with_oov_rate"] == round(2 / 3, 4)
+    assert report["class_frequency"]["Dengue"]["count"] == 2
+    assert report["class_frequency"]["Gripe"]["count"] == 1
+    assert report["mean_confidence"] == 75.0
+    assert report["top_unknown_tokens"] == [{"token": "xyz", "count": 2}]
+
+
+def test_old_buckets_expire_from_window():
+    """Uma fatia que saiu da janela não conta mais"""
+    monitor = make_monitor()
+    monitor.record(["febre"], [], prediction=0, confidence=90.0, now=T0)
+    monitor.record(["tosse"], [], prediction=1, confidence=90.0, now=T0 + 30)
+
+    # Ainda dentro da janela (última fatia viva começa em T0)
+    assert monitor.report(now=T0 + WINDOW - 1)["requests"] == 2
+
+    # A fatia de T0 expirou; a de T0 + 30 continua
+    report = monitor.report(now=T0 + WINDOW)
+    assert report["requests"] == 1
+    assert report["class_frequency"]["Gripe"]["count"] == 1
+
+    # Janela inteira sem tráfego
+    report = monitor.report(now=T0 + 30 + WINDOW)
+    assert report["requests"] == 0
+    assert report["mean_confidence"] is None
+
+
+def test_bucket_is_reset_when_reused():
+    """Ao dar a volta na janela, a fatia reaproveitada começa zerada"""
+    monitor = make_monitor()
+    monitor.record(["abc"], ["abc"], prediction=0, confidence=90.0, now=T0)
+    # Mesma posição no vetor de fatias, uma janela depois
+    monitor.record(["def"], ["def"], prediction=2, confidence=40.0, now=T0 + WINDOW)
+
+    report = monitor.report(now=T0 + WINDOW)
+    assert report["requests"] == 1
+    assert report["class_frequency"]["Dengue"]["count"] == 0
+    assert report["class_frequency"]["Sarampo"]["count"] == 1
+    assert report["top_unknown_tokens"] == [{"token": "def", "count": 1}]
+
+
+def test_sketch_never_underestimates():
+    """Com colisões (sketch estreito), a estimativa é sempre >= a contagem real"""
+    monitor = make_monitor(sketch_depth=3, sketch_width=16, top_k=8)
+    rng = random.Random(42)
+    vocabulary = [f"palavra{i}" for i in range(200)]
+    truth = Counter()
+
+    for i in range(500):
+        # Algumas palavras muito mais frequentes que as outras
+        unknown = [rng.choice(vocabulary[:5]) if rng.random() < 0.5 else rng.choice(vocabulary)
+                   for _ in range(3)]
+        truth.update(unknown)
+        monitor.record(unknown, unknown, prediction=0, confidence=50.0, now=T0 + i * 0.1)
+
+    sketch = sum(
+        np.frombuffer(bucket.sketch, dtype=np.int64) for bucket in monitor._buckets
+    )
+    for token, count in truth.items():
+        assert sketch[_cells(token, monitor.depth, monitor.width)].min() >= count
+
+    report = monitor.report(top_n=5, now=T0 + 50)
+    for entry in report["top_unknown_tokens"]:
+        assert entry["count"] >= truth[entry["token"]]
+    # As palavras frequentes aparecem no topo (space-saving)
+    assert {entry["token"] for entry in report["top_unknown_tokens"]} & set(vocabulary[:5])
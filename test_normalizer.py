@@ -0,0 +1,73 @@
+"""
+Testes do corretor de sintomas (app/services/normalizer.py)
+
+EXPLICAÇÃO:
+Usamos um vetorizador pequeno, treinado aqui, com palavras do dataset
+real: o teste não depende dos arquivos em model/ e roda em milissegundos.
+Conferimos acentos faltando ou sobrando, erros de digitação, palavras
+conhecidas (nunca mexemos nelas) e o corte de palavras longas demais.
+
+COMO USAR:
+    python -m pytest test_normalizer.py
+"""
+
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from app.services import normalizer as normalizer_module
+from app.services.normalizer import SymptomNormalizer
+
+
+CORPUS = [
+    "febre alta e cansaço",
+    "poliúria e sede excessiva",
+    "taquicardia e falta de ar",
+    "dor de cabeça e cansaço",
+    "febre e dor no corpo",
+]
+
+
+@pytest.fixture
+def normalizer():
+    vectorizer = TfidfVectorizer().fit(CORPUS)
+    return SymptomNormalizer(vectorizer, max_distance=2)
+
+
+@pytest.mark.parametrize("token, expected", [
+    ("cansaco", "cansaço"),          # acento faltando
+    ("poliuria", "poliúria"),
+    ("taquicardía", "taquicardia"),  # acento sobrando
+    ("taquicardai", "taquicardia"),  # letras trocadas
+    ("poliurai", "poliúria"),        # erro de digitação + acento faltando
+])
+def test_corrects_accents_and_typos(normalizer, token, expected):
+    assert normalizer.correct(token) == expected
+
+
+@pytest.mark.parametrize("token", ["febre", "cansaço", "poliúria", "taquicardia", "excessiva"])
+def test_known_words_are_unchanged(normalizer, token):
+    assert normalizer.correct(token) == token
+
+
+def test_short_unknown_words_are_not_guessed(normalizer):
+    # Até 4 letras não aceitamos erro: "fbre" não vira "febre"
+    assert normalizer.correct("fbre") == "fbre"
+
+
+def test_normalize_counts_each_kind_of_fix(normalizer):
+    text = normalizer.normalize("cansaco, taquicardai e febre com xyzw")
+
+    assert text == "cansaço, taquicardia e febre com xyzw"
+    assert normalizer.stats()["accent_fixed"] == 1
+    assert normalizer.stats()["typo_fixed"] == 1
+    assert normalizer.stats()["unknown"] == 2  # "com" e "xyzw"
+
+
+def test_tokens_longer_than_the_vocabulary_skip_the_search(normalizer, monkeypatch):
+    def fail(*args):
+        raise AssertionError("não deveria gerar deleções para uma palavra gigante")
+
+    monkeypatch.setattr(normalizer_module, "deletes", fail)
+    token = "taquicardia" * 100
+
+    assert normalizer.correct(token) == token
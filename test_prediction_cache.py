@@ -0,0 +1,110 @@
+"""
+Testes do cache persistente de predições (app/services/prediction_cache.py)
+
+EXPLICAÇÃO:
+Cada teste usa um arquivo SQLite próprio (diretório temporário do
+pytest) e simula restarts criando um PredictionCache novo no mesmo
+arquivo.
+
+COMO USAR:
+    python -m pytest test_prediction_cache.py
+"""
+
+import sqlite3
+import time
+
+from app.services.prediction_cache import PredictionCache
+
+
+def make_cache(path, model_hash="modelo-a", max_bytes=10 * 1024 * 1024, **kwargs):
+    return PredictionCache(str(path), model_hash, memory_entries=1000, max_bytes=max_bytes,
+                           flush_interval=0.05, **kwargs)
+
+
+def make_value(i, size=10):
+    return {"diagnosis": "Dengue", "confidence": 90.0, "detail": f"{i}:" + "x" * size}
+
+
+def test_other_model_hash_is_never_read_and_is_purged(tmp_path):
+    """Entradas de outro modelo não são lidas e somem quando a gravação inicia"""
+    path = tmp_path / "cache.db"
+    old = make_cache(path, model_hash="modelo-a")
+    old.start()
+    old.put("febre", make_value(1))
+    old.stop()
+
+    new = make_cache(path, model_hash="modelo-b")
+    assert new.get("febre") is None
+
+    new.start()
+    new.stop()
+    assert new.purged == 1
+    with sqlite3.connect(path) as connection:
+        hashes = {row[0] for row in connection.execute("SELECT model_hash FROM predictions")}
+    assert "modelo-a" not in hashes
+
+
+def test_size_limit_is_enforced(tmp_path):
+    """O arquivo nunca fica com mais que max_bytes em uso"""
+    path = tmp_path / "cache.db"
+    max_bytes = 64 * 1024
+    cache = make_cache(path, max_bytes=max_bytes, batch_size=50)
+    cache.start()
+    for i in range(2000):
+        cache.put(f"chave {i}", make_value(i, size=200))
+    cache.stop()
+
+    assert cache.written == 2000
+    assert cache.evicted > 0
+    connection = sqlite3.connect(path)
+    try:
+        assert cache._used_bytes(connection) <= max_bytes
+        # As mais recentes sobrevivem, as mais antigas saem primeiro
+        keys = {row[0] for row in connection.execute("SELECT key FROM predictions")}
+    finally:
+        connection.close()
+    assert "chave 1999" in keys
+    assert "chave 0" not in keys
+
+
+def test_restart_preloads_recent_entries(tmp_path):
+    """Um worker novo já começa com as predições gravadas pelo anterior"""
+    path = tmp_path / "cache.db"
+    first = make_cache(path)
+    first.start()
+    for i in range(20):
+        first.put(f"chave {i}", make_value(i))
+    first.stop()
+
+    second = make_cache(path)
+    second.start(preload=20)
+    try:
+        assert second.preloaded == 20
+        assert second.get("chave 7") == make_value(7)
+        assert second.disk_hits == 0  # Veio da LRU, sem consultar o disco
+    finally:
+        second.stop()
+
+
+def test_writer_survives_unavailable_database(tmp_path):
+    """Sem conseguir abrir o banco, a thread continua viva e reconecta depois"""
+    blocker = tmp_path / "cache"
+    blocker.write_text("um arquivo onde deveria estar o diretório")
+    path = blocker / "cache.db"
+
+    cache = make_cache(path, batch_size=1)
+    cache.start(preload=10)
+    cache.put("febre", make_value(1))
+    time.sleep(0.2)
+    assert cache.running
+    assert cache.connect_errors >= 1
+    assert cache.get("febre") == make_value(1)  # A LRU continua funcionando
+
+    blocker.unlink()
+    deadline = time.monotonic() + 5.0
+    while cache.written < 1 and time.monotonic() < deadline:
+        time.sleep(0.05)
+    cache.stop()
+
+    assert cache.written == 1
+    assert not cache.running
@@ -0,0 +1,230 @@
+"""
+Testes do rate limiting (app/core/rate_limit.py)
+
+EXPLICAÇÃO:
+Os baldes dependem do relógio, então os testes trocam time.monotonic /
+time.time por um relógio controlado em vez de esperar. O backend de
+memória compartilhada é testado com fork(), como no launcher pre-fork.
+
+COMO USAR:
+    python -m pytest test_rate_limit.py
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.core import rate_limit
+from app.core.rate_limit import (
+    InMemoryTokenBuckets,
+    RateLimiter,
+    RateLimitMiddleware,
+    SharedMemoryTokenBuckets,
+)
+
+
+# Raiz do projeto (para o processo filho importar o pacote app)
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+class FakeClock:
+    """Relógio que só anda quando o teste manda."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limit.time, "monotonic", fake)
+    monkeypatch.setattr(rate_limit.time, "time", fake)
+    return fake
+
+
+def make_scope(headers=(), ip="10.0.0.1"):
+    return {"headers": [(name.encode("latin-1"), value.encode("latin-1")) for name, value in headers],
+            "client": (ip, 1234)}
+
+
+def make_limiter(overrides=None, **kwargs):
+    return RateLimiter(InMemoryTokenBuckets(100), rate=1.0, burst=3.0, overrides=overrides or {},
+                       api_key_header="X-API-Key", **kwargs)
+
+
+# ----------------------------------------------------------------------
+# Token bucket
+# ----------------------------------------------------------------------
+
+def test_burst_then_deny_then_refill(clock):
+    """Passam BURST requisições seguidas; depois, uma a cada 1/RATE segundos"""
+    buckets = InMemoryTokenBuckets(10)
+    assert [buckets.take("a", 2.0, 3.0) for _ in range(3)] == [0.0, 0.0, 0.0]
+
+    wait = buckets.take("a", 2.0, 3.0)
+    assert wait == pytest.approx(0.5)  # Falta 1 ficha a 2 fichas/s
+
+    clock.now += 0.5
+    assert buckets.take("a", 2.0, 3.0) == 0.0
+    assert buckets.take("a", 2.0, 3.0) > 0.0
+
+
+def test_bucket_never_exceeds_burst(clock):
+    """Parado por muito tempo, o cliente volta com no máximo BURST fichas"""
+    buckets = InMemoryTokenBuckets(10)
+    buckets.take("a", 1.0, 2.0)
+    clock.now += 3600
+    assert [buckets.take("a", 1.0, 2.0) for _ in range(3)][-1] > 0.0
+
+
+def test_full_table_evicts_least_recently_used(clock):
+    """Com a tabela cheia, sai só o cliente usado há mais tempo"""
+    buckets = InMemoryTokenBuckets(3)
+    for key in ("a", "b", "c"):
+        buckets.take(key, 1.0, 2.0)
+    buckets.take("a", 1.0, 2.0)  # "a" volta a ser o mais recente
+    buckets.take("d", 1.0, 2.0)
+
+    assert list(buckets._buckets) == ["c", "a", "d"]
+    # "a" continua com o balde gasto: não foi zerado pela enxurrada
+    assert buckets.take("a", 1.0, 2.0) > 0.0
+
+
+# ----------------------------------------------------------------------
+# Quem é o cliente
+# ----------------------------------------------------------------------
+
+def test_only_allowlisted_api_keys_identify_the_client():
+    limiter = make_limiter(overrides={"key:vip": [10.0, 10.0]}, api_keys=["k1"])
+    assert limiter.client_key(make_scope([("x-api-key", "k1")])) == "key:k1"
+    assert limiter.client_key(make_scope([("x-api-key", "vip")])) == "key:vip"
+    assert limiter.client_key(make_scope([("x-api-key", "aleatoria")])) == "ip:10.0.0.1"
+
+
+def test_origin_keys():
+    """Origem com override: um balde; origem aceita: balde por IP; outra: só IP"""
+    limiter = make_limiter(overrides={"origin:https://parceiro": [10.0, 10.0]},
+                           origins=["https://app", "https://parceiro"])
+    assert limiter.client_key(make_scope([("origin", "https://parceiro")])) == "origin:https://parceiro"
+    assert limiter.client_key(make_scope([("origin", "https://app")])) == "origin:https://app|ip:10.0.0.1"
+    assert limiter.client_key(make_scope([("origin", "https://outro")])) == "ip:10.0.0.1"
+    assert limiter.client_key(make_scope()) == "ip:10.0.0.1"
+
+
+def test_allowed_origin_users_do_not_share_a_bucket(clock):
+    limiter = make_limiter(origins=["https://app"])
+    first = limiter.client_key(make_scope([("origin", "https://app")], ip="10.0.0.1"))
+    second = limiter.client_key(make_scope([("origin", "https://app")], ip="10.0.0.2"))
+    for _ in range(3):
+        limiter.check(first)
+    assert limiter.check(first) > 0.0
+    assert limiter.check(second) == 0.0
+
+
+def test_override_limits_are_applied(clock):
+    limiter = make_limiter(overrides={"key:vip": [1.0, 5.0]}, api_keys=[])
+    assert all(limiter.check("key:vip") == 0.0 for _ in range(5))
+    assert limiter.check("key:vip") > 0.0
+
+
+@pytest.mark.parametrize("limits", [[0.0, 5.0], [-1.0, 5.0], [1.0, 0.5], [1.0]])
+def test_invalid_override_is_rejected(limits):
+    with pytest.raises(ValueError):
+        make_limiter(overrides={"key:x": limits})
+
+
+# ----------------------------------------------------------------------
+# Middleware
+# ----------------------------------------------------------------------
+
+def test_middleware_returns_429_with_retry_after(clock):
+    async def predict(request):
+        return PlainTextResponse("ok")
+
+    app = Starlette(routes=[Route("/predict", predict, methods=["POST"]),
+                            Route("/livre", predict, methods=["POST"])])
+    app.add_middleware(RateLimitMiddleware, limiter=make_limiter(), paths=["/predict"])
+    client = TestClient(app)
+
+    assert [client.post("/predict").status_code for _ in range(3)] == [200, 200, 200]
+    response = client.post("/predict")
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "1"
+    assert client.post("/livre").status_code == 200  # Fora de RATE_LIMIT_PATHS
+
+
+# ----------------------------------------------------------------------
+# Memória compartilhada
+# ----------------------------------------------------------------------
+
+@pytest.fixture
+def shm_name():
+    name = f"healthia_test_{os.getpid()}"
+    yield name
+    if os.path.exists(f"/dev/shm/{name}"):
+        os.unlink(f"/dev/shm/{name}")
+
+
+def run_in_child(fn) -> int:
+    """Roda fn() num processo filho (fork) e devolve o código de saída."""
+    pid = os.fork()
+    if pid == 0:
+        try:
+            fn()
+            os._exit(0)
+        except BaseException:
+            os._exit(1)
+    return os.waitstatus_to_exitcode(os.waitpid(pid, 0)[1])
+
+
+@pytest.mark.skipif(not hasattr(os, "fork") or not os.path.isdir("/dev/shm"),
+                    reason="Precisa de fork() e /dev/shm")
+def test_forked_workers_do_not_unlink_the_table(shm_name):
+    """Workers herdam a tabela do master; só o master a remove"""
+    buckets = SharedMemoryTokenBuckets(shm_name, 64)
+    assert buckets.owner
+
+    # Dois "workers" usam a tabela e fazem shutdown
+    for _ in range(2):
+        assert run_in_child(lambda: (buckets.take("a", 1.0, 5.0), buckets.close())) == 0
+    assert os.path.exists(f"/dev/shm/{shm_name}")
+
+    # O que os workers gastaram é visto pelo master
+    assert [buckets.take("a", 1.0, 5.0) for _ in range(3)][-1] == 0.0
+    assert buckets.take("a", 1.0, 5.0) > 0.0
+
+    buckets.close()
+    buckets.close()  # Idempotente
+    assert not os.path.exists(f"/dev/shm/{shm_name}")
+
+
+@pytest.mark.skipif(not os.path.isdir("/dev/shm"), reason="Precisa de /dev/shm")
+def test_attach_checks_table_size(shm_name):
+    """Uma tabela existente com outro tamanho (sobra de outra execução) é recusada"""
+    buckets = SharedMemoryTokenBuckets(shm_name, 64)
+    try:
+        # Outro processo (não um fork: como uma segunda execução do servidor)
+        script = (
+            "import sys\n"
+            "from app.core.rate_limit import SharedMemoryTokenBuckets\n"
+            "other = SharedMemoryTokenBuckets(sys.argv[1], int(sys.argv[2]))\n"
+            "assert not other.owner\n"
+            "other.close()\n"
+        )
+        same = subprocess.run([sys.executable, "-c", script, shm_name, "64"], capture_output=True, text=True, cwd=ROOT)
+        assert same.returncode == 0, same.stderr
+        wrong = subprocess.run([sys.executable, "-c", script, shm_name, "32"], capture_output=True, text=True, cwd=ROOT)
+        assert wrong.returncode != 0
+        assert "ValueError" in wrong.stderr
+        assert os.path.exists(f"/dev/shm/{shm_name}")
+    finally:
+        buckets.close()